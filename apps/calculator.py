@@ -1,7 +1,9 @@
 import sys
-import math
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QPushButton, QGridLayout, QApplication
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QGridLayout, QApplication,
+                               QDoubleSpinBox, QLabel)
 from PySide6.QtCore import Qt
+from controller.expressionEngine import ExpressionError, evaluate
+from controller.functionPlot import FunctionPlot
 
 class Calculator(QWidget):
     def __init__(self, parent=None):
@@ -29,7 +31,7 @@ class Calculator(QWidget):
             ('4', 2, 0), ('5', 2, 1), ('6', 2, 2), ('-', 2, 3), ('^', 2, 4),
             ('1', 3, 0), ('2', 3, 1), ('3', 3, 2), ('+', 3, 3), ('ln', 3, 4),
             ('0', 4, 0), ('.', 4, 1), ('=', 4, 2), ('sin', 4, 3), ('cos', 4, 4),
-            ('tan', 5, 0), ('exp', 5, 1), ('π', 5, 2), ('e', 5, 3)
+            ('tan', 5, 0), ('exp', 5, 1), ('π', 5, 2), ('e', 5, 3), ('x', 5, 4)
         ]
 
         for btn_text, x, y in buttons:
@@ -44,32 +46,79 @@ class Calculator(QWidget):
 
         layout.addLayout(grid)
 
+        # Modo gráfico: f(x) se evalúa vectorizada sobre todo el rango y se dibuja
+        self.plot_panel = QWidget()
+        plot_layout = QVBoxLayout(self.plot_panel)
+        plot_layout.setContentsMargins(0, 0, 0, 0)
+        range_layout = QHBoxLayout()
+        self.x_min = QDoubleSpinBox()
+        self.x_max = QDoubleSpinBox()
+        for label, spin_box, value in (("x from", self.x_min, -10), ("to", self.x_max, 10)):
+            spin_box.setRange(-1e9, 1e9)
+            spin_box.setDecimals(3)
+            spin_box.setValue(value)
+            spin_box.setStyleSheet("background-color: #FFFFFF;")
+            text = QLabel(label)
+            text.setStyleSheet("color: white;")
+            range_layout.addWidget(text)
+            range_layout.addWidget(spin_box)
+        plot_layout.addLayout(range_layout)
+        self.function_plot = FunctionPlot()
+        self.function_plot.setMinimumSize(500, 300)
+        plot_layout.addWidget(self.function_plot)
+        self.plot_panel.hide()
+        layout.addWidget(self.plot_panel)
+
+        bottom_layout = QHBoxLayout()
+        self.plot_button = QPushButton("Plot")
+        self.plot_button.setCheckable(True)
+        self.plot_button.setFixedSize(60, 40)
+        self.plot_button.setStyleSheet("font-size: 16px; background-color: #3C3D37; color: white; border: none; border-radius: 5px;")
+        self.plot_button.toggled.connect(self.set_plot_mode)
+        bottom_layout.addWidget(self.plot_button)
+
         # Botón de cierre
         close_button = QPushButton("Close")
         close_button.setFixedSize(60, 40)
         close_button.setStyleSheet("font-size: 16px; background-color: #FF5733; color: white; border: none; border-radius: 5px;")
         close_button.clicked.connect(self.close)
-        layout.addWidget(close_button)
+        bottom_layout.addWidget(close_button)
+        bottom_layout.addStretch()
+        layout.addLayout(bottom_layout)
+
+    def set_plot_mode(self, enabled):
+        """Mostrar u ocultar el gráfico; en modo gráfico '=' dibuja y = f(x) en lugar de calcular."""
+        self.plot_panel.setVisible(enabled)
+        self.display.clear()
+        self.display.setPlaceholderText("f(x)" if enabled else "")
+        if not enabled:
+            self.function_plot.clear()
+        self.adjustSize()
+
+    def plot(self):
+        """Dibujar la expresión de la pantalla como función de x."""
+        x_min, x_max = self.x_min.value(), self.x_max.value()
+        if x_min >= x_max:
+            self.display.setText("Error")
+            return
+        self.function_plot.plot(self.display.text(), x_min, x_max)
 
     def on_click(self):
         button = self.sender().text()
 
         try:
-            if button == '=':
-                expression = self.display.text().replace('√', 'math.sqrt').replace('^', '**').replace('ln', 'math.log')
-                expression = expression.replace('π', str(math.pi)).replace('e', str(math.e))
-                expression = expression.replace('sin', 'math.sin').replace('cos', 'math.cos').replace('tan', 'math.tan')
-                result = str(eval(expression))
+            if button == '=' and self.plot_button.isChecked():
+                self.plot()
+            elif button == '=':
+                # Analizador propio: solo números, operadores y funciones matemáticas (sin eval)
+                result = str(evaluate(self.display.text()))
                 self.display.setText(result)
             elif button == 'C':
                 self.display.clear()
             elif button in ('sin', 'cos', 'tan', 'ln', '√', 'exp'):
                 self.display.setText(self.display.text() + f"{button}(")
-            elif button == 'π':
-                self.display.setText(self.display.text() + str(math.pi))
-            elif button == 'e':
-                self.display.setText(self.display.text() + str(math.e))
             else:
+                # π y e se escriben como símbolos: el motor conoce su valor
                 self.display.setText(self.display.text() + button)
-        except Exception:
+        except (ExpressionError, ArithmeticError, ValueError):
             self.display.setText("Error")
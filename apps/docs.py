@@ -1,7 +1,18 @@
 import os
 import subprocess
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem,QMessageBox, QInputDialog)
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListView, QMessageBox, QInputDialog,
+                               QLineEdit, QListWidget, QListWidgetItem)
+from controller.directoryModel import DirectoryModel
+from controller.iconProvider import get_icon
+from controller.searchIndex import get_search_service
+
+# Carpetas que se recuerdan para los botones atrás/adelante
+MAX_HISTORY = 100
+
+# Espera (ms) tras la última tecla antes de buscar, y resultados mostrados
+SEARCH_DEBOUNCE = 150
+SEARCH_LIMIT = 200
 
 
 class Docs(QWidget):
@@ -46,14 +57,42 @@ class Docs(QWidget):
         nav_layout.addWidget(self.back_button)
         nav_layout.addWidget(self.forward_button)
 
+        # Búsqueda por nombre y contenido sobre el índice del usuario
+        self.search_service = get_search_service(self.user_id)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+        nav_layout.addWidget(self.search_box)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE)
+        self.search_timer.timeout.connect(self.run_search)
+        # El índice se completa en segundo plano: repetir la búsqueda cuando cambia
+        self.search_service.index_updated.connect(self.on_index_updated)
+
         main_layout.addLayout(nav_layout)
 
-        # Explorador de archivos
-        self.file_list = QListWidget()
-        self.file_list.itemDoubleClicked.connect(self.open_item)
+        # Explorador de archivos: el contenido se lista en segundo plano y la vista
+        # solo pinta las filas visibles
+        self.file_model = DirectoryModel(self)
+        self.file_model.loading_finished.connect(self.on_listing_finished)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setUniformItemSizes(True)
+        # Distribuir el cálculo del diseño en tandas para no congelar carpetas muy grandes
+        self.file_list.setLayoutMode(QListView.Batched)
+        self.file_list.setBatchSize(500)
+        self.file_list.doubleClicked.connect(self.open_item)
         self.refresh_file_list()  # Llama aquí después de inicializar docs_path
         main_layout.addWidget(self.file_list)
 
+        # Resultados de la búsqueda (ocupan el lugar del explorador mientras hay texto)
+        self.search_results = QListWidget()
+        self.search_results.itemDoubleClicked.connect(self.open_search_result)
+        self.search_results.hide()
+        main_layout.addWidget(self.search_results)
+
         # Botones para crear y eliminar
         button_layout = QHBoxLayout()
         self.folder_button = QPushButton("Create Folder")
@@ -76,37 +115,71 @@ class Docs(QWidget):
         self.setLayout(main_layout)
 
     def refresh_file_list(self):
-        """Actualizar la lista de archivos y carpetas."""
-        self.file_list.clear()
+        """Actualizar la lista de archivos y carpetas (en segundo plano)."""
+        self.file_model.set_path(self.docs_path)
 
-        folder_icon = QIcon("data/icons/folder.png")
-        file_icon = QIcon("data/icons/file.png")
+    def on_listing_finished(self, error):
+        """Avisar si no se pudo listar la carpeta."""
+        if error:
+            QMessageBox.warning(self, "Error", "The documents folder could not be found.")
 
-        # Listar elementos en la ruta de documentos del usuario
-        try:
-            for item in os.listdir(self.docs_path):
-                item_path = os.path.join(self.docs_path, item)
-                list_item = QListWidgetItem(item)
+    def open_item(self, index):
+        """Abrir el archivo o carpeta seleccionado."""
+        entry = self.file_model.entry(index.row())
+        if entry.is_dir:
+            self.navigate_to(os.path.join(self.docs_path, entry.name))
 
-                if os.path.isdir(item_path):
-                    list_item.setIcon(folder_icon)
-                else:
-                    list_item.setIcon(file_icon)
+    def navigate_to(self, path):
+        """Abrir una carpeta añadiéndola al historial."""
+        self.docs_path = path
+        # Abrir una carpeta descarta el historial "adelante", como en cualquier navegador
+        del self.history[self.history_index + 1:]
+        self.history.append(self.docs_path)
+        if len(self.history) > MAX_HISTORY:
+            del self.history[0]
+        self.history_index = len(self.history) - 1
+        self.refresh_file_list()
+        self.back_button.setEnabled(self.history_index > 0)
+        self.forward_button.setEnabled(False)
 
-                self.file_list.addItem(list_item)
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Error", "The documents folder could not be found.")
+    def on_search_text_changed(self, text):
+        """Mostrar los resultados mientras haya texto; buscar cuando se deja de escribir."""
+        searching = bool(text.strip())
+        self.search_results.setVisible(searching)
+        self.file_list.setVisible(not searching)
+        if searching:
+            self.search_timer.start()
+        else:
+            self.search_timer.stop()
+            self.search_results.clear()
 
-    def open_item(self, item):
-        """Abrir el archivo o carpeta seleccionado."""
-        item_path = os.path.join(self.docs_path, item.text())
-        if os.path.isdir(item_path):
-            self.docs_path = item_path
-            self.history.append(self.docs_path)
-            self.history_index += 1
-            self.refresh_file_list()
-            self.back_button.setEnabled(self.history_index > 0)
-            self.forward_button.setEnabled(False)
+    def on_index_updated(self):
+        if self.search_results.isVisible():
+            self.search_timer.start()
+
+    def run_search(self):
+        """Consultar el índice y llenar la lista de resultados."""
+        self.search_results.clear()
+        folder_icon = get_icon("data/icons/folder.png")
+        file_icon = get_icon("data/icons/file.png")
+        for result in self.search_service.search(self.search_box.text(), SEARCH_LIMIT):
+            relative = os.path.relpath(result.path, self.base_docs_path)
+            snippet = " ".join(result.snippet.split())
+            label = f"{relative}  —  {snippet}" if snippet else relative
+            item = QListWidgetItem(folder_icon if result.is_dir else file_icon, label)
+            item.setData(Qt.UserRole, result.path)
+            item.setData(Qt.UserRole + 1, result.is_dir)
+            self.search_results.addItem(item)
+
+    def open_search_result(self, item):
+        """Abrir la carpeta encontrada, o la que contiene el archivo encontrado."""
+        path = item.data(Qt.UserRole)
+        folder = path if item.data(Qt.UserRole + 1) else os.path.dirname(path)
+        if not os.path.isdir(folder):
+            QMessageBox.warning(self, "Error", f"'{os.path.basename(path)}' no longer exists.")
+            return
+        self.search_box.clear()
+        self.navigate_to(folder)
 
     def go_back(self):
         """Navegar hacia atrás en el historial."""
@@ -133,7 +206,7 @@ class Docs(QWidget):
             folder_path = os.path.join(self.docs_path, folder_name)
             if not os.path.exists(folder_path):
                 os.mkdir(folder_path)
-                self.refresh_file_list()
+                self.file_model.sync()
             else:
                 QMessageBox.warning(self, "Error", f"Folder '{folder_name}' already exists!")
                 
@@ -147,26 +220,27 @@ class Docs(QWidget):
                 if ok:
                     with open(file_path, 'w') as file:
                         file.write(file_content)
-                    self.refresh_file_list()
+                    self.file_model.sync()
             else:
                 QMessageBox.warning(self, "Error", f"File '{file_name}' already exists!")
 
     def delete_item(self):
         """Eliminar el archivo o carpeta seleccionada."""
-        current_item = self.file_list.currentItem()
-        if current_item:
-            item_path = os.path.join(self.docs_path, current_item.text())
-            if QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete '{current_item.text()}'?",
+        current_index = self.file_list.currentIndex()
+        if current_index.isValid():
+            name = self.file_model.entry(current_index.row()).name
+            item_path = os.path.join(self.docs_path, name)
+            if QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete '{name}'?",
                                      QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
                 if os.path.isdir(item_path):
                     try:
                         os.rmdir(item_path)  # Eliminar carpeta (debe estar vacía)
                     except OSError:
-                        QMessageBox.warning(self, "Error", f"Folder '{current_item.text()}' is not empty!")
+                        QMessageBox.warning(self, "Error", f"Folder '{name}' is not empty!")
                         return
                 else:
                     os.remove(item_path)  # Eliminar archivo
-                self.refresh_file_list()
+                self.file_model.sync()
         else:
             QMessageBox.warning(self, "Error", "No item selected for deletion!")
 
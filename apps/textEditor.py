@@ -1,6 +1,15 @@
 import os
-from PySide6.QtWidgets import QMainWindow, QTextEdit, QFileDialog, QToolBar, QMessageBox
-from PySide6.QtGui import QIcon, QAction
+from PySide6.QtWidgets import (QMainWindow, QPlainTextEdit, QFileDialog, QToolBar, QMessageBox, QProgressBar,
+                               QStackedWidget, QInputDialog)
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QIcon, QAction, QTextCursor
+from controller.fileViewer import FileViewer
+from controller.recoveryJournal import (RecoveryJournal, journal_base_changed, orphaned_journals, read_journal,
+                                        rebuild_lines)
+from controller.textStream import DocumentLoader, DocumentWriter
+
+# A partir de este tamaño los archivos se abren en el visor de solo lectura (mmap)
+VIEWER_MIN_SIZE = 64 * 1024 * 1024
 
 class TextEditor(QMainWindow):
     def __init__(self, docs_path=None):
@@ -8,9 +17,37 @@ class TextEditor(QMainWindow):
         self.setWindowTitle("Text Editor")
         self.setGeometry(100, 100, 800, 600)
 
-        # Crear el área de texto
-        self.text_edit = QTextEdit(self)
-        self.setCentralWidget(self.text_edit)
+        # Crear el área de texto (QPlainTextEdit solo distribuye las líneas visibles)
+        self.text_edit = QPlainTextEdit(self)
+
+        # Visor para archivos enormes: solo lee del disco las líneas visibles
+        self.viewer = FileViewer(self)
+        self.viewer.index_progress.connect(self.on_progress)
+        self.viewer.index_finished.connect(self.on_index_finished)
+        self.viewer.search_finished.connect(self.on_search_finished)
+
+        self.stack = QStackedWidget(self)
+        self.stack.addWidget(self.text_edit)
+        self.stack.addWidget(self.viewer)
+        self.setCentralWidget(self.stack)
+
+        # Carga y guardado por fragmentos, sin copiar el archivo entero en memoria
+        self.file_path = None
+        self.loader = DocumentLoader(self.text_edit.document(), self)
+        self.loader.progress.connect(self.on_progress)
+        self.loader.finished.connect(self.on_load_finished)
+        self.writer = DocumentWriter(self.text_edit.document(), self)
+        self.writer.progress.connect(self.on_progress)
+        self.writer.finished.connect(self.on_save_finished)
+
+        # Diario de recuperación: los cambios sin guardar se registran en segundo plano
+        self.journal = RecoveryJournal(self.text_edit.document(), self)
+        self.journal.start(None)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.statusBar().addPermanentWidget(self.progress_bar)
 
         # Crear una barra de herramientas
         self.toolbar = QToolBar("File Actions", self)
@@ -26,41 +63,206 @@ class TextEditor(QMainWindow):
         save_action = QAction(QIcon.fromTheme("document-save"), "Save", self)
         save_action.triggered.connect(self.save_file)
 
+        find_action = QAction(QIcon.fromTheme("edit-find"), "Find", self)
+        find_action.setShortcut("Ctrl+F")
+        find_action.triggered.connect(self.find_text)
+
         # Añadir acciones a la barra de herramientas
         self.toolbar.addAction(open_action)
         self.toolbar.addAction(save_action)
+        self.toolbar.addAction(find_action)
+        self.search_text = ""
+
+        # Ofrecer recuperar lo que no se guardó en una sesión anterior, ya con la ventana visible
+        QTimer.singleShot(0, self.offer_recovery)
+
+    def offer_recovery(self):
+        """Ofrecer restaurar los cambios sin guardar de un editor que no se cerró normalmente."""
+        for journal_path in orphaned_journals():
+            records = read_journal(journal_path)
+            if len(records) >= 2 and records[0].get("type") == "base":
+                self.ask_restore(records)
+                self.remove_journal(journal_path)
+                return  # Uno por vez: los demás se ofrecen la próxima vez
+            # Diario vacío o ilegible: no hay nada que recuperar
+            self.remove_journal(journal_path)
+
+    def ask_restore(self, records):
+        header = records[0]
+        name = os.path.basename(header["path"]) if header.get("path") else "untitled"
+        message = f"Unsaved changes to '{name}' from a previous session were found. Do you want to restore them?"
+        if journal_base_changed(header):
+            message += "\n\nThe file has changed on disk since then, so the restored text may not be exact."
+        if QMessageBox.question(self, "Restore Unsaved Changes", message,
+                                QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+            return
+        try:
+            lines = rebuild_lines(records)
+        except (OSError, KeyError, TypeError) as e:
+            self.show_error_message(f"Error al recuperar los cambios: {e}")
+            return
+        self.restore(header.get("path"), lines)
+
+    def restore(self, path, lines):
+        """Mostrar el texto recuperado como documento modificado, protegido ya por un diario nuevo."""
+        self.loader.cancel()
+        self.viewer.close_file()
+        self.stack.setCurrentWidget(self.text_edit)
+        self.journal.stop()
+        self.text_edit.setPlainText("\n".join(lines))
+        self.text_edit.document().setModified(True)
+        self.file_path = path
+        self.setWindowTitle(f"Text Editor - {os.path.basename(path) if path else 'untitled'} (restored)")
+        self.journal.write_snapshot(path, lines)
+
+    def remove_journal(self, journal_path):
+        try:
+            os.remove(journal_path)
+        except OSError:
+            pass
 
     def open_file(self):
         """Abrir un archivo de texto y cargarlo en el editor."""
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getOpenFileName(self, "Open File", "", "Text Files (*.txt);;All Files (*)", options=options)
-        
+
         if file_name:
-            try:
-                with open(file_name, 'r') as file:
-                    self.text_edit.setPlainText(file.read())
-            except Exception as e:
-                self.show_error_message(f"Error al abrir el archivo: {e}")
+            self.load_file(file_name)
+
+    def load_file(self, file_name):
+        """Leer el archivo en segundo plano; el texto aparece a medida que llega."""
+        if self.writer.saving:
+            self.show_error_message("Espera a que termine el guardado en curso.")
+            return
+        try:
+            size = os.path.getsize(file_name)
+        except OSError as e:
+            self.show_error_message(f"Error al abrir el archivo: {e}")
+            return
+        if size >= VIEWER_MIN_SIZE:
+            self.open_viewer(file_name)
+            return
+
+        self.viewer.close_file()
+        self.stack.setCurrentWidget(self.text_edit)
+        self.file_path = file_name
+        self.setWindowTitle(f"Text Editor - {os.path.basename(file_name)}")
+        self.text_edit.setReadOnly(True)
+        self.start_progress("Abriendo")
+        # El documento anterior se abandona; la carga no se registra en el diario
+        self.journal.discard()
+        self.loader.load(file_name)
+
+    def open_viewer(self, file_name):
+        """Abrir un archivo enorme en el visor de solo lectura; las líneas se indexan en segundo plano."""
+        try:
+            self.viewer.open(file_name)
+        except (OSError, ValueError) as e:
+            self.show_error_message(f"Error al abrir el archivo: {e}")
+            return
+        # Liberar el documento anterior: el visor no lo usa
+        self.loader.cancel()
+        self.journal.discard()
+        self.text_edit.clear()
+        self.stack.setCurrentWidget(self.viewer)
+        self.file_path = None
+        self.setWindowTitle(f"Text Editor - {os.path.basename(file_name)} (read-only)")
+        self.start_progress("Indexando líneas")
+
+    def on_index_finished(self):
+        self.progress_bar.hide()
+        self.statusBar().showMessage(f"{self.viewer.mapped.line_count:,} líneas")
+
+    def in_viewer(self):
+        return self.stack.currentWidget() is self.viewer
+
+    def find_text(self):
+        """Buscar texto desde la posición actual (en el visor, sobre el archivo mapeado)."""
+        text, ok = QInputDialog.getText(self, "Find", "Find text:", text=self.search_text)
+        if not ok or not text:
+            return
+        self.search_text = text
+        if self.in_viewer():
+            self.statusBar().showMessage("Buscando...")
+            self.viewer.find(text)
+            return
+        # Desde el cursor hasta el final y, si no aparece, desde el principio
+        found = self.text_edit.find(text)
+        if not found:
+            self.text_edit.moveCursor(QTextCursor.Start)
+            found = self.text_edit.find(text)
+        self.on_search_finished(found)
+
+    def on_search_finished(self, found):
+        if found:
+            self.statusBar().clearMessage()
+        else:
+            self.statusBar().showMessage(f"'{self.search_text}' no encontrado")
+
+    def on_load_finished(self, error):
+        self.text_edit.setReadOnly(False)
+        self.progress_bar.hide()
+        self.statusBar().clearMessage()
+        if error:
+            self.show_error_message(f"Error al abrir el archivo: {error}")
+            return
+        self.journal.start(self.file_path)
 
     def save_file(self):
         """Guardar el archivo en la carpeta 'My Docs'."""
+        if self.in_viewer():
+            self.show_error_message("El archivo está abierto en el visor de solo lectura.")
+            return
+        if self.loader.loading or self.writer.saving:
+            self.show_error_message("Espera a que termine la operación en curso.")
+            return
         options = QFileDialog.Options()
 
-        # Usa `docs_path` como la ruta predeterminada, si está disponible
-        if self.docs_path:
+        # Usa el archivo abierto o `docs_path` como la ruta predeterminada, si está disponible
+        if self.file_path:
+            initial_path = self.file_path
+        elif self.docs_path:
             initial_path = os.path.join(self.docs_path, "untitled.txt")
         else:
             initial_path = "untitled.txt"  # Nombre por defecto si no hay ruta
 
         # Abre el diálogo de guardar archivo
         file_name, _ = QFileDialog.getSaveFileName(self, "Save File", initial_path, "Text Files (*.txt);;All Files (*)", options=options)
-        
+
         if file_name:
-            try:
-                with open(file_name, 'w') as file:
-                    file.write(self.text_edit.toPlainText())
-            except Exception as e:
-                self.show_error_message(f"Error al guardar el archivo: {e}")
+            self.write_file(file_name)
+
+    def write_file(self, file_name):
+        """Guardar el documento bloque a bloque; el editor queda en solo lectura mientras tanto."""
+        self.file_path = file_name
+        self.text_edit.setReadOnly(True)
+        self.start_progress("Guardando")
+        self.writer.save(file_name, self.loader.newline)
+
+    def on_save_finished(self, error):
+        self.text_edit.setReadOnly(False)
+        self.progress_bar.hide()
+        self.statusBar().clearMessage()
+        if error:
+            self.show_error_message(f"Error al guardar el archivo: {error}")
+            return
+        # Lo guardado es la nueva base: el diario anterior ya no hace falta
+        self.journal.start(self.file_path)
+
+    def start_progress(self, message):
+        self.statusBar().showMessage(message)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+
+    def on_progress(self, percent):
+        self.progress_bar.setValue(percent)
+
+    def closeEvent(self, event):
+        """Detener la lectura en curso, liberar el archivo mapeado y guardar ya el último parche."""
+        self.loader.cancel()
+        self.viewer.close_file()
+        self.journal.flush()
+        super().closeEvent(event)
 
     def show_error_message(self, message):
         """Muestra un mensaje de error en caso de problemas con archivos."""
@@ -1,7 +1,8 @@
 from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout, QMessageBox
-from PySide6.QtGui import QPixmap, QPainter, QPainterPath
-from PySide6.QtCore import Qt
 import os
+from controller.avatarCache import get_avatar_cache
+from controller.sensors import get_sensor_service, format_battery
+from controller.sessionManager import get_session_manager
 
 class UserPanel(QWidget):
     def __init__(self, username, role, image_path, parent=None):
@@ -28,7 +29,19 @@ class UserPanel(QWidget):
         
         self.role_label = QLabel(f"Role: {self.role.capitalize()}")
         self.role_label.setStyleSheet("font-size: 14px;")
+
+        # Estado de la batería compartido con la barra de tareas
+        self.battery_label = QLabel()
+        self.battery_label.setStyleSheet("font-size: 14px;")
+        sensors = get_sensor_service()
+        self.update_battery_status(sensors.battery)
+        sensors.battery_changed.connect(self.update_battery_status)
         
+        # Botón para cambiar de usuario sin cerrar la sesión
+        self.switch_user_button = QPushButton("Switch User")
+        self.switch_user_button.setStyleSheet(self.get_button_style())
+        self.switch_user_button.clicked.connect(self.switch_user)
+
         # Botón de cerrar sesión
         self.logout_button = QPushButton("Logout")
         self.logout_button.setStyleSheet(self.get_button_style())
@@ -38,6 +51,7 @@ class UserPanel(QWidget):
         self.main_layout.addWidget(self.user_image_label)
         self.main_layout.addWidget(self.username_label)
         self.main_layout.addWidget(self.role_label)
+        self.main_layout.addWidget(self.battery_label)
         
         # Opciones personalizadas según el rol
         if self.role == "admin":
@@ -45,7 +59,8 @@ class UserPanel(QWidget):
         else:
             self.add_user_controls()
         
-        # Botón de cerrar sesión
+        # Botones de sesión
+        self.main_layout.addWidget(self.switch_user_button)
         self.main_layout.addWidget(self.logout_button)
         
         self.setLayout(self.main_layout)
@@ -65,15 +80,31 @@ class UserPanel(QWidget):
         """
     
     def load_user_image(self):
-        """Cargar y mostrar la imagen del usuario."""
+        """Cargar y mostrar la imagen del usuario desde la caché de miniaturas."""
         if os.path.exists(self.image_path):
-            pixmap = QPixmap(self.image_path)
-            rounded_pixmap = self.get_round_pixmap(pixmap, 150)
-            self.user_image_label.setPixmap(rounded_pixmap)
             self.user_image_label.setFixedSize(150, 150)
+            avatars = get_avatar_cache()
+            pixmap = avatars.pixmap(self.image_path, 150)
+            if pixmap is not None:
+                self.user_image_label.setPixmap(pixmap)
+            else:
+                # La miniatura se genera en segundo plano
+                avatars.avatar_ready.connect(self.on_avatar_ready)
         else:
             print(f"Imagen no encontrada en la ruta: {self.image_path}")
+
+    def on_avatar_ready(self, image_path, size):
+        """Mostrar la miniatura cuando termina de generarse."""
+        if (image_path, size) == (self.image_path, 150):
+            pixmap = get_avatar_cache().pixmap(image_path, size)
+            if pixmap is not None:
+                self.user_image_label.setPixmap(pixmap)
+                get_avatar_cache().avatar_ready.disconnect(self.on_avatar_ready)
     
+    def update_battery_status(self, status):
+        """Mostrar el estado de la batería recibido del servicio de sensores."""
+        self.battery_label.setText(format_battery(status))
+
     def add_admin_controls(self):
         """Agregar botones especiales para administradores."""
         self.admin_button = QPushButton("Open Admin Panel")
@@ -100,22 +131,13 @@ class UserPanel(QWidget):
         """Mostrar información del sistema."""
         QMessageBox.information(self, "System Info", "This would display system information.")
     
+    def switch_user(self):
+        """Suspender la sesión (el escritorio queda en memoria) y volver al login."""
+        self.close()
+        get_session_manager().switch_user()
+
     def logout(self):
         """Cerrar sesión."""
         QMessageBox.information(self, "Logout", "Logging out...")
         self.close()
-    
-    def get_round_pixmap(self, pixmap, size):
-        """Devuelve una imagen redondeada (PixMap) para mostrar como perfil."""
-        rounded_pixmap = QPixmap(size, size)
-        rounded_pixmap.fill(Qt.transparent)  # Hacer el fondo transparente
-
-        painter = QPainter(rounded_pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        path.addEllipse(0, 0, size, size)
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        painter.end()
-
-        return rounded_pixmap
+        get_session_manager().logout(self.username)
@@ -0,0 +1,123 @@
+"""Benchmark del autoguardado (diario de recuperación) de TextEditor.
+
+Abre un archivo tipo log, simula escritura (letras, saltos de línea, borrados y
+saltos a otras líneas) y mide la latencia por tecla con el diario activo y sin él.
+El diario usa esperas cortas para forzar muchas escrituras durante la prueba. Al
+final reconstruye el documento desde el diario, como tras una caída, y lo compara.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.autosave [--megabytes 10] [--keys 2000] [--delay-ms 20]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.textEditorFiles import make_file
+
+TYPED = "Lorem ipsum dolor sit amet\n"
+
+
+def wait_until(condition, timeout=30):
+    from PySide6.QtWidgets import QApplication
+
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+def type_keys(editor, keys):
+    """Simular `keys` pulsaciones; devuelve la latencia (ms) de cada una, incluido el trabajo pendiente."""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtTest import QTest
+    from PySide6.QtWidgets import QApplication
+
+    text_edit = editor.text_edit
+    document = text_edit.document()
+    samples = []
+    for index in range(keys):
+        if index % 100 == 0:
+            # Saltar a otra parte del documento
+            cursor = QTextCursor(document.findBlockByNumber(index * 7919 % document.blockCount()))
+            text_edit.setTextCursor(cursor)
+        start = time.perf_counter()
+        if index % 37 == 36:
+            QTest.keyClick(text_edit, Qt.Key_Backspace)
+        elif TYPED[index % len(TYPED)] == "\n":
+            QTest.keyClick(text_edit, Qt.Key_Return)
+        else:
+            QTest.keyClicks(text_edit, TYPED[index % len(TYPED)])
+        QApplication.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.004)  # Unas 200 teclas por segundo; deja correr los temporizadores
+    return samples
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return (f"mediana {statistics.median(samples):5.2f} ms  p99 {samples[int(len(samples) * 0.99) - 1]:5.2f} ms"
+            f"  máx. {samples[-1]:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=10)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--delay-ms", type=int, default=20, help="espera del autoguardado durante la prueba")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QThreadPool
+    from PySide6.QtWidgets import QApplication
+    import controller.recoveryJournal as recovery
+    from apps.textEditor import TextEditor
+
+    app = QApplication(sys.argv)
+    workdir = tempfile.mkdtemp(prefix="autosave-benchmark-")
+    recovery.RECOVERY_DIR = os.path.join(workdir, "recovery")
+    recovery.AUTOSAVE_DELAY = args.delay_ms
+    recovery.AUTOSAVE_MAX_DELAY = args.delay_ms * 5
+    try:
+        path = os.path.join(workdir, "log.txt")
+        make_file(path, args.megabytes)
+        editor = TextEditor()
+        editor.show()
+        editor.load_file(path)
+        wait_until(lambda: not editor.loader.loading, timeout=120)
+        print(f"{args.megabytes} MB, {editor.text_edit.blockCount():,} líneas, {args.keys} teclas:")
+
+        editor.journal.stop()
+        print(f"  sin diario   {summary(type_keys(editor, args.keys))}")
+
+        editor.journal.start(path)  # Base: el archivo en disco; los cambios anteriores se ignoran
+        editor.text_edit.document().setModified(False)
+        # El diario parte del archivo: se recarga para que la base coincida
+        editor.load_file(path)
+        wait_until(lambda: not editor.loader.loading, timeout=120)
+        writes = [0]
+        editor.journal._signals.written.connect(lambda *_: writes.__setitem__(0, writes[0] + 1))
+        print(f"  con diario   {summary(type_keys(editor, args.keys))}  ({writes[0]} escrituras)")
+
+        # Simular una caída: reconstruir desde lo escrito en disco
+        editor.journal.flush()
+        wait_until(lambda: not editor.journal.writing and not editor.journal.operations)
+        records = recovery.read_journal(editor.journal.path)
+        identical = recovery.rebuild_lines(records) == editor.text_edit.toPlainText().split("\n")
+        print(f"  diario       {os.path.getsize(editor.journal.path) / 1024:6.1f} KB, {len(records) - 1} parches"
+              f"  (recuperación {'idéntica' if identical else 'DIFERENTE'})")
+
+        editor.journal.discard()
+        wait_until(lambda: not editor.journal.writing and not editor.journal.operations)
+        editor.close()
+        QThreadPool.globalInstance().waitForDone()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark del motor de expresiones de la calculadora frente al eval anterior.
+
+Genera expresiones aleatorias con la sintaxis de los botones (números, + - * / % ^,
+paréntesis, sin/cos/tan/ln/√/exp, π y e) y mide:
+  - el camino anterior: cadena de replace() + eval(),
+  - el motor sin caché (analizar e interpretar cada expresión la primera vez),
+  - el motor con caché (reevaluar un conjunto de expresiones ya compiladas),
+cuenta en cuántas expresiones coinciden los resultados y comprueba casos límite
+(potencias anidadas, números seguidos) que antes colgaban la interfaz o se aceptaban.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.calculatorEngine [--count 100000] [--working-set 1000] [--seed 1]
+"""
+import argparse
+import math
+import random
+import time
+
+from controller.expressionEngine import ExpressionError, clear_caches, evaluate
+
+FUNCTIONS = ["sin", "cos", "tan", "ln", "√", "exp"]
+OPERATORS = ["+", "-", "*", "/", "%", "^"]
+
+# Casos límite: expresión -> resultado esperado (ExpressionError si debe rechazarse).
+# Cada uno se evalúa dos veces (interpretado y compilado) y debe tardar poco.
+REGRESSIONS = {
+    "((9^1024)^1024)^1024": ExpressionError,
+    "9^9^9": ExpressionError,
+    "(2^5000)^2": ExpressionError,
+    "2^100": 2 ** 100,
+    "1^99999999": 1.0,
+    "1..2": ExpressionError,
+    "2 3": ExpressionError,
+    "2π": 2 * math.pi,
+}
+REGRESSION_MAX_SECONDS = 0.1
+
+
+def random_expression(rng, depth=0):
+    """Expresión aleatoria tal como la escribirían los botones de la calculadora."""
+    if depth >= 3 or rng.random() < 0.3:
+        choice = rng.random()
+        if choice < 0.5:
+            return str(rng.randint(0, 99))
+        if choice < 0.8:
+            return f"{rng.uniform(0, 100):.2f}"
+        return rng.choice(["π", "e"])
+    kind = rng.random()
+    if kind < 0.2:
+        return f"{rng.choice(FUNCTIONS)}({random_expression(rng, depth + 1)})"
+    if kind < 0.3:
+        return f"({random_expression(rng, depth + 1)})"
+    operator = rng.choice(OPERATORS)
+    left = random_expression(rng, depth + 1)
+    if operator == "^":
+        # Base entre paréntesis y exponente pequeño: con 99^99^99 el eval anterior no terminaría
+        return f"({left})^{rng.randint(0, 4)}"
+    return f"{left}{operator}{random_expression(rng, depth + 1)}"
+
+
+def legacy_evaluate(expression):
+    """Camino anterior de Calculator.on_click (incluidos sus reemplazos de texto)."""
+    expression = expression.replace('√', 'math.sqrt').replace('^', '**').replace('ln', 'math.log')
+    expression = expression.replace('π', str(math.pi)).replace('e', str(math.e))
+    expression = expression.replace('sin', 'math.sin').replace('cos', 'math.cos').replace('tan', 'math.tan')
+    return eval(expression)
+
+
+def run(function, expressions):
+    """Evaluar todas las expresiones; devuelve (segundos, resultados con None si hubo error)."""
+    results = []
+    start = time.perf_counter()
+    for expression in expressions:
+        try:
+            results.append(function(expression))
+        except Exception:
+            results.append(None)
+    return time.perf_counter() - start, results
+
+
+def same(a, b):
+    if a is None or b is None:
+        return a is b
+    try:
+        return math.isclose(a, b, rel_tol=1e-9) or (math.isnan(a) and math.isnan(b))
+    except TypeError:
+        return False  # Resultado complejo del eval anterior
+
+
+def check_regressions():
+    """Devuelve {expresión: descripción} de los casos límite que fallan o tardan demasiado."""
+    failures = {}
+    for expression, expected in REGRESSIONS.items():
+        for _ in range(2):
+            start = time.perf_counter()
+            try:
+                result = evaluate(expression)
+            except ExpressionError:
+                result = ExpressionError
+            seconds = time.perf_counter() - start
+            if result != expected or seconds > REGRESSION_MAX_SECONDS:
+                failures[expression] = f"{result!r} en {seconds:.2f} s"
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--working-set", type=int, default=1000, help="expresiones distintas al reevaluar")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    expressions = [random_expression(rng) for _ in range(args.count)]
+    print(f"{args.count:,} expresiones aleatorias ({len(set(expressions)):,} distintas)")
+
+    legacy_seconds, legacy = run(legacy_evaluate, expressions)
+    clear_caches()
+    engine_seconds, engine = run(evaluate, expressions)
+
+    working_set = expressions[:args.working_set]
+    repeats = max(1, args.count // len(working_set))
+    run(evaluate, working_set)  # Primera vez: se interpretan
+    run(evaluate, working_set)  # Segunda vez: se compilan y quedan en caché
+    start = time.perf_counter()
+    for _ in range(repeats):
+        run(evaluate, working_set)
+    cached_seconds = time.perf_counter() - start
+    cached_count = repeats * len(working_set)
+
+    def line(label, seconds, count):
+        print(f"  {label:28} {seconds:6.2f} s  {seconds / count * 1e6:6.2f} µs/expresión")
+
+    line("eval anterior", legacy_seconds, args.count)
+    line("motor, sin caché", engine_seconds, args.count)
+    line(f"motor, con caché ({len(working_set)} distintas)", cached_seconds, cached_count)
+
+    agree = sum(1 for a, b in zip(legacy, engine) if same(a, b))
+    legacy_only_errors = sum(1 for a, b in zip(legacy, engine) if a is None and b is not None)
+    engine_only_errors = sum(1 for a, b in zip(legacy, engine) if b is None and a is not None)
+    print(f"  resultados iguales           {agree:,} de {args.count:,}")
+    print(f"  error solo en el eval        {legacy_only_errors:,}  (p. ej. 'exp' roto por el reemplazo de 'e')")
+    print(f"  error solo en el motor       {engine_only_errors:,}")
+
+    failures = check_regressions()
+    print(f"  casos límite                 {len(REGRESSIONS) - len(failures)} de {len(REGRESSIONS)} correctos")
+    for expression, failure in failures.items():
+        print(f"    FALLO {expression} -> {failure}")
+
+    # El motor rechaza lo que no es matemática; el eval anterior lo ejecutaría
+    try:
+        evaluate("__import__('os').getcwd()")
+    except ExpressionError as e:
+        print(f"  código inyectado             rechazado: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark de la evaluación vectorizada y del modo gráfico de la calculadora.
+
+Para varias funciones de x mide:
+  - evaluate_batch sobre 10^6 puntos en una sola llamada,
+  - el bucle de Python con evaluate() (ya compilada) sobre una parte de los puntos,
+  - la reducción mínimo/máximo al ancho del gráfico en píxeles,
+y comprueba que ambas evaluaciones coinciden en los puntos comunes.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.calculatorPlot [--points 1000000] [--loop-points 100000] [--width 800]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from controller.expressionEngine import evaluate, evaluate_batch
+from controller.functionPlot import min_max_downsample
+
+EXPRESSIONS = ["sin x", "x^3 - 2x + 1", "exp(-x^2/2)cos(5x)", "√x + ln x", "tan x"]
+
+
+def loop_evaluate(text, xs):
+    """Evaluación punto a punto, como haría un bucle sobre la API escalar."""
+    results = []
+    for x in xs:
+        try:
+            results.append(evaluate(text, x=x))
+        except (ArithmeticError, ValueError):
+            results.append(math.nan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--loop-points", type=int, default=100_000, help="puntos evaluados con el bucle")
+    parser.add_argument("--width", type=int, default=800, help="ancho del gráfico en píxeles")
+    args = parser.parse_args()
+
+    x = np.linspace(-10, 10, args.points)
+    loop_x = x[::max(1, args.points // args.loop_points)]
+    print(f"{args.points:,} puntos en [-10, 10]; bucle sobre {len(loop_x):,}; {args.width} px")
+    print(f"  {'f(x)':22} {'vectorizada':>12} {'bucle (por 10^6)':>17} {'reducción':>10} {'puntos':>7}  iguales")
+    for text in EXPRESSIONS:
+        evaluate_batch(text, x=x[:10])  # Compilar fuera de la medida
+        start = time.perf_counter()
+        y = evaluate_batch(text, x=x)
+        batch_seconds = time.perf_counter() - start
+
+        loop_evaluate(text, loop_x[:2])
+        start = time.perf_counter()
+        loop_y = np.array(loop_evaluate(text, loop_x.tolist()))
+        loop_seconds = (time.perf_counter() - start) * args.points / len(loop_x)
+
+        start = time.perf_counter()
+        segments = min_max_downsample(x, y, args.width)
+        downsample_seconds = time.perf_counter() - start
+        points = sum(len(xs) for xs, _ in segments)
+
+        # Fuera del dominio el bucle da NaN y NumPy NaN o ±inf
+        batch_y = y[::max(1, args.points // args.loop_points)]
+        finite = np.isfinite(batch_y) & np.isfinite(loop_y)
+        equal = bool(np.allclose(batch_y[finite], loop_y[finite], rtol=1e-12, atol=0))
+        print(f"  {text:22} {batch_seconds * 1000:9.1f} ms {loop_seconds * 1000:14.0f} ms"
+              f" {downsample_seconds * 1000:7.1f} ms {points:7,}  {'sí' if equal else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark del listado de carpetas de Docs sobre árboles sintéticos grandes.
+
+Genera data/docs/<id>/synthetic-<N> con N entradas en la carpeta raíz (10% carpetas,
+cada una con `--fanout` archivos y `--depth` niveles), la abre en Docs y mide:
+  - tiempo hasta el primer lote visible,
+  - tiempo hasta el listado completo,
+  - bloqueo más largo del hilo de la interfaz mientras se lista,
+  - pintado de la vista,
+  - con --depth > 1, atrás/adelante entre la raíz y una subcarpeta precargada.
+El árbol se elimina al terminar salvo con --keep (útil para probar la app a mano).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.docsRefresh [--entries 50000] [--rounds 3] [--user-id benchmark]
+                                     [--depth 1] [--fanout 0] [--keep]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+
+DEFAULT_USER = "benchmark"
+
+
+def create_tree(path, entries, depth=1, fanout=0):
+    """Crear `entries` entradas en `path` (una de cada diez es carpeta).
+
+    Si `depth` > 1, cada carpeta recibe `fanout` entradas más, recursivamente.
+    Devuelve el número total de entradas creadas.
+    """
+    os.makedirs(path, exist_ok=True)
+    created = 0
+    for index in range(entries):
+        entry = os.path.join(path, f"entry-{index:06d}")
+        created += 1
+        if index % 10 == 0:
+            os.mkdir(entry)
+            if depth > 1 and fanout:
+                created += create_tree(entry, fanout, depth - 1, fanout)
+        else:
+            with open(entry + ".txt", "w") as file:
+                file.write(f"synthetic file {index}\n")
+    return created
+
+
+def measure_listing(app, docs, path):
+    """Abrir `path` en Docs (sin caché) y esperar al listado completo midiendo los bloqueos de la interfaz."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    docs.file_model.cache.clear()
+    loop = QEventLoop()
+    times = {"first_batch": None, "stall": 0.0}
+    last_tick = [time.perf_counter()]
+
+    def on_tick():
+        now = time.perf_counter()
+        times["stall"] = max(times["stall"], now - last_tick[0])
+        last_tick[0] = now
+
+    def on_rows_inserted(*_):
+        if times["first_batch"] is None:
+            times["first_batch"] = time.perf_counter()
+
+    ticker = QTimer()
+    ticker.setInterval(0)
+    ticker.timeout.connect(on_tick)
+    docs.file_model.rowsInserted.connect(on_rows_inserted)
+    docs.file_model.loading_finished.connect(loop.quit)
+
+    start = time.perf_counter()
+    last_tick[0] = start
+    ticker.start()
+    docs.docs_path = path
+    docs.history = [path]
+    docs.history_index = 0
+    docs.refresh_file_list()
+    if docs.file_model.loading:
+        loop.exec()
+    end = time.perf_counter()
+    ticker.stop()
+    docs.file_model.rowsInserted.disconnect(on_rows_inserted)
+    docs.file_model.loading_finished.disconnect(loop.quit)
+
+    return {
+        "first_batch": ((times["first_batch"] or end) - start) * 1000,
+        "total": (end - start) * 1000,
+        "stall": times["stall"] * 1000,
+    }
+
+
+def measure_history(app, docs, rounds):
+    """Entrar en la primera subcarpeta y medir atrás/adelante (deberían salir de la caché)."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    # Dar tiempo a la precarga de subcarpetas
+    loop = QEventLoop()
+    QTimer.singleShot(500, loop.quit)
+    loop.exec()
+
+    model = docs.file_model
+    row = next(row for row in range(model.rowCount()) if model.entry(row).is_dir)
+    docs.open_item(model.index(row))
+    samples = []
+    for _ in range(rounds):
+        for step in (docs.go_back, docs.go_forward):
+            start = time.perf_counter()
+            step()
+            samples.append(((time.perf_counter() - start) * 1000, not model.loading))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--user-id", default=DEFAULT_USER)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--fanout", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="no borrar el árbol generado")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from apps.docs import Docs
+
+    app = QApplication(sys.argv)
+    user_dir = os.path.join("data", "docs", str(args.user_id))
+    created_user_dir = not os.path.exists(user_dir)
+    tree = os.path.join(user_dir, f"synthetic-{args.entries}")
+    try:
+        start = time.perf_counter()
+        total = create_tree(tree, args.entries, args.depth, args.fanout)
+        print(f"Árbol generado en {tree}: {total} entradas en {time.perf_counter() - start:.1f} s")
+
+        docs = Docs(args.user_id)
+        docs.resize(600, 400)
+        docs.show()
+        samples = [measure_listing(app, docs, tree) for _ in range(args.rounds)]
+        history = measure_history(app, docs, args.rounds) if args.depth > 1 else []
+        paint_start = time.perf_counter()
+        docs.file_list.viewport().grab()
+        paint = (time.perf_counter() - paint_start) * 1000
+
+        print(f"Listado de {args.entries} entradas ({args.rounds} rondas, medianas):")
+        print(f"  primer lote visible     {statistics.median(s['first_batch'] for s in samples):8.1f} ms")
+        print(f"  listado completo        {statistics.median(s['total'] for s in samples):8.1f} ms")
+        print(f"  bloqueo máximo de la UI {statistics.median(s['stall'] for s in samples):8.1f} ms")
+        print(f"  pintado de la vista     {paint:8.1f} ms")
+        if history:
+            hits = sum(1 for _, cached in history if cached)
+            print(f"  atrás/adelante          {statistics.median(ms for ms, _ in history):8.1f} ms"
+                  f"  ({hits}/{len(history)} desde la caché)")
+        docs.close()
+    finally:
+        if not args.keep:
+            shutil.rmtree(tree, ignore_errors=True)
+            if created_user_dir:
+                shutil.rmtree(user_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark del visor de solo lectura (mmap) de TextEditor con archivos enormes.
+
+Para cada tamaño genera un archivo tipo log (con una marca única al final) y mide:
+  - apertura hasta tener pintada la primera pantalla,
+  - construcción del índice de líneas en segundo plano y bloqueo más largo de la interfaz,
+  - salto a la línea central y pintado (comprobando que se muestra la línea correcta),
+  - búsqueda de la marca del final sobre el archivo mapeado,
+  - memoria residente (RSS) tras abrir y tras indexar.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.fileViewer [--sizes 10,100,1024]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import psutil
+
+from benchmarks.textEditorFiles import LINE, make_file
+
+NEEDLE = "needle-at-the-end"
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+def wait_signal(signal, action):
+    """Ejecutar `action` y esperar `signal`; devuelve (segundos, mayor bloqueo de la interfaz)."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    state = {"stall": 0.0, "last": time.perf_counter()}
+
+    def on_tick():
+        now = time.perf_counter()
+        state["stall"] = max(state["stall"], now - state["last"])
+        state["last"] = now
+
+    ticker = QTimer()
+    ticker.setInterval(0)
+    ticker.timeout.connect(on_tick)
+    signal.connect(loop.quit)
+    start = state["last"] = time.perf_counter()
+    ticker.start()
+    action()
+    loop.exec()
+    ticker.stop()
+    signal.disconnect(loop.quit)
+    return time.perf_counter() - start, state["stall"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1024", help="tamaños en MB separados por comas")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QThreadPool
+    from PySide6.QtWidgets import QApplication
+    from apps.textEditor import TextEditor
+
+    app = QApplication(sys.argv)
+    workdir = tempfile.mkdtemp(prefix="viewer-benchmark-")
+    try:
+        for megabytes in (int(size) for size in args.sizes.split(",")):
+            path = os.path.join(workdir, f"log-{megabytes}.txt")
+            make_file(path, megabytes)
+            with open(path, "a") as file:
+                file.write(f"\n{NEEDLE}\n")
+            print(f"{megabytes} MB:")
+
+            editor = TextEditor()
+            editor.resize(800, 600)
+            editor.show()
+            app.processEvents()
+            viewer = editor.viewer
+            base = rss_mb()
+
+            start = time.perf_counter()
+            editor.open_viewer(path)
+            viewer.viewport().grab()
+            print(f"  apertura y primera pantalla {(time.perf_counter() - start) * 1000:7.1f} ms"
+                  f"  RSS +{rss_mb() - base:5.1f} MB")
+
+            seconds, stall = wait_signal(viewer.index_finished, lambda: None)
+            lines = viewer.mapped.line_count
+            print(f"  índice de líneas            {seconds * 1000:7.0f} ms  bloqueo máx. {stall * 1000:5.1f} ms"
+                  f"  RSS +{rss_mb() - base:5.1f} MB  ({lines:,} líneas)")
+
+            middle = lines // 2
+            start = time.perf_counter()
+            viewer.go_to_line(middle)
+            viewer.viewport().grab()
+            elapsed = (time.perf_counter() - start) * 1000
+            shown = viewer.mapped.lines(middle, 1)[0]
+            expected = LINE.format((middle % 12000) % 16, middle % 12000, (middle % 12000) % 997).rstrip("\n")
+            print(f"  salto a la línea {middle:<10,} {elapsed:7.1f} ms"
+                  f"  ({'correcta' if shown == expected else 'INCORRECTA: ' + shown})")
+
+            seconds, stall = wait_signal(viewer.search_finished, lambda: viewer.find(NEEDLE))
+            found = viewer.mapped.line_of(viewer.match[0]) if viewer.match else None
+            print(f"  búsqueda de la marca final  {seconds * 1000:7.0f} ms  bloqueo máx. {stall * 1000:5.1f} ms"
+                  f"  ({'línea ' + format(found, ',') if found is not None else 'no encontrada'})")
+
+            editor.close()
+            editor.deleteLater()
+            app.processEvents()
+            os.remove(path)
+        QThreadPool.globalInstance().waitForDone()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark para elegir el costo del hash de contraseñas en este equipo.
+
+Mide scrypt (variando n) y PBKDF2-SHA256 (variando iteraciones) y recomienda el
+parámetro más cercano al objetivo (100 ms por defecto). Los valores elegidos se
+configuran en controller/passwords.py (SCRYPT_N, PBKDF2_ITERATIONS).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.passwordCost [--target-ms 100] [--rounds 3]
+"""
+import argparse
+import hashlib
+import time
+
+from controller import passwords
+
+SCRYPT_NS = [2 ** exponent for exponent in range(12, 19)]
+PBKDF2_ITERATIONS = [100000, 200000, 400000, 600000, 800000, 1200000, 1600000]
+
+
+def time_hash(rounds, **kwargs):
+    """Devuelve la mediana en ms de `rounds` hashes con los parámetros dados."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        passwords.hash_password("correct horse battery staple", **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def report(title, results, target):
+    """Imprime los tiempos y devuelve el parámetro más cercano al objetivo."""
+    print(title)
+    for value, elapsed in results:
+        print(f"  {value:>9}: {elapsed:8.1f} ms")
+    best = min(results, key=lambda item: abs(item[1] - target))
+    print(f"  -> más cercano a {target:.0f} ms: {best[0]} ({best[1]:.1f} ms)\n")
+    return best[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if hasattr(hashlib, "scrypt"):
+        scrypt_results = [(n, time_hash(args.rounds, scheme="scrypt", n=n, r=passwords.SCRYPT_R, p=passwords.SCRYPT_P))
+                          for n in SCRYPT_NS]
+        report(f"scrypt (r={passwords.SCRYPT_R}, p={passwords.SCRYPT_P}), por valor de n:", scrypt_results, args.target_ms)
+    else:
+        print("scrypt no está disponible en este OpenSSL; se usará PBKDF2.\n")
+
+    pbkdf2_results = [(iterations, time_hash(args.rounds, scheme="pbkdf2_sha256", iterations=iterations))
+                      for iterations in PBKDF2_ITERATIONS]
+    report("PBKDF2-SHA256, por número de iteraciones:", pbkdf2_results, args.target_ms)
+
+    print(f"Configuración actual: {passwords.DEFAULT_SCHEME}, SCRYPT_N={passwords.SCRYPT_N}, "
+          f"PBKDF2_ITERATIONS={passwords.PBKDF2_ITERATIONS}")
+
+
+if __name__ == "__main__":
+    main()
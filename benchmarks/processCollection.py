@@ -0,0 +1,76 @@
+"""Benchmark del costo de una pasada completa de ProcessCollector.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.processCollection
+"""
+import random
+import time
+from collections import namedtuple
+
+from controller.systemMonitor import ProcessCollector
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+IoCounters = namedtuple("IoCounters", "read_count write_count read_bytes write_bytes")
+
+SIZES = (500, 2000, 10000)
+ROUNDS = 20
+
+
+class FakeProcess:
+    """Proceso sintético con el mismo atributo `info` que entrega psutil.process_iter."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.io_bytes = random.randrange(10 ** 9)
+        self.info = {}
+
+    def refresh(self):
+        self.io_bytes += random.randrange(10 ** 5)
+        self.info = {
+            'pid': self.pid,
+            'name': f"proc-{self.pid}",
+            'username': "user",
+            'cpu_percent': random.random() * 100,
+            'memory_info': MemoryInfo(random.randrange(10 ** 9), random.randrange(10 ** 10)),
+            'num_threads': random.randrange(1, 64),
+            'io_counters': IoCounters(0, 0, self.io_bytes, self.io_bytes // 2),
+        }
+
+
+def fake_process_iter(processes):
+    """Devuelve un process_iter que simula la tabla de procesos del sistema."""
+    def process_iter(attrs=None, ad_value=None):
+        for proc in processes:
+            proc.refresh()
+            yield proc
+    return process_iter
+
+
+def bench_synthetic(size):
+    """Mide la pasada de recolección sobre `size` procesos sintéticos."""
+    collector = ProcessCollector(process_iter=fake_process_iter([FakeProcess(pid) for pid in range(size)]))
+    collector.collect()  # Calentar caché y deltas de E/S
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        collector.collect()
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def bench_host():
+    """Mide la pasada de recolección real sobre los procesos de esta máquina."""
+    collector = ProcessCollector()
+    count = len(collector.collect())
+    start = time.perf_counter()
+    for _ in range(5):
+        collector.collect()
+    return count, (time.perf_counter() - start) / 5
+
+
+if __name__ == "__main__":
+    print("Pasada de recolección (procesos sintéticos, sin costo de /proc):")
+    for size in SIZES:
+        elapsed = bench_synthetic(size)
+        print(f"  {size:>6} procesos: {elapsed * 1000:8.2f} ms por pasada")
+
+    count, elapsed = bench_host()
+    print(f"Pasada real en este equipo ({count} procesos): {elapsed * 1000:.2f} ms")
@@ -0,0 +1,89 @@
+"""Benchmark del índice de búsqueda de Docs (nombres por trigramas y contenido con FTS5).
+
+Genera un árbol sintético en una carpeta temporal (por defecto ~110k entradas: 10000 en
+la raíz y 100 por subcarpeta) y mide:
+  - indexado completo (entradas por segundo),
+  - repasada incremental sin cambios (solo stat y comparación),
+  - reindexado de una carpeta tras crear y borrar archivos (lo que dispara el watcher),
+  - latencia de consultas por nombre y por contenido.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.searchIndex [--entries 10000] [--fanout 100] [--queries 50]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.docsRefresh import create_tree
+from controller.searchIndex import IndexWriter, SearchIndex
+
+
+def run_writer(root, db_path, directories=None):
+    """Actualizar el índice y devolver (segundos, entradas indexadas, eliminadas)."""
+    start = time.perf_counter()
+    writer = IndexWriter(root, db_path)
+    writer.update(directories)
+    writer.close()
+    return time.perf_counter() - start, writer.indexed, writer.removed
+
+
+def measure_queries(index, queries, rounds):
+    """Devuelve {consulta: (mediana ms, p95 ms, resultados)}."""
+    results = {}
+    for query in queries:
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            found = index.search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[query] = (statistics.median(samples), samples[int(len(samples) * 0.95) - 1], len(found))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--fanout", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=50, help="repeticiones de cada consulta")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="search-benchmark-")
+    root = os.path.join(workdir, "docs")
+    db_path = os.path.join(workdir, "index.db")
+    try:
+        start = time.perf_counter()
+        total = create_tree(root, args.entries, 2 if args.fanout else 1, args.fanout)
+        print(f"Árbol generado: {total} entradas en {time.perf_counter() - start:.1f} s")
+
+        seconds, indexed, _ = run_writer(root, db_path)
+        print(f"Indexado completo        {seconds:8.2f} s  ({indexed / seconds:,.0f} entradas/s)")
+        print(f"  tamaño del índice      {os.path.getsize(db_path) / 1024 ** 2:8.1f} MB")
+
+        seconds, indexed, _ = run_writer(root, db_path)
+        print(f"Repasada sin cambios     {seconds * 1000:8.0f} ms  ({indexed} reindexadas)")
+
+        # Cambios en una sola carpeta, como los que informa el watcher
+        folder = "entry-000000"
+        for index in range(100):
+            with open(os.path.join(root, folder, f"added-{index}.txt"), "w") as file:
+                file.write(f"informe trimestral {index}\n")
+        os.remove(os.path.join(root, folder, "entry-000001.txt"))
+        seconds, indexed, removed = run_writer(root, db_path, {folder})
+        print(f"Reindexado de una carpeta {seconds * 1000:7.1f} ms  (+{indexed} / -{removed})")
+
+        index = SearchIndex(root, db_path)
+        queries = ["entry-0042", "added", "42", "synthetic", "trimestral", "file 1234", "no-existe"]
+        print(f"Consultas sobre {index.count()} entradas ({args.queries} repeticiones):")
+        for query, (median, p95, found) in measure_queries(index, queries, args.queries).items():
+            print(f"  {query!r:14} mediana {median:6.2f} ms  p95 {p95:6.2f} ms  ({found} resultados)")
+        index.connection.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark de arranque en frío de main.py, sin pantalla (QT_QPA_PLATFORM=offscreen).
+
+Mide, cada vez en un intérprete nuevo:
+  - importación de controller.login (lo que carga main.py antes de mostrar el login),
+  - tiempo hasta el primer pintado de LoginWindow,
+  - tiempo desde el inicio de sesión hasta el primer pintado del escritorio,
+y muestra el desglose de `-X importtime` de los módulos más costosos.
+
+Termina con código 1 si alguna mediana supera su presupuesto.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.startup [--runs N] [--budget-import MS] [--budget-first-paint MS] [--budget-desktop MS]
+"""
+import time
+
+START = time.perf_counter()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Presupuestos por defecto en milisegundos (medianas)
+BUDGETS = {
+    "import": 400.0,
+    "first_paint": 800.0,
+    "desktop": 250.0,
+}
+
+
+def wait_for_paint(app, widget, timeout=5.0):
+    """Procesa eventos hasta que `widget` recibe su primer evento de pintado."""
+    from PySide6.QtCore import QObject, QEvent
+
+    class PaintWatcher(QObject):
+        painted = False
+
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                self.painted = True
+            return False
+
+    watcher = PaintWatcher()
+    widget.installEventFilter(watcher)
+    deadline = time.perf_counter() + timeout
+    while not watcher.painted and time.perf_counter() < deadline:
+        app.processEvents()
+    widget.removeEventFilter(watcher)
+    return time.perf_counter()
+
+
+def measure_child():
+    """Reproduce main.py y devuelve los tiempos en milisegundos desde el inicio del proceso."""
+    from PySide6.QtWidgets import QApplication
+    from controller.login import LoginWindow
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    window = LoginWindow()
+    window.show()
+    first_paint = wait_for_paint(app, window)
+
+    login_start = time.perf_counter()
+    window.open_desktop("0")
+    desktop_paint = wait_for_paint(app, window.desktop_window)
+
+    # Igual que main.py: no salir con tareas en segundo plano en curso
+    from PySide6.QtCore import QThreadPool
+    QThreadPool.globalInstance().waitForDone()
+
+    return {
+        "import": (imported - START) * 1000,
+        "first_paint": (first_paint - START) * 1000,
+        "desktop": (desktop_paint - login_start) * 1000,
+    }
+
+
+def offscreen_env():
+    """Entorno con la plataforma de Qt sin pantalla."""
+    return dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+
+
+def run_samples(runs):
+    """Ejecuta `runs` arranques en frío y devuelve las mediciones de cada uno."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=offscreen_env(), capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def import_profile(module="controller.login", top=15):
+    """Devuelve los `top` módulos con mayor tiempo acumulado según `-X importtime`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=offscreen_env(), capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-import", type=float, default=BUDGETS["import"])
+    parser.add_argument("--budget-first-paint", type=float, default=BUDGETS["first_paint"])
+    parser.add_argument("--budget-desktop", type=float, default=BUDGETS["desktop"])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_child()))
+        return 0
+
+    print("Desglose de -X importtime para controller.login (acumulado / propio):")
+    for cumulative_us, self_us, name in import_profile():
+        print(f"  {cumulative_us / 1000:8.1f} ms {self_us / 1000:8.1f} ms  {name}")
+
+    samples = run_samples(args.runs)
+    budgets = {
+        "import": args.budget_import,
+        "first_paint": args.budget_first_paint,
+        "desktop": args.budget_desktop,
+    }
+    labels = {
+        "import": "Importar controller.login",
+        "first_paint": "Primer pintado del login",
+        "desktop": "Login -> escritorio",
+    }
+
+    failed = False
+    print(f"\nArranque en frío ({args.runs} ejecuciones, medianas):")
+    for key, budget in budgets.items():
+        median = statistics.median(sample[key] for sample in samples)
+        status = "OK" if median <= budget else "EXCEDE PRESUPUESTO"
+        failed = failed or median > budget
+        print(f"  {labels[key]:<28} {median:8.1f} ms  (presupuesto {budget:.0f} ms)  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Benchmark de apertura y guardado de archivos grandes en TextEditor.
+
+Para cada tamaño genera un archivo tipo log en una carpeta temporal y mide:
+  - lectura por fragmentos en el hilo de trabajo (sin interfaz),
+  - apertura en TextEditor: tiempo total, bloqueo más largo de la interfaz y memoria,
+  - guardado bloque a bloque (y que el archivo escrito sea idéntico),
+  - como referencia, la carga anterior (read() + setPlainText en QTextEdit) hasta --legacy-limit.
+Los tamaños por encima de --editor-limit solo miden la lectura (el documento no cabría en memoria).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.textEditorFiles [--sizes 10,100,1024] [--legacy-limit 10] [--editor-limit 256]
+"""
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+LINE = "2026-10-18 12:00:00.123 INFO worker-{:02d} request {:08d} processed in {:3d} ms\n"
+
+
+def make_file(path, megabytes):
+    """Escribir un archivo de log sintético de `megabytes` MB."""
+    block = "".join(LINE.format(i % 16, i, i % 997) for i in range(12000)).encode()
+    target = megabytes * 1024 * 1024
+    with open(path, "wb") as file:
+        written = 0
+        while written < target:
+            data = block[:target - written]
+            file.write(data)
+            written += len(data)
+
+
+def wait_for(signal, action):
+    """Ejecutar `action` y esperar `signal`, midiendo el tiempo y el mayor bloqueo de la interfaz."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    state = {"stall": 0.0, "last": 0.0, "rss": 0, "error": ""}
+    process = psutil.Process()
+
+    def on_tick():
+        now = time.perf_counter()
+        state["stall"] = max(state["stall"], now - state["last"])
+        state["last"] = now
+        state["rss"] = max(state["rss"], process.memory_info().rss)
+
+    def on_finished(error):
+        state["error"] = error
+        loop.quit()
+
+    ticker = QTimer()
+    ticker.setInterval(0)
+    ticker.timeout.connect(on_tick)
+    signal.connect(on_finished)
+    start = state["last"] = time.perf_counter()
+    ticker.start()
+    action()
+    loop.exec()
+    ticker.stop()
+    signal.disconnect(on_finished)
+    if state["error"]:
+        raise RuntimeError(state["error"])
+    return time.perf_counter() - start, state["stall"], state["rss"]
+
+
+def measure_read(path):
+    """Lectura y decodificación por fragmentos, descartando el texto."""
+    from controller.textStream import LoadSignals, LoadTask
+
+    signals = LoadSignals()
+    slots = threading.Semaphore(1)
+    signals.chunk.connect(lambda *_: slots.release())  # Conexión directa: se consume en el mismo hilo
+    task = LoadTask(signals, path, 0, slots, lambda generation: False)
+    start = time.perf_counter()
+    task.run()
+    return time.perf_counter() - start
+
+
+def measure_legacy(path):
+    """Carga anterior: todo el archivo en una cadena y setPlainText en QTextEdit."""
+    from PySide6.QtWidgets import QTextEdit
+
+    editor = QTextEdit()
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        editor.setPlainText(file.read())
+    elapsed = time.perf_counter() - start
+    editor.deleteLater()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1024", help="tamaños en MB separados por comas")
+    parser.add_argument("--legacy-limit", type=int, default=10, help="MB máximos para medir la carga anterior")
+    parser.add_argument("--editor-limit", type=int, default=256, help="MB máximos para abrir en el editor")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QThreadPool
+    from PySide6.QtWidgets import QApplication
+    from apps.textEditor import TextEditor
+
+    app = QApplication(sys.argv)
+    workdir = tempfile.mkdtemp(prefix="editor-benchmark-")
+    try:
+        for megabytes in (int(size) for size in args.sizes.split(",")):
+            path = os.path.join(workdir, f"log-{megabytes}.txt")
+            make_file(path, megabytes)
+            print(f"{megabytes} MB:")
+
+            seconds = measure_read(path)
+            print(f"  lectura por fragmentos   {seconds:7.2f} s  ({megabytes / seconds:6.0f} MB/s)")
+            if megabytes <= args.legacy_limit:
+                print(f"  carga anterior (bloquea) {measure_legacy(path):7.2f} s")
+            if megabytes > args.editor_limit:
+                print("  (sin abrir en el editor: supera --editor-limit)")
+                os.remove(path)
+                continue
+
+            editor = TextEditor()
+            editor.show()
+            base = psutil.Process().memory_info().rss
+            seconds, stall, peak = wait_for(editor.loader.finished, lambda: editor.load_file(path))
+            print(f"  apertura en el editor    {seconds:7.2f} s  bloqueo máx. {stall * 1000:6.1f} ms"
+                  f"  memoria +{(peak - base) / 1024 ** 2:,.0f} MB"
+                  f"  ({editor.text_edit.blockCount():,} líneas)")
+
+            copy = os.path.join(workdir, f"copy-{megabytes}.txt")
+            seconds, stall, _ = wait_for(editor.writer.finished, lambda: editor.write_file(copy))
+            identical = filecmp.cmp(path, copy, shallow=False)
+            print(f"  guardado por bloques     {seconds:7.2f} s  bloqueo máx. {stall * 1000:6.1f} ms"
+                  f"  ({'idéntico' if identical else 'DIFERENTE'})")
+
+            editor.close()
+            editor.deleteLater()
+            app.processEvents()
+            os.remove(path)
+            os.remove(copy)
+        QThreadPool.globalInstance().waitForDone()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
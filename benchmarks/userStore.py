@@ -0,0 +1,89 @@
+"""Benchmark de los motores de usuarios JSON y SQLite con muchas cuentas.
+
+Compara búsqueda (por nombre y por ID), creación y cambio de rol a 10k y 100k usuarios.
+Cada creación y cambio de rol se escribe en disco (flush) para medir el costo real.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.userStore [--sizes 10000 100000]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+
+from controller.dataBase import UserRepository
+from controller.sqliteStore import SqliteUserRepository
+
+LOOKUPS = 10000
+WRITES = 20
+
+
+def make_users(size):
+    """Genera `size` usuarios sintéticos con el esquema de users.json."""
+    password = hashlib.sha256(b"1234").hexdigest()
+    return {f"user{idx}": {"id": str(idx + 1), "password": password, "role": "user"} for idx in range(size)}
+
+
+def timed(operation, count):
+    """Devuelve el tiempo medio por operación en microsegundos."""
+    start = time.perf_counter()
+    for idx in range(count):
+        operation(idx)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def bench_engine(repository, size):
+    """Mide las operaciones típicas sobre un repositorio ya cargado."""
+    names = [f"user{random.randrange(size)}" for _ in range(LOOKUPS)]
+    ids = [str(random.randrange(1, size + 1)) for _ in range(LOOKUPS)]
+    repository.get(names[0])  # Cargar el archivo/índices antes de medir
+
+    def create(idx):
+        repository.create(f"new{idx}", f"new-{idx}", "hash")
+        repository.flush()
+
+    def change_role(idx):
+        repository.update(names[idx], role="admin" if idx % 2 else "user")
+        repository.flush()
+
+    return {
+        "búsqueda por nombre": timed(lambda idx: repository.get(names[idx]), LOOKUPS),
+        "búsqueda por ID": timed(lambda idx: repository.get_by_id(ids[idx]), LOOKUPS),
+        "creación": timed(create, WRITES),
+        "cambio de rol": timed(change_role, WRITES),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        users = make_users(size)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "users.json")
+            with open(json_path, "w") as file:
+                json.dump(users, file, indent=4)
+
+            start = time.perf_counter()
+            sqlite_repository = SqliteUserRepository(os.path.join(directory, "users.db"), json_path=json_path)
+            migration = time.perf_counter() - start
+
+            results = {
+                "JSON": bench_engine(UserRepository(json_path, flush_delay=0), size),
+                "SQLite": bench_engine(sqlite_repository, size),
+            }
+            sqlite_repository.connection.close()
+
+        print(f"\n{size} usuarios (migración JSON -> SQLite: {migration * 1000:.0f} ms)")
+        print(f"  {'operación':<22}{'JSON':>14}{'SQLite':>14}")
+        for operation in results["JSON"]:
+            print(f"  {operation:<22}{results['JSON'][operation]:>11.1f} µs{results['SQLite'][operation]:>11.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
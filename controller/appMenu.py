@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import QFrame, QPushButton, QVBoxLayout, QHBoxLayout
 from PySide6.QtCore import QSize
-from PySide6.QtGui import QIcon
+from controller.iconProvider import get_icon
 import subprocess
 import sys
 
@@ -22,7 +22,7 @@ class AppMenu(QFrame):
         self.add_app_button("Recycle Bin", "data/icons/trash.png", parent.open_recycle_bin)
         self.add_app_button("User Panel", "data/icons/pc.png", parent.open_user_panel)
         self.add_app_button("Music Player", "data/icons/music.png", self.open_music_player)
-        self.add_app_button("Editor Text", "data/icons/text.png", self.open_text_editor)
+        self.add_app_button("Editor Text", "data/icons/text.png", parent.open_text_editor)
         self.add_app_button("Weather", "data/icons/weather.png", parent.open_weather_map)
         self.add_app_button("Browser", "data/icons/browser.png", self.open_browser)  
 
@@ -41,7 +41,7 @@ class AppMenu(QFrame):
     def add_app_button(self, name, icon_path, action=None):
         """Añadir un botón de aplicación al menú."""
         app_button = QPushButton()
-        app_button.setIcon(QIcon(icon_path))
+        app_button.setIcon(get_icon(icon_path))
         app_button.setIconSize(QSize(32, 32))
         app_button.setText(name)
         app_button.setStyleSheet("color: white; text-align: left; padding: 10px; background-color: rgba(0, 0, 0, 0); border: none;")
@@ -67,15 +67,6 @@ class AppMenu(QFrame):
         except Exception as e:
             print(f"Error al abrir el reproductor de música: {e}")
 
-    def open_text_editor(self):
-        """Abrir un editor de texto."""
-        try:
-            from apps.textEditor import TextEditor  # Importar aquí para evitar dependencias circulares
-            text_editor = TextEditor()  
-            text_editor.show()
-        except Exception as e:
-            print(f"Error al abrir el editor de texto: {e}")
-
     def open_browser(self):
         """Abrir el navegador web predeterminado."""
         try:
@@ -0,0 +1,80 @@
+import importlib
+
+
+class AppEntry:
+    """Registro de una aplicación: dónde está su clase y cómo construirla."""
+
+    def __init__(self, target, title=None, factory=None):
+        self.target = target  # "paquete.modulo:Clase"
+        self.title = title  # Nombre mostrado en "Apps en uso" (None para no listarla)
+        self.factory = factory  # Recibe la clase y devuelve la instancia
+        self.instance = None
+
+
+class AppRegistry:
+    """Registro de aplicaciones que las importa y construye la primera vez que se abren."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def register(self, name, target, title=None, factory=None):
+        """Registrar una aplicación sin importar su módulo todavía."""
+        self.entries[name] = AppEntry(target, title, factory)
+
+    def get(self, name):
+        """Devuelve la instancia de la aplicación, creándola si aún no existe."""
+        entry = self.entries[name]
+        if entry.instance is None:
+            module_name, class_name = entry.target.split(":")
+            app_class = getattr(importlib.import_module(module_name), class_name)
+            instance = entry.factory(app_class) if entry.factory else app_class()
+            entry.instance = instance
+
+            # Si la ventana se destruye (p. ej. deleteLater al cerrar) se vuelve a crear la próxima vez
+            instance.destroyed.connect(lambda *_: self.discard(name, instance))
+        return entry.instance
+
+    def peek(self, name):
+        """Devuelve la instancia solo si ya fue creada, sin construirla."""
+        entry = self.entries.get(name)
+        return entry.instance if entry else None
+
+    def discard(self, name, instance=None):
+        """Olvidar la instancia en caché de una aplicación."""
+        entry = self.entries.get(name)
+        if entry and (instance is None or entry.instance is instance):
+            entry.instance = None
+
+    def instances(self):
+        """Devuelve las instancias ya creadas (que siguen vivas)."""
+        alive = []
+        for entry in self.entries.values():
+            if entry.instance is not None:
+                try:
+                    entry.instance.isVisible()
+                    alive.append(entry.instance)
+                except RuntimeError:
+                    # El objeto de Qt ya fue destruido
+                    entry.instance = None
+        return alive
+
+    def close_all(self):
+        """Cerrar y liberar todas las aplicaciones creadas."""
+        for instance in self.instances():
+            instance.close()
+            instance.deleteLater()
+        for entry in self.entries.values():
+            entry.instance = None
+
+    def visible_apps(self):
+        """Devuelve los títulos de las aplicaciones creadas que están visibles."""
+        titles = []
+        for entry in self.entries.values():
+            if entry.title and entry.instance is not None:
+                try:
+                    if entry.instance.isVisible():
+                        titles.append(entry.title)
+                except RuntimeError:
+                    # El objeto de Qt ya fue destruido
+                    entry.instance = None
+        return titles
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import tempfile
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QPainter, QPainterPath, QPixmap, QPixmapCache
+
+USER_IMAGE_DIR = "data/userImage"
+DEFAULT_AVATAR = os.path.join(USER_IMAGE_DIR, "default_user.png")
+
+# Miniaturas redondeadas ya renderizadas
+THUMBNAIL_DIR = "data/cache/avatars"
+
+
+def avatar_path(username):
+    """Devuelve la imagen del usuario, la imagen por defecto o None si no hay ninguna."""
+    image_path = os.path.join(USER_IMAGE_DIR, f"{username}.jpg")
+    if os.path.exists(image_path):
+        return image_path
+    return DEFAULT_AVATAR if os.path.exists(DEFAULT_AVATAR) else None
+
+
+def cache_key(path, size):
+    """Clave de la miniatura según la ruta, el mtime y el tamaño del archivo, o None si no existe."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    source = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}"
+    return "avatar-" + hashlib.sha1(source.encode()).hexdigest()
+
+
+def render_round_image(path, size):
+    """Decodifica la imagen y la recorta en un círculo de `size` px (seguro fuera del hilo de la interfaz)."""
+    source = QImage(path)
+    if source.isNull():
+        return source
+
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    clip = QPainterPath()
+    clip.addEllipse(0, 0, size, size)
+    painter.setClipPath(clip)
+    painter.drawImage(0, 0, source.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+    painter.end()
+    return image
+
+
+def save_thumbnail(image, thumbnail_path):
+    """Guardar la miniatura como PNG reemplazando el archivo de una vez."""
+    directory = os.path.dirname(thumbnail_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".png", dir=directory)
+    os.close(fd)
+    if image.save(temp_path, "PNG"):
+        os.replace(temp_path, thumbnail_path)
+    else:
+        os.remove(temp_path)
+
+
+class RenderSignals(QObject):
+    rendered = Signal(str, str, int, QImage)  # clave, ruta, tamaño, imagen
+
+
+class RenderTask(QRunnable):
+    """Tarea del pool de hilos que carga la miniatura del disco o la genera y la guarda."""
+
+    def __init__(self, signals, key, path, size, thumbnail_path):
+        super().__init__()
+        self.signals = signals
+        self.key = key
+        self.path = path
+        self.size = size
+        self.thumbnail_path = thumbnail_path
+
+    def run(self):
+        if os.path.exists(self.thumbnail_path):
+            # Ya está en disco: solo hace falta decodificar el PNG pequeño
+            image = QImage(self.thumbnail_path)
+            if not image.isNull():
+                self.emit(image)
+                return
+
+        image = render_round_image(self.path, self.size)
+        if not image.isNull():
+            try:
+                save_thumbnail(image, self.thumbnail_path)
+            except OSError as e:
+                print(f"Error al guardar la miniatura {self.thumbnail_path}: {e}")
+        self.emit(image)
+
+    def emit(self, image):
+        try:
+            self.signals.rendered.emit(self.key, self.path, self.size, image)
+        except RuntimeError:
+            # La aplicación se está cerrando
+            pass
+
+
+class AvatarCache(QObject):
+    """Caché de avatares redondeados en memoria (QPixmapCache) y en disco (PNG).
+
+    `pixmap()` responde al instante si la miniatura ya existe; si no, la genera en
+    segundo plano y emite `avatar_ready(ruta, tamaño)` cuando está lista.
+    """
+    avatar_ready = Signal(str, int)
+
+    def __init__(self, thumbnail_dir=THUMBNAIL_DIR, parent=None):
+        super().__init__(parent)
+        self.thumbnail_dir = thumbnail_dir
+        self.pending = set()  # Claves que se están generando
+        self.failed = set()  # Claves de imágenes que no se pudieron decodificar
+        self.signals = RenderSignals(self)
+        self.signals.rendered.connect(self.on_rendered)
+
+    def thumbnail_path(self, key):
+        return os.path.join(self.thumbnail_dir, f"{key}.png")
+
+    def pixmap(self, path, size):
+        """Devuelve el avatar redondeado, o None si aún se está generando o no existe."""
+        key = cache_key(path, size)
+        if key is None or key in self.failed:
+            return None
+
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+
+        thumbnail_path = self.thumbnail_path(key)
+        if os.path.exists(thumbnail_path):
+            pixmap = QPixmap(thumbnail_path)
+            if not pixmap.isNull():
+                QPixmapCache.insert(key, pixmap)
+                return pixmap
+
+        self.request(key, path, size)
+        return None
+
+    def prefetch(self, paths, size):
+        """Cargar o generar en segundo plano las miniaturas que no estén en memoria."""
+        for path in paths:
+            key = cache_key(path, size)
+            if key is not None and key not in self.failed and QPixmapCache.find(key) is None:
+                self.request(key, path, size)
+
+    def request(self, key, path, size):
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        QThreadPool.globalInstance().start(RenderTask(self.signals, key, path, size, self.thumbnail_path(key)))
+
+    def on_rendered(self, key, path, size, image):
+        """Recibe una miniatura generada (en el hilo de la interfaz)."""
+        self.pending.discard(key)
+        if image.isNull():
+            self.failed.add(key)
+        else:
+            # QPixmap solo puede crearse en el hilo de la interfaz
+            QPixmapCache.insert(key, QPixmap.fromImage(image))
+        self.avatar_ready.emit(path, size)
+
+
+_avatar_cache = None
+
+
+def get_avatar_cache():
+    """Devuelve la caché de avatares compartida por toda la aplicación."""
+    global _avatar_cache
+    if _avatar_cache is None:
+        _avatar_cache = AvatarCache()
+    return _avatar_cache
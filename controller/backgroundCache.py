@@ -0,0 +1,189 @@
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QEvent, QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+# Tiempo (ms) sin cambios de tamaño antes de volver a escalar con calidad
+RESIZE_DEBOUNCE = 150
+
+# Variantes escaladas que se conservan por imagen
+MAX_VARIANTS = 6
+
+
+def scale_image(source, width, height, mode):
+    """Escalar con suavizado; en modo 'expandir' se recorta el sobrante centrado."""
+    scaled = source.scaled(width, height, mode, Qt.SmoothTransformation)
+    if scaled.width() > width or scaled.height() > height:
+        scaled = scaled.copy((scaled.width() - width) // 2, (scaled.height() - height) // 2, width, height)
+    return scaled
+
+
+class SourceImage:
+    """Imagen original de un fondo, decodificada una sola vez y compartida por las tareas de escalado.
+
+    La primera tarea que la pide la decodifica; las que llegan mientras tanto esperan
+    al candado y reciben la misma QImage (de solo lectura, así que se comparte entre hilos).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._image = None
+        self._lock = threading.Lock()
+
+    def image(self):
+        with self._lock:
+            if self._image is None:
+                self._image = QImage(self.path)
+            return self._image
+
+
+class ScaleSignals(QObject):
+    scaled = Signal(str, object, QImage)  # ruta, clave, escalada
+
+
+class ScaleTask(QRunnable):
+    """Tarea del pool de hilos que escala una imagen de fondo (decodificándola si nadie lo hizo aún)."""
+
+    def __init__(self, signals, key, source):
+        super().__init__()
+        self.signals = signals
+        self.key = key
+        self.source = source
+
+    def run(self):
+        source = self.source.image()
+        width, height, dpr, mode = self.key
+        scaled = QImage() if source.isNull() else scale_image(source, round(width * dpr), round(height * dpr), mode)
+        try:
+            self.signals.scaled.emit(self.source.path, self.key, scaled)
+        except RuntimeError:
+            # La aplicación se está cerrando
+            pass
+
+
+class BackgroundService(QObject):
+    """Decodifica cada fondo una vez y guarda variantes escaladas por (tamaño, devicePixelRatio).
+
+    Las variantes que faltan se generan en segundo plano; mientras tanto se ofrece
+    la variante en caché más parecida.
+    """
+    variant_ready = Signal(str, object)  # ruta, (ancho, alto, dpr, modo)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sources = {}  # Ruta -> SourceImage (se decodifica una vez, en la primera tarea)
+        self.variants = {}  # Ruta -> OrderedDict(clave -> QPixmap), el último es el más reciente
+        self.pending = set()
+        self.failed = set()  # Rutas que no se pudieron decodificar
+        self.signals = ScaleSignals(self)
+        self.signals.scaled.connect(self.on_scaled)
+
+    def pixmap(self, path, width, height, dpr, mode, request=True):
+        """Devuelve (pixmap, exacto): la variante pedida o la más parecida en caché (o None).
+
+        Si la variante exacta no existe y `request` es True, se genera en segundo plano
+        y se avisa con `variant_ready`.
+        """
+        key = (width, height, dpr, mode)
+        variants = self.variants.get(path, {})
+        if key in variants:
+            variants.move_to_end(key)
+            return variants[key], True
+
+        if request and path not in self.failed and (path, key) not in self.pending:
+            self.pending.add((path, key))
+            source = self.sources.get(path)
+            if source is None:
+                source = self.sources[path] = SourceImage(path)
+            QThreadPool.globalInstance().start(ScaleTask(self.signals, key, source))
+
+        nearest = min(
+            (variant for variant in variants if variant[3] == mode),
+            key=lambda variant: abs(variant[0] * variant[2] - width * dpr) + abs(variant[1] * variant[2] - height * dpr),
+            default=None,
+        )
+        return (variants[nearest] if nearest else None), False
+
+    def on_scaled(self, path, key, scaled):
+        """Recibe una variante escalada (en el hilo de la interfaz)."""
+        self.pending.discard((path, key))
+        if scaled.isNull():
+            if path not in self.failed:
+                print(f"Advertencia: No se pudo cargar el fondo desde {path}.")
+            self.failed.add(path)
+            self.sources.pop(path, None)
+            return
+
+        pixmap = QPixmap.fromImage(scaled)
+        pixmap.setDevicePixelRatio(key[2])
+        variants = self.variants.setdefault(path, OrderedDict())
+        variants[key] = pixmap
+        while len(variants) > MAX_VARIANTS:
+            variants.popitem(last=False)
+        self.variant_ready.emit(path, key)
+
+
+class BackgroundBinder(QObject):
+    """Mantiene el fondo de un widget ajustado a su tamaño y a su devicePixelRatio.
+
+    Al cambiar el tamaño muestra enseguida la variante más parecida (escalado
+    rápido) y pide la variante exacta tras RESIZE_DEBOUNCE ms sin cambios.
+    `apply` recibe el QPixmap que se debe mostrar.
+    """
+
+    def __init__(self, widget, path, apply, mode=Qt.KeepAspectRatioByExpanding):
+        super().__init__(widget)
+        self.widget = widget
+        self.path = path
+        self.apply = apply
+        self.mode = mode
+        self.service = get_background_service()
+        self.service.variant_ready.connect(self.on_variant_ready)
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(RESIZE_DEBOUNCE)
+        self.debounce.timeout.connect(self.refresh)
+
+        widget.installEventFilter(self)
+        self.refresh()
+
+    def current_key(self):
+        size = self.widget.size()
+        return (size.width(), size.height(), self.widget.devicePixelRatioF(), self.mode)
+
+    def refresh(self, request=True):
+        """Mostrar la variante del tamaño actual (o la más parecida mientras se genera)."""
+        width, height, dpr, mode = self.current_key()
+        if width <= 0 or height <= 0:
+            return
+        pixmap, exact = self.service.pixmap(self.path, width, height, dpr, mode, request)
+        if pixmap is None:
+            return
+        if not exact:
+            # Provisional: escalado rápido de la variante más parecida
+            pixmap = pixmap.scaled(round(width * dpr), round(height * dpr), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+            pixmap.setDevicePixelRatio(dpr)
+        self.apply(pixmap)
+
+    def on_variant_ready(self, path, key):
+        if path == self.path and key == self.current_key():
+            self.refresh()
+
+    def eventFilter(self, watched, event):
+        if watched is self.widget and event.type() in (QEvent.Resize, QEvent.DevicePixelRatioChange):
+            self.refresh(request=False)
+            self.debounce.start()
+        return False
+
+
+_background_service = None
+
+
+def get_background_service():
+    """Devuelve el servicio de fondos compartido por toda la aplicación."""
+    global _background_service
+    if _background_service is None:
+        _background_service = BackgroundService()
+    return _background_service
@@ -1,28 +1,282 @@
+import atexit
 import json
 import os
-from PySide6.QtWidgets import QMessageBox
+import sys
+import tempfile
+from contextlib import contextmanager
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
 
 DATABASE_PATH = './data/dataBaseUser/users.json'
 
-def load_user_database():
-    """Cargar la base de datos de usuarios desde el archivo JSON."""
-    if os.path.exists(DATABASE_PATH):
-        with open(DATABASE_PATH, 'r') as file:
-            content = file.read().strip()  # Leer el contenido y eliminar espacios en blanco
-            if content:  # Si hay contenido en el archivo
-                user_database = json.loads(content)  # Cargar el JSON
-                # Obtener el primer usuario (la primera clave del diccionario)
-                first_user = next(iter(user_database)) if user_database else None
-                return user_database, first_user  # Retorna el diccionario y el primer usuario
+# Tiempo (ms) que se agrupan las modificaciones antes de escribir el archivo
+FLUSH_DELAY = 200
+
+# Motor de almacenamiento de usuarios: "json" (por defecto) o "sqlite"
+STORAGE_ENGINE = os.environ.get("USER_STORAGE", "json")
+
+
+@contextmanager
+def file_lock(path):
+    """Bloqueo consultivo entre procesos sobre `path`.lock mientras dure el bloque."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a+") as lock_file:
+        if sys.platform == "win32":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
             else:
-                return {}, None  # Retornar un diccionario vacío y None si el archivo está vacío
-    else:
-        return {}, None  # Retornar un diccionario vacío y None si el archivo no existe
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_json(path, data):
+    """Escribir JSON en un temporal, sincronizarlo a disco y reemplazar el archivo de una vez.
+
+    Un fallo a mitad de escritura deja intacto el archivo anterior.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if sys.platform != "win32":
+        # Sincronizar el directorio para que el renombrado sobreviva a un corte de energía
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class UserRepository:
+    """Repositorio único de usuarios con índices en memoria por nombre y por ID.
+
+    El archivo JSON solo se vuelve a leer cuando cambia su mtime, inodo o tamaño.
+    Las modificaciones se aplican en memoria al instante y se escriben en disco
+    agrupadas tras FLUSH_DELAY ms, bajo un bloqueo de archivo y con reemplazo atómico.
+    """
+
+    def __init__(self, path=DATABASE_PATH, flush_delay=FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self._users = {}  # Nombre de usuario -> datos del usuario
+        self._by_id = {}  # ID (como texto) -> nombre de usuario
+        self._signature = None
+        self._pending = []  # Modificaciones aún no escritas en disco
+        self._flush_timer = None
+        self.load_error = None
+        atexit.register(self.flush_quietly)
+
+    def _file_signature(self):
+        """Devuelve (mtime, inodo, tamaño) del archivo, o None si no existe."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def refresh(self):
+        """Recargar el archivo solo si cambió desde la última lectura."""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self.load_error = None
+
+        if signature is None:
+            users = {}
+        else:
+            try:
+                with open(self.path, 'r') as file:
+                    content = file.read().strip()  # Leer el contenido y eliminar espacios en blanco
+                users = json.loads(content) if content else {}
+            except (OSError, json.JSONDecodeError) as e:
+                # Se conservan los datos en memoria en lugar de perder todas las cuentas
+                print(f"Error loading user database: {e}")
+                self.load_error = e
+                return
+
+        # Las modificaciones pendientes se vuelven a aplicar sobre la versión del disco
+        for change in self._pending:
+            change(users)
+        self._set_users(users)
+
+    def _set_users(self, users):
+        """Reemplazar los datos y reconstruir los índices."""
+        self._users = users
+        self._by_id = {str(user.get("id")): username for username, user in users.items()}
+
+    def _apply(self, change):
+        """Aplicar una modificación en memoria y programar su escritura."""
+        change(self._users)
+        self._set_users(self._users)
+        self._pending.append(change)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Agrupar ráfagas de modificaciones en una sola escritura diferida."""
+        from PySide6.QtCore import QCoreApplication, QTimer
+
+        app = QCoreApplication.instance()
+        if app is None or self.flush_delay <= 0:
+            # Sin bucle de eventos (scripts, herramientas) se escribe de inmediato
+            self.flush()
+            return
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.timeout.connect(self.flush_quietly)
+            app.aboutToQuit.connect(self.flush_quietly)
+        self._flush_timer.start(self.flush_delay)
+
+    def flush(self):
+        """Escribir las modificaciones pendientes de forma atómica y bajo bloqueo."""
+        if not self._pending:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        with file_lock(self.path):
+            # Otro proceso pudo escribir el archivo: se recarga y se reaplican los cambios
+            self.refresh()
+            atomic_write_json(self.path, self._users)
+            self._pending.clear()
+            self._signature = self._file_signature()
+
+    def flush_quietly(self):
+        """Escribir desde el bucle de eventos; si falla, los cambios quedan pendientes."""
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"Error saving user database: {e}")
+
+    def usernames(self):
+        """Devuelve los nombres de usuario en el orden del archivo."""
+        self.refresh()
+        return list(self._users)
+
+    def first_username(self):
+        """Devuelve el primer usuario registrado, o None si no hay usuarios."""
+        self.refresh()
+        return next(iter(self._users), None)
+
+    def get(self, username):
+        """Devuelve una copia de los datos del usuario, o None si no existe."""
+        self.refresh()
+        user = self._users.get(username)
+        return dict(user) if user is not None else None
+
+    def get_by_id(self, user_id):
+        """Devuelve el nombre de usuario con ese ID, o None si no existe."""
+        self.refresh()
+        return self._by_id.get(str(user_id))
+
+    def exists(self, username):
+        self.refresh()
+        return username in self._users
+
+    def id_exists(self, user_id):
+        self.refresh()
+        return str(user_id) in self._by_id
+
+    def count(self):
+        self.refresh()
+        return len(self._users)
+
+    def all(self):
+        """Devuelve una copia de toda la base de datos (nombre -> datos)."""
+        self.refresh()
+        return {username: dict(user) for username, user in self._users.items()}
+
+    def create(self, username, user_id, password_hash, role=None):
+        """Crear un usuario; el primero en registrarse es administrador."""
+        self.refresh()
+        if username in self._users:
+            raise ValueError(f"User '{username}' already exists.")
+        if str(user_id) in self._by_id:
+            raise ValueError(f"User ID '{user_id}' already exists.")
+        if role is None:
+            role = "admin" if not self._users else "user"
+
+        record = {"id": user_id, "password": password_hash, "role": role}
+        self._apply(lambda users: users.__setitem__(username, dict(record)))
+
+    def update(self, username, **fields):
+        """Actualizar campos de un usuario existente."""
+        self.refresh()
+        user = self._users[username]
+        if "id" in fields and str(fields["id"]) != str(user.get("id")) and str(fields["id"]) in self._by_id:
+            raise ValueError(f"User ID '{fields['id']}' already exists.")
+
+        def change(users):
+            if username in users:
+                users[username].update(fields)
+        self._apply(change)
+
+    def remove(self, username):
+        """Eliminar un usuario. Devuelve False si no existía."""
+        self.refresh()
+        if username not in self._users:
+            return False
+        self._apply(lambda users: users.pop(username, None))
+        return True
+
+    def replace_all(self, users):
+        """Reemplazar toda la base de datos."""
+        snapshot = {username: dict(user) for username, user in users.items()}
+
+        def change(current):
+            current.clear()
+            current.update({username: dict(user) for username, user in snapshot.items()})
+        self._apply(change)
+
+    def next_user_id(self):
+        """Obtiene el próximo ID numérico disponible."""
+        self.refresh()
+        numeric_ids = [int(user_id) for user_id in self._by_id if user_id.isdigit()]
+        return max(numeric_ids, default=0) + 1
+
+
+_repository = None
+
+
+def get_user_repository():
+    """Devuelve el repositorio de usuarios compartido por toda la aplicación."""
+    global _repository
+    if _repository is None:
+        if STORAGE_ENGINE == "sqlite":
+            from controller.sqliteStore import SqliteUserRepository, SQLITE_PATH
+            # La primera vez se migra users.json a la base de datos SQLite
+            _repository = SqliteUserRepository(SQLITE_PATH, json_path=DATABASE_PATH)
+        else:
+            _repository = UserRepository()
+    return _repository
+
+
+def load_user_database():
+    """Cargar la base de datos de usuarios (diccionario y primer usuario)."""
+    repository = get_user_repository()
+    return repository.all(), repository.first_username()
+
 
 def save_user_database(user_database):
-    """Guardar la base de datos de usuarios en un archivo JSON."""
-    # Asegurarse de que el directorio exista
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    
-    with open(DATABASE_PATH, 'w') as file:
-        json.dump(user_database, file, indent=4)
+    """Guardar la base de datos de usuarios en el archivo JSON."""
+    get_user_repository().replace_all(user_database)
@@ -1,16 +1,12 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton
-from PySide6.QtCore import Qt, QSize, QTimer
-from PySide6.QtGui import QIcon, QPixmap
-from controller.taskManager import TaskManager
-from apps.api.weatherMap import WeatherMapWindow
-from controller.appMenu import AppMenu
-from apps.userPanel import UserPanel
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QSizePolicy
+from PySide6.QtCore import Qt, QSize
+from controller.iconProvider import get_icon
 from controller.taskBar import TaskBar
-from apps.calculator import Calculator
-from apps.trash import Trash
-from apps.docs import Docs
+from controller.appRegistry import AppRegistry
+from controller.avatarCache import get_avatar_cache
+from controller.backgroundCache import BackgroundBinder
+from controller.dataBase import get_user_repository
 import subprocess
-import json
 import os
 import sys
 
@@ -57,125 +53,153 @@ class Desktop(QMainWindow):
         self.taskbar = TaskBar(self)
         main_layout.addWidget(self.taskbar, stretch=0)
 
-        # Menú de aplicaciones
-        self.app_menu = AppMenu(self)
-        self.app_menu.setVisible(False)
-        self.app_menu.setParent(self)
-        self.app_menu.raise_()
-
-        # Ventanas de las aplicaciones
-        self.task_manager = TaskManager(self)
-        self.calculator = Calculator(self)
-        self.docs_window = None  # Inicializar como None
-        self.trash = Trash()  # Instanciar la papelera de reciclaje
-        self.weather_map_window = None  # Inicializar como None
-
-        # Ocultar ventanas inicialmente
-        self.task_manager.hide()
-        self.calculator.hide()
-
-        # Reloj
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_clock)
-        self.timer.start(1000)
+        # Las aplicaciones (y sus módulos) se crean la primera vez que se abren
+        self.apps = AppRegistry()
+        self.register_apps()
 
         # Cargar datos del usuario
         self.role, self.image_path = self.load_user_data()
+        get_avatar_cache().prefetch([self.image_path], 150)  # Avatar del panel de usuario
+
+        # Ventanas que estaban abiertas al suspender la sesión
+        self.suspended_windows = []
 
     def load_user_data(self):
-        """Cargar los datos del usuario desde un archivo JSON."""
-        user_data_path = "data/user_data.json"  # Ruta del archivo JSON
-        
-        if os.path.exists(user_data_path):  # Verificar si el archivo existe
-            with open(user_data_path, "r") as f:
-                data = json.load(f)
-                user = data.get(self.username)  # Obtener los datos del usuario
-                if user:
-                    return user['role'], user.get('image_path', "data/images/default.png")
-        print("Archivo de datos de usuario no encontrado o usuario no registrado.")
-        return "Invitado", "data/images/default.png"
+        """Cargar el rol y la imagen del usuario desde el repositorio de usuarios."""
+        image_path = f"data/userImage/{self.username}.jpg"
+        if not os.path.exists(image_path):
+            image_path = "data/userImage/default_user.png"
+
+        user = get_user_repository().get(self.username)
+        if user:
+            return user.get('role', 'user'), user.get('image_path', image_path)
+        print("Usuario no registrado.")
+        return "Invitado", image_path
+
+    def suspend(self):
+        """Ocultar el escritorio y sus ventanas sin destruirlos (cambio rápido de usuario)."""
+        # Las aplicaciones hijas se ocultan con el escritorio; las ventanas independientes, no
+        self.suspended_windows = [app for app in self.apps.instances() if app.isWindow() and app.isVisible()]
+        for window in self.suspended_windows:
+            window.hide()
+        self.hide()
+
+    def resume(self):
+        """Volver a mostrar el escritorio con las ventanas que tenía abiertas."""
+        self.show()
+        for window in self.suspended_windows:
+            window.show()
+        self.suspended_windows = []
+        self.raise_()
+        self.activateWindow()
+
+    def end_session(self):
+        """Cerrar las aplicaciones del usuario y liberar el escritorio."""
+        self.suspended_windows = []
+        self.apps.close_all()
+        self.close()
 
     def set_background_image(self, image_path):
-        """Establecer la imagen de fondo."""
-        pixmap = QPixmap(image_path)
-        if pixmap.isNull():
-            print(f"Advertencia: No se pudo cargar el fondo desde {image_path}.")
-        self.desktop_background.setPixmap(pixmap)
-        self.desktop_background.setScaledContents(True)
+        """Establecer la imagen de fondo, escalada en segundo plano al tamaño del área."""
+        # El QLabel no debe imponer el tamaño del pixmap al layout
+        self.desktop_background.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.background = BackgroundBinder(
+            self.desktop_background, image_path, self.desktop_background.setPixmap, Qt.IgnoreAspectRatio
+        )
+
+    def register_apps(self):
+        """Registrar las aplicaciones del escritorio sin importarlas ni construirlas."""
+        self.apps.register("app_menu", "controller.appMenu:AppMenu", factory=self.create_app_menu)
+        self.apps.register("task_manager", "controller.taskManager:TaskManager", factory=lambda cls: cls(self))
+        self.apps.register("calculator", "apps.calculator:Calculator", "Calculator", lambda cls: cls(self))
+        self.apps.register("docs", "apps.docs:Docs", "Docs", lambda cls: cls(self.user_id))
+        self.apps.register("trash", "apps.trash:Trash", "Recycle Bin")
+        self.apps.register("weather_map", "apps.api.weatherMap:WeatherMapWindow", "Weather")
+        self.apps.register("text_editor", "apps.textEditor:TextEditor", "Text Editor")
+
+    def create_app_menu(self, app_menu_class):
+        """Construir el menú de aplicaciones como panel flotante del escritorio."""
+        app_menu = app_menu_class(self)
+        app_menu.setVisible(False)
+        app_menu.setParent(self)
+        return app_menu
+
+    def open_app(self, name):
+        """Mostrar una aplicación (creándola si hace falta) y refrescar 'Apps en uso'."""
+        app = self.apps.get(name)
+        if not app.isVisible():
+            app.show()
+            app.raise_()
+        self.refresh_apps_in_use()
+        return app
+
+    def refresh_apps_in_use(self):
+        """Actualizar el administrador de tareas solo si ya fue creado."""
+        task_manager = self.apps.peek("task_manager")
+        if task_manager is not None:
+            task_manager.update_apps_in_use()
 
     def toggle_app_menu(self):
         """Mostrar u ocultar el menú de aplicaciones."""
-        self.app_menu.setVisible(not self.app_menu.isVisible())
-        if self.app_menu.isVisible():
-            self.app_menu.move(10, self.height() - self.app_menu.height() - self.taskbar.height())
-            self.app_menu.raise_()
+        app_menu = self.apps.get("app_menu")
+        app_menu.setVisible(not app_menu.isVisible())
+        if app_menu.isVisible():
+            app_menu.move(10, self.height() - app_menu.height() - self.taskbar.height())
+            app_menu.raise_()
 
     def show_task_manager(self):
         """Mostrar el administrador de tareas."""
-        if not self.task_manager.isVisible():
-            self.task_manager.update_process_list()
-            self.task_manager.update_apps_in_use()
-            self.task_manager.show()
-            self.task_manager.raise_()
+        task_manager = self.apps.get("task_manager")
+        if not task_manager.isVisible():
+            task_manager.update_process_list()
+            task_manager.update_apps_in_use()
+            task_manager.show()
+            task_manager.raise_()
 
     def open_calculator(self):
         """Abrir la calculadora."""
-        if not self.calculator.isVisible():
-            self.calculator.show()
-            self.calculator.raise_()
-        self.task_manager.update_apps_in_use()
+        self.open_app("calculator")
 
     def open_docs(self):
         """Abrir documentos."""
-        if self.docs_window is None: 
-            self.docs_window = Docs(self.user_id)  
-        if not self.docs_window.isVisible():
-            self.docs_window.show()
-            self.docs_window.raise_()
-        self.task_manager.update_apps_in_use()
+        self.open_app("docs")
+
+    def open_text_editor(self):
+        """Abrir el editor de texto."""
+        self.open_app("text_editor")
 
     def open_user_panel(self):
         """Abrir el panel de usuario."""
+        from apps.userPanel import UserPanel  # Importar aquí para no cargarlo al iniciar sesión
         self.user_panel = UserPanel(self.username, self.role, self.image_path, self)
         self.user_panel.show()
 
     def open_recycle_bin(self):
         """Abrir la papelera de reciclaje."""
-        self.trash.show()
+        self.open_app("trash")
 
     def open_weather_map(self):
         """Abrir la ventana del mapa del clima."""
         try:
-            # Si la ventana no existe, créala
-            if self.weather_map_window is None:
-                self.weather_map_window = WeatherMapWindow()
-            
-            # Si la ventana no está visible, muéstrala
-            if not self.weather_map_window.isVisible():
-                self.weather_map_window.show()
-                self.weather_map_window.raise_()
-        
+            # QtWebEngine y folium solo se importan al abrir el mapa por primera vez
+            self.open_app("weather_map")
         except Exception as e:
             print(f"Error al abrir el mapa del clima: {e}")
             
     def add_desktop_icon(self, layout, name, icon_path):
         """Añadir un ícono al escritorio."""
         icon_button = QPushButton()
-        icon_button.setIcon(QIcon(icon_path))
+        icon_button.setIcon(get_icon(icon_path))
         icon_button.setIconSize(QSize(64, 64))
         icon_button.setText(name)
         icon_button.setStyleSheet("text-align: left; padding: 10px; border: none;")
 
-    def update_clock(self):
-        """Actualizar el reloj (si se requiere implementación futura)."""
-        pass
-
 
         
     def add_desktop_icon(self, layout, name, icon_path):
         """Añadir un ícono al escritorio."""
         icon_button = QPushButton()
-        icon_button.setIcon(QIcon(icon_path))
+        icon_button.setIcon(get_icon(icon_path))
         icon_button.setIconSize(QSize(64, 64))
         icon_button.setText(name)
         icon_button.setStyleSheet("text-align: left; padding: 10px; border: none;")
@@ -0,0 +1,358 @@
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from PySide6.QtCore import (Qt, QAbstractListModel, QFileSystemWatcher, QModelIndex, QObject, QRunnable,
+                            QThreadPool, QTimer, Signal)
+from controller.iconProvider import get_icon
+from controller.processModel import contiguous_ranges
+
+# Entradas que el hilo de trabajo entrega al modelo en cada lote
+BATCH_SIZE = 1000
+
+# Espera (ms) sin cambios en la carpeta antes de sincronizar, y espera máxima durante
+# una ráfaga continua (p. ej. una copia masiva)
+WATCH_DEBOUNCE = 250
+WATCH_MAX_DELAY = 2000
+
+# Carpetas cuyo listado se conserva en memoria (configurable con DOCS_LISTING_CACHE)
+LISTING_CACHE_SIZE = int(os.environ.get("DOCS_LISTING_CACHE", "32"))
+
+# Subcarpetas que se listan por adelantado al abrir una carpeta
+PREFETCH_LIMIT = 16
+
+
+class DirEntryInfo(NamedTuple):
+    """Entrada de un directorio con el tipo ya resuelto por os.scandir."""
+    name: str
+    is_dir: bool
+
+
+def directory_mtime(path):
+    """Devuelve el mtime (ns) de la carpeta, o None si no existe."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def iter_directory(path):
+    """Recorre la carpeta con os.scandir devolviendo DirEntryInfo (sin stat por entrada)."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                # DirEntry ya trae el tipo en la mayoría de los sistemas
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            yield DirEntryInfo(entry.name, is_dir)
+
+
+class ListingCache:
+    """Caché LRU de listados de carpetas validados por el mtime de la carpeta."""
+
+    def __init__(self, capacity=LISTING_CACHE_SIZE):
+        self.capacity = capacity
+        self._listings = OrderedDict()  # Ruta -> (mtime, [DirEntryInfo]); el último es el más reciente
+
+    def get(self, path):
+        """Devuelve el listado si sigue vigente, o None."""
+        cached = self._listings.get(path)
+        if cached is None:
+            return None
+        if cached[0] != directory_mtime(path):
+            # La carpeta cambió desde que se listó
+            del self._listings[path]
+            return None
+        self._listings.move_to_end(path)
+        return cached[1]
+
+    def contains(self, path):
+        """Indica si hay un listado guardado (sin validarlo ni cambiar su antigüedad)."""
+        return path in self._listings
+
+    def clear(self):
+        self._listings.clear()
+
+    def put(self, path, mtime, entries, recent=True):
+        """Guardar un listado. Los precargados (`recent=False`) son los primeros en descartarse."""
+        if mtime is None or self.capacity <= 0:
+            return
+        self._listings[path] = (mtime, list(entries))
+        self._listings.move_to_end(path, last=recent)
+        while len(self._listings) > self.capacity:
+            self._listings.popitem(last=False)
+
+
+_listing_cache = None
+
+
+def get_listing_cache():
+    """Devuelve la caché de listados compartida por todas las ventanas de Docs."""
+    global _listing_cache
+    if _listing_cache is None:
+        _listing_cache = ListingCache()
+    return _listing_cache
+
+
+class ScanSignals(QObject):
+    batch = Signal(int, list)  # generación, [DirEntryInfo]
+    snapshot = Signal(int, object, list)  # generación, mtime, listado completo para sincronizar
+    finished = Signal(int, object, str)  # generación, mtime, mensaje de error ("" si no hubo)
+    prefetched = Signal(str, object, list)  # ruta, mtime, listado
+
+
+class ScanTask(QRunnable):
+    """Tarea del pool de hilos que lista un directorio con os.scandir.
+
+    Entrega el contenido por lotes o, con `snapshot=True`, completo de una vez.
+    """
+
+    def __init__(self, model, signals, path, generation, batch_size=BATCH_SIZE, snapshot=False):
+        super().__init__()
+        self.model = model
+        self.signals = signals
+        self.path = path
+        self.generation = generation
+        self.batch_size = batch_size
+        self.snapshot = snapshot
+
+    def cancelled(self):
+        # Se abrió otra carpeta desde que empezó el listado
+        return self.model.generation != self.generation
+
+    def run(self):
+        # El mtime se toma antes de listar: si la carpeta cambia mientras tanto, la caché no valdrá
+        mtime = directory_mtime(self.path)
+        error = ""
+        batch = []
+        try:
+            for entry in iter_directory(self.path):
+                batch.append(entry)
+                if not self.snapshot and len(batch) >= self.batch_size:
+                    if self.cancelled():
+                        return
+                    self.emit(self.signals.batch, batch)
+                    batch = []
+        except OSError as e:
+            error = str(e)
+
+        if self.snapshot:
+            if error:
+                self.emit(self.signals.finished, mtime, error)
+            elif not self.cancelled():
+                self.emit(self.signals.snapshot, mtime, batch)
+            return
+        if batch and not self.cancelled():
+            self.emit(self.signals.batch, batch)
+        self.emit(self.signals.finished, mtime, error)
+
+    def emit(self, signal, *values):
+        try:
+            signal.emit(self.generation, *values)
+        except RuntimeError:
+            # El modelo fue destruido mientras se listaba
+            pass
+
+
+class PrefetchTask(QRunnable):
+    """Tarea del pool de hilos que lista subcarpetas por adelantado para la caché."""
+
+    def __init__(self, signals, paths):
+        super().__init__()
+        self.signals = signals
+        self.paths = paths
+
+    def run(self):
+        for path in self.paths:
+            mtime = directory_mtime(path)
+            try:
+                entries = list(iter_directory(path))
+            except OSError:
+                continue
+            try:
+                self.signals.prefetched.emit(path, mtime, entries)
+            except RuntimeError:
+                # El modelo fue destruido mientras se precargaba
+                return
+
+
+class DirectoryModel(QAbstractListModel):
+    """Modelo de lista del contenido de una carpeta, cargado en segundo plano.
+
+    `set_path()` vacía el modelo y lanza el listado; las filas llegan por lotes y
+    la vista solo pinta las visibles. `loading_finished(error)` avisa al terminar.
+    Un QFileSystemWatcher vigila la carpeta y los cambios externos se aplican como
+    inserciones y eliminaciones de filas (`sync()`), sin volver a cargar el modelo.
+    Los listados se guardan en una caché LRU: volver a una carpeta sin cambios es
+    inmediato, y al abrir una carpeta se precargan sus subcarpetas.
+    """
+    loading_finished = Signal(str)
+
+    def __init__(self, parent=None, cache=None):
+        super().__init__(parent)
+        self.path = None
+        self.generation = 0
+        self.loading = False
+        self.cache = cache if cache is not None else get_listing_cache()
+        self._entries = []
+        self._signals = ScanSignals(self)
+        self._signals.batch.connect(self.on_batch)
+        self._signals.finished.connect(self.on_finished)
+        self._signals.snapshot.connect(self.on_snapshot)
+        self._signals.prefetched.connect(self.on_prefetched)
+        self.syncing = False
+        self.sync_requested = False
+
+        # Vigilancia de la carpeta con agrupación de ráfagas de cambios
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.timeout.connect(self.on_watch_timeout)
+        self.first_change = None  # Momento del primer cambio aún no sincronizado
+        self.folder_icon = get_icon("data/icons/folder.png")
+        self.file_icon = get_icon("data/icons/file.png")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.name
+        if role == Qt.DecorationRole:
+            return self.folder_icon if entry.is_dir else self.file_icon
+        if role == Qt.UserRole:
+            return entry.is_dir
+        return None
+
+    def entry(self, row):
+        """Devuelve el DirEntryInfo de la fila indicada."""
+        return self._entries[row]
+
+    def set_path(self, path):
+        """Mostrar `path`: desde la caché si sigue vigente o, si no, listándolo en segundo plano."""
+        self.generation += 1  # Las tareas anteriores dejan de entregar resultados
+        self.path = path
+        self.syncing = False
+        self.sync_requested = False
+        self.watch_timer.stop()
+        self.first_change = None
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        if os.path.isdir(path):
+            self.watcher.addPath(path)
+
+        cached = self.cache.get(path)
+        self.beginResetModel()
+        self._entries = list(cached) if cached is not None else []
+        self.endResetModel()
+
+        if cached is not None:
+            self.loading = False
+            self.loading_finished.emit("")
+            self.prefetch_subfolders()
+            return
+        self.loading = True
+        QThreadPool.globalInstance().start(ScanTask(self, self._signals, path, self.generation))
+
+    def refresh(self):
+        """Volver a listar la carpeta actual."""
+        if self.path is not None:
+            self.set_path(self.path)
+
+    def sync(self):
+        """Volver a listar la carpeta en segundo plano y aplicar solo las diferencias."""
+        if self.path is None:
+            return
+        if self.loading or self.syncing:
+            # Se sincroniza al terminar el listado en curso
+            self.sync_requested = True
+            return
+        self.syncing = True
+        QThreadPool.globalInstance().start(
+            ScanTask(self, self._signals, self.path, self.generation, snapshot=True)
+        )
+
+    def prefetch_subfolders(self):
+        """Listar en segundo plano las subcarpetas inmediatas que aún no están en caché."""
+        paths = []
+        for entry in self._entries:
+            if len(paths) >= PREFETCH_LIMIT:
+                break
+            path = os.path.join(self.path, entry.name)
+            if entry.is_dir and not self.cache.contains(path):
+                paths.append(path)
+        if paths:
+            QThreadPool.globalInstance().start(PrefetchTask(self._signals, paths))
+
+    def on_prefetched(self, path, mtime, entries):
+        if not self.cache.contains(path):
+            self.cache.put(path, mtime, entries, recent=False)
+
+    def on_directory_changed(self, path):
+        """Agrupar los avisos del watcher: se sincroniza cuando la carpeta deja de cambiar."""
+        now = time.monotonic()
+        if self.first_change is None:
+            self.first_change = now
+        # Durante una ráfaga larga no se sigue posponiendo más allá de WATCH_MAX_DELAY
+        if (now - self.first_change) * 1000 < WATCH_MAX_DELAY or not self.watch_timer.isActive():
+            self.watch_timer.start(WATCH_DEBOUNCE)
+
+    def on_watch_timeout(self):
+        self.first_change = None
+        self.sync()
+
+    def on_snapshot(self, generation, mtime, entries):
+        """Aplicar un listado completo como eliminaciones e inserciones de filas."""
+        if generation != self.generation:
+            return
+        self.syncing = False
+        current = {entry.name: entry for entry in entries}
+
+        # Eliminar (de abajo hacia arriba) las entradas que ya no existen o cambiaron de tipo
+        removed = [row for row, entry in enumerate(self._entries) if current.get(entry.name) != entry]
+        for first, last in reversed(contiguous_ranges(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._entries[first:last + 1]
+            self.endRemoveRows()
+
+        # Añadir al final las nuevas (un renombrado es una eliminación más una inserción)
+        known = {entry.name for entry in self._entries}
+        added = [entry for entry in entries if entry.name not in known]
+        if added:
+            first = len(self._entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._entries.extend(added)
+            self.endInsertRows()
+
+        self.cache.put(self.path, mtime, self._entries)
+        if self.sync_requested:
+            self.sync_requested = False
+            self.sync()
+
+    def on_batch(self, generation, entries):
+        if generation != self.generation:
+            return
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self._entries.extend(entries)
+        self.endInsertRows()
+
+    def on_finished(self, generation, mtime, error):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.syncing = False
+        self.loading_finished.emit(error)
+        if error:
+            return
+        self.cache.put(self.path, mtime, self._entries)
+        self.prefetch_subfolders()
+        if self.sync_requested:
+            self.sync_requested = False
+            self.sync()
@@ -0,0 +1,409 @@
+import math
+import operator
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+
+class ExpressionError(ValueError):
+    """Expresión mal escrita (sintaxis, nombre desconocido o número de argumentos)."""
+
+    def __init__(self, message, position=None):
+        super().__init__(message if position is None else f"{message} (posición {position + 1})")
+        self.position = position
+
+
+# Nodos del árbol sintáctico
+class Number(NamedTuple):
+    value: float
+
+
+class Name(NamedTuple):
+    name: str
+
+
+class Unary(NamedTuple):
+    op: str
+    operand: object
+
+
+class Binary(NamedTuple):
+    op: str
+    left: object
+    right: object
+
+
+class Call(NamedTuple):
+    name: str
+    args: tuple
+
+
+class Token(NamedTuple):
+    kind: str  # "number", "name", "op" o "end"
+    text: str
+    position: int
+
+
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z_0-9]*|[π√τ])
+  | (?P<op>\*\*|[-+*/%^(),×÷])
+""", re.VERBOSE)
+
+# Sinónimos que se normalizan al tokenizar
+OPERATOR_ALIASES = {"**": "^", "×": "*", "÷": "/"}
+
+# Constantes (se sustituyen por su valor al compilar)
+CONSTANTS = {"pi": math.pi, "π": math.pi, "e": math.e, "tau": math.tau, "τ": math.tau}
+
+# Funciones permitidas: nombre en la expresión -> (nombre en el espacio de evaluación, aridad)
+FUNCTIONS = {
+    "sin": ("sin", 1), "cos": ("cos", 1), "tan": ("tan", 1),
+    "asin": ("asin", 1), "acos": ("acos", 1), "atan": ("atan", 1), "atan2": ("atan2", 2),
+    "sinh": ("sinh", 1), "cosh": ("cosh", 1), "tanh": ("tanh", 1),
+    "exp": ("exp", 1), "ln": ("log", 1), "log": ("log10", 1), "log2": ("log2", 1),
+    "sqrt": ("sqrt", 1), "√": ("sqrt", 1), "abs": ("fabs", 1),
+    "floor": ("floor", 1), "ceil": ("ceil", 1),
+}
+
+# Tamaño máximo (bits) de una potencia entera exacta; por encima se calcula en coma
+# flotante ((9^1024)^1024 en enteros tardaría minutos). Unos 3000 dígitos: aún se pueden mostrar
+MAX_INT_BITS = 10000
+
+
+def power(base, exponent):
+    """Potencia con el `^` de la calculadora: error en lugar de números complejos o enteros gigantes.
+
+    El resultado exacto en enteros solo se calcula si su tamaño estimado cabe en
+    MAX_INT_BITS; si no, se usa coma flotante y un desbordamiento es ExpressionError.
+    """
+    if (isinstance(base, int) and isinstance(exponent, int) and exponent >= 0
+            and abs(base).bit_length() * exponent <= MAX_INT_BITS):
+        return base ** exponent
+    try:
+        return math.pow(base, exponent)
+    except OverflowError:
+        raise ExpressionError("Resultado demasiado grande") from None
+
+
+# Espacio de nombres de la evaluación escalar: solo funciones matemáticas, sin builtins
+MATH_NAMESPACE = {
+    "__builtins__": {},
+    "_pow": power,
+    "_inf": math.inf,
+    **{target: getattr(math, target) for target, _ in FUNCTIONS.values()},
+}
+
+def as_float64(value):
+    """Número como float64 de NumPy: así las operaciones entre constantes (1/0) siguen la aritmética de NumPy."""
+    try:
+        return np.float64(value)
+    except OverflowError:
+        # Entero literal más grande que cualquier float
+        return np.float64(np.inf)
+
+
+# Espacio de nombres de la evaluación vectorizada: las mismas funciones como ufuncs de NumPy.
+# La potencia es siempre en coma flotante (los enteros de NumPy desbordarían en silencio)
+NUMPY_FUNCTIONS = {"asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2}
+NUMPY_NAMESPACE = {
+    "__builtins__": {},
+    "_pow": np.float_power,
+    "_inf": np.inf,
+    "_f": as_float64,
+    **{target: NUMPY_FUNCTIONS.get(target) or getattr(np, target) for target, _ in FUNCTIONS.values()},
+}
+
+# Operadores binarios al interpretar el árbol (mismo significado que el código compilado)
+BINARY_OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+                    "%": operator.mod}
+
+# Expresiones ya evaluadas una vez: la siguiente evaluación las compila
+MAX_SEEN_EXPRESSIONS = 1024
+
+# Niveles de anidamiento (paréntesis, signos, potencias) que acepta el parser: el
+# compilador de Python no admite más de 200 paréntesis anidados
+MAX_NESTING = 150
+
+# Poder de ligadura de los operadores (mayor liga más fuerte)
+ADDITIVE_BP = 10
+MULTIPLICATIVE_BP = 20
+PREFIX_BP = 30
+POWER_BP = 40
+INFIX_BP = {"+": ADDITIVE_BP, "-": ADDITIVE_BP, "*": MULTIPLICATIVE_BP, "/": MULTIPLICATIVE_BP,
+            "%": MULTIPLICATIVE_BP, "^": POWER_BP}
+
+
+def tokenize(text):
+    """Dividir la expresión en tokens; lanza ExpressionError ante un carácter inválido."""
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if match is None:
+            raise ExpressionError(f"Carácter inesperado '{text[position]}'", position)
+        kind = match.lastgroup
+        if kind != "space":
+            value = match.group()
+            tokens.append(Token(kind, OPERATOR_ALIASES.get(value, value), position))
+        position = match.end()
+    tokens.append(Token("end", "", len(text)))
+    return tokens
+
+
+class Parser:
+    """Parser de Pratt: cada token sabe cómo empezar una expresión (prefijo) o continuarla (infijo).
+
+    Acepta la multiplicación implícita de la calculadora: 2π, 3(1+2), 2sin(x). Una
+    función sin paréntesis se aplica al término siguiente: √9, sin π.
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.index = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, text):
+        token = self.advance()
+        if token.text != text:
+            raise ExpressionError(f"Se esperaba '{text}'", token.position)
+        return token
+
+    def parse(self):
+        node = self.expression(0)
+        token = self.peek()
+        if token.kind != "end":
+            raise ExpressionError(f"Sobra '{token.text}'", token.position)
+        return node
+
+    def expression(self, rbp):
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise ExpressionError("Expresión demasiado anidada", self.peek().position)
+        try:
+            return self.expression_tail(rbp, self.prefix(self.advance()))
+        finally:
+            self.depth -= 1
+
+    def expression_tail(self, rbp, left):
+        while True:
+            token = self.peek()
+            if token.kind == "op" and token.text in INFIX_BP:
+                bp = INFIX_BP[token.text]
+                if bp <= rbp:
+                    return left
+                self.advance()
+                # La potencia asocia por la derecha: 2^3^2 = 2^(3^2)
+                right = self.expression(bp - 1 if token.text == "^" else bp)
+                left = Binary(token.text, left, right)
+            elif token.kind == "number":
+                # Dos números seguidos ("2 3", "1..2") son un error, no un producto
+                raise ExpressionError(f"Falta un operador antes de '{token.text}'", token.position)
+            elif token.kind == "name" or token.text == "(":
+                # Multiplicación implícita
+                if MULTIPLICATIVE_BP <= rbp:
+                    return left
+                left = Binary("*", left, self.expression(MULTIPLICATIVE_BP))
+            else:
+                return left
+
+    def prefix(self, token):
+        if token.kind == "number":
+            text = token.text
+            is_integer = text.isdigit()
+            return Number(int(text) if is_integer else float(text))
+        if token.kind == "name":
+            return self.name(token)
+        if token.text in ("-", "+"):
+            return Unary(token.text, self.expression(PREFIX_BP))
+        if token.text == "(":
+            node = self.expression(0)
+            self.expect(")")
+            return node
+        if token.kind == "end":
+            raise ExpressionError("Expresión incompleta", token.position)
+        raise ExpressionError(f"No se esperaba '{token.text}'", token.position)
+
+    def name(self, token):
+        name = token.text
+        if name not in FUNCTIONS:
+            return Name(name)
+        arity = FUNCTIONS[name][1]
+        if self.peek().text != "(":
+            if arity != 1:
+                raise ExpressionError(f"'{name}' necesita paréntesis", token.position)
+            return Call(name, (self.expression(PREFIX_BP),))
+        self.advance()
+        args = [self.expression(0)]
+        while self.peek().text == ",":
+            self.advance()
+            args.append(self.expression(0))
+        self.expect(")")
+        if len(args) != arity:
+            raise ExpressionError(f"'{name}' recibe {arity} argumento(s)", token.position)
+        return Call(name, tuple(args))
+
+
+@lru_cache(maxsize=1024)
+def parse(text):
+    """Árbol sintáctico de la expresión (en caché: reevaluar no vuelve a analizar)."""
+    return Parser(text).parse()
+
+
+def number_source(value, vectorized):
+    source = "_inf" if value == math.inf else repr(value)
+    return f"_f({source})" if vectorized else source
+
+
+def to_source(node, variables, vectorized=False):
+    """Traducir el árbol a código Python. Solo emite números, operadores y nombres de la lista blanca.
+
+    Con `vectorized` los números se emiten como float64 de NumPy (para NUMPY_NAMESPACE).
+    """
+    if isinstance(node, Number):
+        return number_source(node.value, vectorized)
+    if isinstance(node, Name):
+        if node.name in CONSTANTS:
+            return number_source(CONSTANTS[node.name], vectorized)
+        if node.name in variables:
+            return node.name
+        raise ExpressionError(f"Nombre desconocido '{node.name}'")
+    if isinstance(node, Unary):
+        return f"({node.op}{to_source(node.operand, variables, vectorized)})"
+    if isinstance(node, Binary):
+        left = to_source(node.left, variables, vectorized)
+        right = to_source(node.right, variables, vectorized)
+        if node.op == "^":
+            return f"_pow({left}, {right})"
+        return f"({left} {node.op} {right})"
+    args = ", ".join(to_source(arg, variables, vectorized) for arg in node.args)
+    return f"{FUNCTIONS[node.name][0]}({args})"
+
+
+def check_variables(variables):
+    for variable in variables:
+        if not variable.isidentifier() or variable.startswith("_") or variable in CONSTANTS or variable in FUNCTIONS:
+            raise ExpressionError(f"Nombre de variable no válido '{variable}'")
+
+
+def compile_tree(tree, variables, namespace):
+    """Función de Python para el árbol; si el compilador de Python no la admite, se interpreta el árbol.
+
+    Una cadena muy larga de operaciones (1+1+...+1) respeta MAX_NESTING pero genera
+    más paréntesis anidados de los que acepta eval.
+    """
+    try:
+        source = to_source(tree, variables, vectorized=namespace is NUMPY_NAMESPACE)
+        return eval(f"lambda {', '.join(variables)}: {source}", dict(namespace))
+    except (SyntaxError, RecursionError, MemoryError):
+        return lambda *values: interpret(tree, dict(zip(variables, values)), namespace)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text, variables=()):
+    """Compilar la expresión a una función de Python que recibe `variables` en orden.
+
+    El código generado solo puede llamar a las funciones de MATH_NAMESPACE.
+    """
+    check_variables(variables)
+    return compile_tree(parse(text), variables, MATH_NAMESPACE)
+
+
+@lru_cache(maxsize=256)
+def compile_vectorized(text, variables=()):
+    """Compilar la expresión a una función que opera sobre arreglos de NumPy elemento a elemento."""
+    check_variables(variables)
+    return compile_tree(parse(text), variables, NUMPY_NAMESPACE)
+
+
+def evaluate_batch(text, **columns):
+    """Evaluar la expresión sobre columnas de valores en una sola llamada, sin bucle de Python.
+
+    Devuelve un arreglo float64 con la forma de las columnas (difundidas entre sí).
+    Los puntos fuera del dominio dan NaN o ±inf en lugar de una excepción.
+    """
+    names = tuple(sorted(columns))
+    function = compile_vectorized(text, names)
+    values = [np.asarray(columns[name], dtype=np.float64) for name in names]
+    shape = np.broadcast_shapes(*(value.shape for value in values))
+    try:
+        with np.errstate(all="ignore"):
+            result = np.asarray(function(*values), dtype=np.float64)
+    except RecursionError:
+        raise ExpressionError("Expresión demasiado larga") from None
+    if result.shape != shape:
+        # Expresión constante (o que no usa todas las columnas)
+        result = np.array(np.broadcast_to(result, shape))
+    return result
+
+
+def interpret(node, variables, namespace=MATH_NAMESPACE):
+    """Evaluar el árbol directamente, sin generar código (más barato para una sola evaluación).
+
+    `namespace` da las funciones y la potencia, como al compilar: MATH_NAMESPACE o NUMPY_NAMESPACE.
+    """
+    kind = type(node)
+    if kind is Number:
+        return as_float64(node.value) if namespace is NUMPY_NAMESPACE else node.value
+    if kind is Name:
+        if node.name in CONSTANTS:
+            value = CONSTANTS[node.name]
+            return as_float64(value) if namespace is NUMPY_NAMESPACE else value
+        if node.name in variables:
+            return variables[node.name]
+        raise ExpressionError(f"Nombre desconocido '{node.name}'")
+    if kind is Unary:
+        value = interpret(node.operand, variables, namespace)
+        return -value if node.op == "-" else +value
+    if kind is Binary:
+        left = interpret(node.left, variables, namespace)
+        right = interpret(node.right, variables, namespace)
+        if node.op == "^":
+            return namespace["_pow"](left, right)
+        return BINARY_OPERATORS[node.op](left, right)
+    function = namespace[FUNCTIONS[node.name][0]]
+    return function(*[interpret(arg, variables, namespace) for arg in node.args])
+
+
+_seen_expressions = {}
+
+
+def clear_caches():
+    """Olvidar los árboles, las funciones compiladas y las expresiones ya vistas."""
+    parse.cache_clear()
+    compile_expression.cache_clear()
+    compile_vectorized.cache_clear()
+    _seen_expressions.clear()
+
+
+def evaluate(text, **variables):
+    """Evaluar una expresión. Lanza ExpressionError o el error aritmético correspondiente.
+
+    La primera vez se interpreta el árbol; si la expresión se vuelve a evaluar se
+    compila, y las siguientes evaluaciones salen de la caché de compile_expression.
+    """
+    names = tuple(sorted(variables))
+    key = (text, names)
+    try:
+        if key in _seen_expressions:
+            return compile_expression(text, names)(*(variables[name] for name in names))
+        check_variables(names)
+        result = interpret(parse(text), variables)
+    except RecursionError:
+        # Árbol demasiado profundo para recorrerlo (p. ej. miles de términos encadenados)
+        raise ExpressionError("Expresión demasiado larga") from None
+    _seen_expressions[key] = None
+    if len(_seen_expressions) > MAX_SEEN_EXPRESSIONS:
+        del _seen_expressions[next(iter(_seen_expressions))]
+    return result
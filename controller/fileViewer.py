@@ -0,0 +1,375 @@
+import bisect
+import mmap
+from array import array
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QColor, QFontDatabase, QPainter, QPalette
+from PySide6.QtWidgets import QAbstractScrollArea
+
+# Cada cuántos bytes se guarda un punto de control del índice de líneas
+CHECKPOINT_BYTES = 64 * 1024
+
+# Puntos de control que el hilo de trabajo entrega en cada lote (16 MB de archivo)
+INDEX_BATCH = 256
+
+# Bytes de cada línea que se muestran (una línea de 1 GB no se decodifica entera)
+MAX_LINE_BYTES = 4096
+
+# Bytes examinados por cada llamada a find() al buscar: entre ventanas se libera el GIL
+SEARCH_WINDOW = 4 * 1024 * 1024
+
+# Margen izquierdo (px) del texto
+TEXT_MARGIN = 4
+
+
+def open_map(path):
+    """Abrir `path` en solo lectura y mapearlo en memoria; devuelve (archivo, mapa)."""
+    file = open(path, "rb")
+    try:
+        return file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # ValueError: un archivo vacío no se puede mapear
+        file.close()
+        raise
+
+
+class MappedFile:
+    """Archivo de solo lectura mapeado con mmap y un índice disperso de líneas.
+
+    El índice no guarda el inicio de cada línea: guarda cuántos saltos de línea hay
+    antes de cada múltiplo de CHECKPOINT_BYTES. Para llegar a una línea se busca su
+    bloque en el índice y se recorre, como mucho, un bloque con mmap.find().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file, self.map = open_map(path)
+        self.size = len(self.map)
+        self.newlines = array("Q", [0])  # newlines[k]: saltos antes del byte k * CHECKPOINT_BYTES
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    @property
+    def indexed_bytes(self):
+        return min((len(self.newlines) - 1) * CHECKPOINT_BYTES, self.size)
+
+    @property
+    def complete(self):
+        return self.indexed_bytes >= self.size
+
+    @property
+    def line_count(self):
+        """Líneas conocidas hasta ahora (todas cuando el índice está completo)."""
+        return self.newlines[-1] + 1
+
+    def add_checkpoints(self, counts):
+        self.newlines.extend(counts)
+
+    def line_start(self, line):
+        """Byte donde empieza la línea `line`, o None si el índice aún no llega a ella."""
+        if line <= 0:
+            return 0
+        if line > self.newlines[-1]:
+            return None
+        # Último bloque que empieza antes del salto de línea número `line`
+        block = bisect.bisect_left(self.newlines, line) - 1
+        position = block * CHECKPOINT_BYTES
+        for _ in range(line - self.newlines[block]):
+            position = self.map.find(b"\n", position) + 1
+        return position
+
+    def line_of(self, offset):
+        """Número de línea del byte `offset`, o None si el índice aún no llega a él."""
+        block = offset // CHECKPOINT_BYTES
+        if block >= len(self.newlines) - 1 and not self.complete:
+            return None
+        block = min(block, len(self.newlines) - 1)
+        start = block * CHECKPOINT_BYTES
+        return self.newlines[block] + self.map[start:offset].count(b"\n")
+
+    def lines(self, first, count):
+        """Devuelve hasta `count` líneas decodificadas desde `first` (recortadas a MAX_LINE_BYTES)."""
+        position = self.line_start(first)
+        result = []
+        if position is None:
+            return result
+        while len(result) < count and position <= self.size:
+            end = self.map.find(b"\n", position)
+            last = end == -1
+            if last:
+                end = self.size
+            data = self.map[position:min(end, position + MAX_LINE_BYTES)]
+            result.append(data.decode("utf-8", errors="replace").rstrip("\r"))
+            if last:
+                break
+            position = end + 1
+        return result
+
+    def text_between(self, start, end):
+        """Texto decodificado entre dos bytes de una misma línea (recortado a MAX_LINE_BYTES)."""
+        return self.map[start:min(end, start + MAX_LINE_BYTES)].decode("utf-8", errors="replace")
+
+
+class ViewerSignals(QObject):
+    checkpoints = Signal(int, list)  # generación, conteos acumulados de saltos de línea
+    indexed = Signal(int)  # generación
+    found = Signal(int, object)  # generación de la búsqueda, byte de la coincidencia (-1 si no hay)
+
+
+class LineIndexTask(QRunnable):
+    """Tarea del pool de hilos que cuenta saltos de línea por bloques de CHECKPOINT_BYTES."""
+
+    def __init__(self, signals, path, generation, is_cancelled):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.generation = generation
+        self.is_cancelled = is_cancelled
+
+    def run(self):
+        try:
+            file, mapped = open_map(self.path)
+        except (OSError, ValueError):
+            self.emit(self.signals.indexed)
+            return
+        try:
+            # Lectura secuencial: el sistema puede adelantar páginas y soltarlas pronto
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            total = 0
+            batch = []
+            for start in range(0, len(mapped), CHECKPOINT_BYTES):
+                total += mapped[start:start + CHECKPOINT_BYTES].count(b"\n")
+                batch.append(total)
+                if len(batch) >= INDEX_BATCH:
+                    if self.is_cancelled(self.generation):
+                        return
+                    self.emit(self.signals.checkpoints, batch)
+                    batch = []
+            if batch:
+                self.emit(self.signals.checkpoints, batch)
+        finally:
+            mapped.close()
+            file.close()
+        self.emit(self.signals.indexed)
+
+    def emit(self, signal, *values):
+        try:
+            signal.emit(self.generation, *values)
+        except RuntimeError:
+            # El visor fue destruido mientras se indexaba
+            pass
+
+
+class FindTask(QRunnable):
+    """Tarea del pool de hilos que busca bytes en el archivo mapeado, sin copiarlo.
+
+    Busca desde `start` hasta el final y, si no encuentra nada, desde el principio.
+    """
+
+    def __init__(self, signals, path, needle, start, generation, is_cancelled):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.needle = needle
+        self.start = start
+        self.generation = generation
+        self.is_cancelled = is_cancelled
+
+    def run(self):
+        found = -1
+        try:
+            file, mapped = open_map(self.path)
+        except (OSError, ValueError):
+            self.emit(found)
+            return
+        try:
+            found = self.find(mapped, self.start, len(mapped))
+            if found == -1 and self.start > 0:
+                found = self.find(mapped, 0, min(self.start + len(self.needle) - 1, len(mapped)))
+        finally:
+            mapped.close()
+            file.close()
+        self.emit(found)
+
+    def find(self, mapped, start, end):
+        overlap = len(self.needle) - 1
+        for window in range(start, end, SEARCH_WINDOW):
+            if self.is_cancelled(self.generation):
+                return -1
+            found = mapped.find(self.needle, window, min(window + SEARCH_WINDOW + overlap, end))
+            if found != -1:
+                return found
+        return -1
+
+    def emit(self, found):
+        try:
+            self.signals.found.emit(self.generation, found)
+        except RuntimeError:
+            # El visor fue destruido mientras se buscaba
+            pass
+
+
+class FileViewer(QAbstractScrollArea):
+    """Visor de solo lectura para archivos enormes.
+
+    Abre el archivo con mmap y solo decodifica y pinta las líneas visibles, así que
+    abrir cuesta lo mismo sea cual sea el tamaño. El índice de líneas se construye en
+    segundo plano y la barra de desplazamiento crece a medida que avanza.
+    """
+    index_progress = Signal(int)  # porcentaje
+    index_finished = Signal()
+    search_finished = Signal(bool)  # True si se encontró el texto
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mapped = None
+        self.generation = 0
+        self.search_generation = 0
+        self.match = None  # (byte inicial, byte final) de la coincidencia resaltada
+        self.pending_match = None  # Coincidencia a la que aún no llega el índice
+        self.text_width = 0
+
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.viewport().setBackgroundRole(QPalette.Base)
+        self.verticalScrollBar().setSingleStep(1)
+
+        self._signals = ViewerSignals(self)
+        self._signals.checkpoints.connect(self.on_checkpoints)
+        self._signals.indexed.connect(self.on_indexed)
+        self._signals.found.connect(self.on_found)
+
+    def open(self, path):
+        """Mapear `path` y empezar a indexar sus líneas. Lanza OSError/ValueError si no se puede."""
+        self.close_file()
+        self.mapped = MappedFile(path)
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.update_scrollbars()
+        self.viewport().update()
+        QThreadPool.globalInstance().start(LineIndexTask(self._signals, path, self.generation, self.is_cancelled))
+
+    def close_file(self):
+        """Liberar el archivo y descartar las tareas en curso."""
+        self.generation += 1
+        self.search_generation += 1
+        self.match = self.pending_match = None
+        self.text_width = 0
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def is_cancelled(self, generation):
+        # Se llama desde los hilos de trabajo: solo lee un entero
+        return generation != self.generation
+
+    def line_height(self):
+        return self.fontMetrics().height()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def update_scrollbars(self):
+        lines = self.mapped.line_count if self.mapped else 0
+        visible = self.visible_lines()
+        vertical = self.verticalScrollBar()
+        vertical.setPageStep(visible)
+        vertical.setRange(0, max(0, lines - visible))
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(self.viewport().width())
+        horizontal.setRange(0, max(0, self.text_width + 2 * TEXT_MARGIN - self.viewport().width()))
+
+    def on_checkpoints(self, generation, counts):
+        if generation != self.generation:
+            return
+        self.mapped.add_checkpoints(counts)
+        self.update_scrollbars()
+        self.index_progress.emit(int(self.mapped.indexed_bytes * 100 / max(self.mapped.size, 1)))
+        if self.pending_match is not None:
+            self.show_match(*self.pending_match)
+
+    def on_indexed(self, generation):
+        if generation != self.generation:
+            return
+        self.update_scrollbars()
+        if self.pending_match is not None:
+            self.show_match(*self.pending_match)
+        self.index_finished.emit()
+
+    def go_to_line(self, line):
+        """Desplazar el visor para que `line` quede a la vista, centrada."""
+        self.verticalScrollBar().setValue(line - self.visible_lines() // 2)
+        self.viewport().update()
+
+    def find(self, text):
+        """Buscar `text` a partir de la coincidencia actual (o de la primera línea visible)."""
+        if self.mapped is None or not text:
+            return
+        if self.match is not None:
+            start = self.match[0] + 1
+        else:
+            start = self.mapped.line_start(self.verticalScrollBar().value()) or 0
+        self.search_generation += 1  # Una búsqueda nueva cancela la anterior
+        self.search_text = text.encode("utf-8")
+        QThreadPool.globalInstance().start(FindTask(
+            self._signals, self.mapped.path, self.search_text, start, self.search_generation, self.search_cancelled
+        ))
+
+    def search_cancelled(self, generation):
+        return generation != self.search_generation
+
+    def on_found(self, generation, offset):
+        if generation != self.search_generation:
+            return
+        if offset == -1:
+            self.search_finished.emit(False)
+            return
+        self.show_match(offset, offset + len(self.search_text))
+        self.search_finished.emit(True)
+
+    def show_match(self, start, end):
+        """Resaltar una coincidencia y llevarla a la vista (o esperar a que el índice llegue)."""
+        self.match = (start, end)
+        line = self.mapped.line_of(start)
+        if line is None:
+            self.pending_match = (start, end)
+            return
+        self.pending_match = None
+        self.go_to_line(line)
+
+    def paintEvent(self, event):
+        if self.mapped is None:
+            return
+        painter = QPainter(self.viewport())
+        metrics = self.fontMetrics()
+        height = metrics.height()
+        first = self.verticalScrollBar().value()
+        x = TEXT_MARGIN - self.horizontalScrollBar().value()
+        match_line = self.mapped.line_of(self.match[0]) if self.match and self.pending_match is None else None
+        widest = self.text_width
+
+        for row, text in enumerate(self.mapped.lines(first, self.visible_lines() + 1)):
+            y = row * height
+            if first + row == match_line:
+                # Resaltar la coincidencia dentro de su línea
+                line_start = self.mapped.line_start(match_line)
+                before = self.mapped.text_between(line_start, self.match[0]).expandtabs(4)
+                found = self.mapped.text_between(self.match[0], self.match[1])
+                painter.fillRect(x + metrics.horizontalAdvance(before), y,
+                                 metrics.horizontalAdvance(found), height, QColor(255, 220, 0))
+            text = text.expandtabs(4)
+            painter.drawText(x, y + metrics.ascent(), text)
+            widest = max(widest, metrics.horizontalAdvance(text))
+
+        if widest != self.text_width:
+            self.text_width = widest
+            self.update_scrollbars()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
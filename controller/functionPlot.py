@@ -0,0 +1,140 @@
+import numpy as np
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainter
+
+from controller.expressionEngine import evaluate_batch
+
+# Puntos en los que se evalúa la función (una sola llamada vectorizada)
+PLOT_SAMPLES = 1_000_000
+
+# Si el rango completo de y supera en este factor al rango sin los extremos (asíntotas
+# como las de tan x), el eje se ajusta a los percentiles en lugar de al máximo
+ROBUST_RANGE_FACTOR = 3
+ROBUST_PERCENTILES = (5, 95)
+
+
+def sample_function(text, x_min, x_max, count=PLOT_SAMPLES):
+    """Evaluar f(x) en `count` puntos equiespaciados de [x_min, x_max]; devuelve (x, y)."""
+    x = np.linspace(x_min, x_max, count)
+    return x, evaluate_batch(text, x=x)
+
+
+def min_max_downsample(x, y, buckets):
+    """Reducir la curva a, como mucho, dos puntos por columna de píxeles: el mínimo y el máximo.
+
+    Conserva la forma que se vería dibujando todos los puntos. Los valores no
+    finitos se descartan; una columna sin ninguno corta la curva. Devuelve una
+    lista de tramos (x, y) continuos.
+    """
+    count = len(y)
+    if count == 0 or buckets <= 0:
+        return []
+    size = -(-count // buckets)
+    rows = -(-count // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:count] = np.where(np.isfinite(y), y, np.nan)
+    padded = padded.reshape(rows, size)
+
+    # Posición del mínimo y del máximo de cada columna; los NaN no cuentan
+    low = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    high = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    valid = np.flatnonzero(~np.isnan(padded[np.arange(rows), low]))
+    if len(valid) == 0:
+        return []
+    offsets = valid * size
+    if size == 1:
+        indices = offsets
+        per_row = 1
+    else:
+        # Los dos puntos en el orden en que aparecen
+        first = offsets + np.minimum(low[valid], high[valid])
+        second = offsets + np.maximum(low[valid], high[valid])
+        indices = np.column_stack((first, second)).ravel()
+        per_row = 2
+
+    breaks = (np.flatnonzero(np.diff(valid) > 1) + 1) * per_row
+    return [(x[part], y[part]) for part in np.split(indices, breaks)]
+
+
+def y_range(segments):
+    """Rango del eje y para los tramos: completo, salvo que unos pocos extremos lo aplasten todo."""
+    values = np.concatenate([y for _, y in segments])
+    low, high = float(values.min()), float(values.max())
+    robust_low, robust_high = (float(v) for v in np.percentile(values, ROBUST_PERCENTILES))
+    if high - low > ROBUST_RANGE_FACTOR * (robust_high - robust_low) > 0:
+        low, high = robust_low, robust_high
+    if high == low:
+        low, high = low - 1, high + 1
+    margin = (high - low) * 0.05
+    return low - margin, high + margin
+
+
+class FunctionPlot(QChartView):
+    """Gráfico de y = f(x) sobre QtCharts.
+
+    Guarda todas las muestras y solo entrega a QtCharts unos dos puntos por píxel
+    del tramo visible; al redimensionar o hacer zoom (arrastrando un rectángulo;
+    clic derecho para alejar) se vuelve a reducir desde las muestras originales.
+    """
+
+    def __init__(self, parent=None):
+        chart = QChart()
+        chart.legend().hide()
+        super().__init__(chart, parent)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setRubberBand(QChartView.RectangleRubberBand)
+
+        self.axis_x = QValueAxis()
+        self.axis_y = QValueAxis()
+        chart.addAxis(self.axis_x, Qt.AlignBottom)
+        chart.addAxis(self.axis_y, Qt.AlignLeft)
+        self.axis_x.rangeChanged.connect(self.redraw)
+
+        self.series = []  # Uno por tramo continuo; se reutilizan entre redibujados
+        self.x = self.y = None
+
+    def plot(self, text, x_min, x_max, count=PLOT_SAMPLES):
+        """Evaluar y dibujar la expresión; lanza ExpressionError si no se puede analizar."""
+        x, y = sample_function(text, x_min, x_max, count)
+        self.x, self.y = x, y
+        self.chart().setTitle(f"y = {text}")
+        self.axis_x.blockSignals(True)
+        self.axis_x.setRange(x_min, x_max)
+        self.axis_x.blockSignals(False)
+        segments = self.redraw()
+        if segments:
+            self.axis_y.setRange(*y_range(segments))
+
+    def clear(self):
+        self.x = self.y = None
+        self.chart().setTitle("")
+        self.redraw()
+
+    def redraw(self, *_):
+        """Reducir las muestras del rango visible al ancho en píxeles del área del gráfico."""
+        segments = []
+        if self.x is not None:
+            start, stop = np.searchsorted(self.x, (self.axis_x.min(), self.axis_x.max()))
+            # Un punto más a cada lado para que la curva llegue a los bordes
+            start, stop = max(0, start - 1), min(len(self.x), stop + 1)
+            width = max(1, int(self.chart().plotArea().width()))
+            segments = min_max_downsample(self.x[start:stop], self.y[start:stop], width)
+
+        while len(self.series) < len(segments):
+            series = QLineSeries()
+            self.chart().addSeries(series)
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
+            self.series.append(series)
+        for index, series in enumerate(self.series):
+            if index < len(segments):
+                x, y = segments[index]
+                series.replace([QPointF(a, b) for a, b in zip(x.tolist(), y.tolist())])
+            else:
+                series.clear()
+        return segments
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.redraw()
@@ -0,0 +1,55 @@
+import os
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon, QImage, QPixmap
+
+# Tamaños (px) en los que se muestran los íconos: listas de Docs (16), menú y barra de tareas (32)
+# y escritorio (64)
+ICON_SIZES = (16, 32, 64)
+
+
+class IconProvider:
+    """Carga cada ícono una sola vez, ya escalado a los tamaños usados, y comparte la instancia."""
+
+    def __init__(self, sizes=ICON_SIZES):
+        self.sizes = sizes
+        self.icons = {}  # Ruta normalizada -> QIcon
+
+    def icon(self, path):
+        """Devuelve el QIcon compartido para la ruta dada."""
+        key = os.path.normpath(path)
+        icon = self.icons.get(key)
+        if icon is None:
+            icon = self.load(path)
+            self.icons[key] = icon
+        return icon
+
+    def load(self, path):
+        """Decodificar el archivo y añadir versiones pre-escaladas para cada tamaño."""
+        image = QImage(path)
+        if image.isNull():
+            print(f"Advertencia: No se pudo cargar el ícono {path}.")
+            return QIcon()
+
+        icon = QIcon()
+        for size in self.sizes:
+            icon.addPixmap(QPixmap.fromImage(image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
+        # El original queda disponible para pantallas de alta densidad
+        icon.addPixmap(QPixmap.fromImage(image))
+        return icon
+
+
+_icon_provider = None
+
+
+def get_icon_provider():
+    """Devuelve el proveedor de íconos compartido por toda la aplicación."""
+    global _icon_provider
+    if _icon_provider is None:
+        _icon_provider = IconProvider()
+    return _icon_provider
+
+
+def get_icon(path):
+    """Atajo para obtener un ícono compartido."""
+    return get_icon_provider().icon(path)
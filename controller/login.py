@@ -1,11 +1,12 @@
 import os
-import json
-import hashlib
-from apps.adminPanel import AdminPanel
-from controller.desktop import Desktop
-from controller.dataBase import load_user_database, save_user_database
-from PySide6.QtCore import Qt, QSize, QTimer, QTime, Signal as pyqtSignal
-from PySide6.QtGui import QPixmap, QPalette, QBrush, QImage, QPainter, QPainterPath
+from controller.avatarCache import avatar_path, get_avatar_cache
+from controller.backgroundCache import BackgroundBinder
+from controller.dataBase import get_user_repository
+from controller.passwords import PasswordHasher, PasswordVerifier
+from controller.scheduler import get_scheduler
+from controller.sessionManager import get_session_manager
+from PySide6.QtCore import Qt, QTime, Signal as pyqtSignal
+from PySide6.QtGui import QPalette, QBrush
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout, QFormLayout, QMessageBox, QComboBox
 
 
@@ -16,14 +17,11 @@ class LoginWindow(QWidget):
         self.setWindowTitle("Login")
         self.setGeometry(100, 100, 1420, 800)
 
-        # Cargar la base de datos de usuarios
-        self.user_database = self.load_user_database("data/dataBaseUser/users.json")
+        # Repositorio de usuarios compartido (se recarga solo si cambia el archivo)
+        self.users = get_user_repository()
 
         # Inicializamos el usuario actual con el primer usuario en la base de datos o un valor por defecto
-        if self.user_database:
-            self.current_username = list(self.user_database.keys())[0]  # Primer usuario en la base de datos
-        else:
-            self.current_username = "Guest"  # Usuario por defecto si no hay usuarios
+        self.current_username = self.users.first_username() or "Guest"
 
         # Verificar si la imagen de fondo existe
         self.setup_background()
@@ -35,7 +33,9 @@ class LoginWindow(QWidget):
         self.right_layout = QVBoxLayout(right_container)  # Guardar el layout en un atributo
         self.right_layout.setContentsMargins(15, 15, 15, 15)
 
-        # Crear la imagen del perfil de usuario
+        # Crear la imagen del perfil de usuario (miniaturas en caché, generadas en segundo plano)
+        self.avatars = get_avatar_cache()
+        self.avatars.avatar_ready.connect(self.on_avatar_ready)
         self.user_image_label = QLabel()
         self.load_user_image(self.current_username)  # Cargar imagen del usuario
         self.user_image_label.setAlignment(Qt.AlignCenter)
@@ -60,6 +60,10 @@ class LoginWindow(QWidget):
         # Botones para cambiar usuario e iniciar sesión
         self.setup_buttons()
 
+        # Verificador de contraseñas fuera del hilo de la interfaz
+        self.password_verifier = PasswordVerifier(self)
+        self.password_verifier.verified.connect(self.on_password_verified)
+
         main_layout.addWidget(right_container)
 
         # Reloj
@@ -70,25 +74,22 @@ class LoginWindow(QWidget):
         top_layout.addWidget(self.clock_label, alignment=Qt.AlignTop | Qt.AlignRight)
         main_layout.addLayout(top_layout)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_clock)
-        self.timer.start(1000)
+        # El reloj se actualiza con el planificador central solo mientras la ventana es visible
+        get_scheduler().subscribe(self, self.update_clock, 1000)
 
     def setup_background(self):
-        """Configura la imagen de fondo."""
+        """Configura la imagen de fondo (escalada en segundo plano y ajustada al redimensionar)."""
         path_to_background = os.path.abspath("data/background.jpg")
         if not os.path.exists(path_to_background):
             print(f"Error: Background image not found at: {path_to_background}")
         else:
-            # Cargar la imagen de fondo
-            background = QImage(path_to_background)
-            palette = QPalette()
-            palette.setBrush(QPalette.Window, QBrush(background.scaled(
-                QSize(self.width(), self.height()),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )))
-            self.setPalette(palette)
+            self.background = BackgroundBinder(self, path_to_background, self.apply_background)
+
+    def apply_background(self, pixmap):
+        """Usar el fondo escalado como brocha de la ventana."""
+        palette = self.palette()
+        palette.setBrush(QPalette.Window, QBrush(pixmap))
+        self.setPalette(palette)
 
     def get_input_style(self):
         """Devuelve el estilo para los campos de entrada."""
@@ -138,49 +139,26 @@ class LoginWindow(QWidget):
         self.right_layout.addWidget(self.login_button)
         self.right_layout.addWidget(self.forgot_password_button)
 
-    def load_user_database(self, file_path):
-        """Carga la base de datos de usuarios desde un archivo JSON."""
-        try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading user database: {e}")
-            return {}
-
     def load_user_image(self, username):
-        """Carga la imagen del usuario basado en el nombre de usuario."""
-        image_path = f"./data/userImage/{username}.jpg"  # Ruta de la imagen del usuario
-        if os.path.exists(image_path):
-            pixmap = QPixmap(image_path)
-            rounded_pixmap = self.get_round_pixmap(pixmap, 400)
-            self.user_image_label.setPixmap(rounded_pixmap)  # Establecer el pixmap redondeado
-        else:
-            # Si no hay imagen del usuario, cargar una imagen por defecto
-            default_image_path = "./data/userImage/default_user.png"
-            if os.path.exists(default_image_path):
-                pixmap = QPixmap(default_image_path)
-                rounded_pixmap = self.get_round_pixmap(pixmap, 400)
-                self.user_image_label.setPixmap(rounded_pixmap)  # Establecer el pixmap por defecto
-            else:
-                print("No se encontró la imagen del usuario ni la imagen por defecto.")
-                self.user_image_label.clear()  # Limpiar el QLabel si no hay imagen
-
-    def get_round_pixmap(self, pixmap, size):
-        """Crea un pixmap redondeado."""
-        rounded_pixmap = QPixmap(size, size)
-        rounded_pixmap.fill(Qt.transparent)
-        painter = QPainter(rounded_pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        path.addEllipse(0, 0, size, size)
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        painter.end()
-        return rounded_pixmap
-
-    def hash_password(self, password):
-        """Devuelve el hash SHA-256 de una contraseña."""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Muestra el avatar del usuario desde la caché de miniaturas."""
+        self.avatar_request = (avatar_path(username), 400)
+        image_path, size = self.avatar_request
+        if image_path is None:
+            print("No se encontró la imagen del usuario ni la imagen por defecto.")
+            self.user_image_label.clear()  # Limpiar el QLabel si no hay imagen
+            return
+
+        pixmap = self.avatars.pixmap(image_path, size)
+        if pixmap is not None:
+            self.user_image_label.setPixmap(pixmap)
+        # Si no, la miniatura se genera en segundo plano y llega por on_avatar_ready
+
+    def on_avatar_ready(self, image_path, size):
+        """Mostrar el avatar cuando termina de generarse, si sigue siendo el solicitado."""
+        if (image_path, size) == self.avatar_request:
+            pixmap = self.avatars.pixmap(image_path, size)
+            if pixmap is not None:
+                self.user_image_label.setPixmap(pixmap)
 
     def handle_login(self):
         """Maneja la lógica del inicio de sesión."""
@@ -188,28 +166,50 @@ class LoginWindow(QWidget):
         password = self.password_input.text()  # Contraseña ingresada
 
         # Verificar si el nombre de usuario existe en la base de datos
-        if username in self.user_database:
-            hashed_password = self.user_database[username]['password']  # Hash de la contraseña almacenada
-            user_role = self.user_database[username].get('role', 'user')  # Obtener el rol, por defecto 'user'
-            user_id = self.user_database[username].get('id')  # Obtener el ID del usuario
-
-            # Verificar la contraseña
-            if self.hash_password(password) == hashed_password:
-                # Abrir la ventana del escritorio y pasar el ID del usuario
-                self.open_desktop(user_id)
-            else:
-                QMessageBox.warning(self, "Error", "Incorrect password.")
+        user = self.users.get(username)
+        if user is not None:
+            hashed_password = user['password']  # Hash de la contraseña almacenada
+
+            # La verificación (deliberadamente lenta) se hace en un hilo de trabajo
+            self.login_button.setEnabled(False)
+            self.password_verifier.verify(username, password, hashed_password)
         else:
             QMessageBox.warning(self, "Error", "Username does not exist.")
 
+    def on_password_verified(self, username, is_valid, upgraded_hash):
+        """Recibe el resultado de la verificación de la contraseña."""
+        self.login_button.setEnabled(True)
+        if username != self.current_username:
+            return  # Se cambió de usuario mientras se verificaba
+
+        if not is_valid:
+            QMessageBox.warning(self, "Error", "Incorrect password.")
+            return
+
+        # Los hashes heredados (SHA-256 sin sal) se actualizan de forma transparente
+        if upgraded_hash:
+            self.users.update(username, password=upgraded_hash)
+
+        # Abrir la ventana del escritorio y pasar el ID del usuario
+        user_id = self.users.get(username).get('id')  # Obtener el ID del usuario
+        self.open_desktop(user_id)
+
     def open_desktop(self, user_id):
-        """Abre la ventana del escritorio según el rol del usuario."""
-        self.desktop_window = Desktop(self.current_username, user_id)  # Pasar el nombre de usuario y el ID
-        self.desktop_window.show()
+        """Abre el escritorio del usuario, reanudando su sesión si sigue en memoria."""
+        sessions = get_session_manager()
+        sessions.login_window = self  # Para volver a esta ventana al cambiar de usuario
+        self.desktop_window = sessions.activate(self.current_username, user_id)
         self.close()
 
+    def reset(self):
+        """Preparar la ventana para un nuevo inicio de sesión."""
+        self.password_input.clear()
+        self.login_button.setEnabled(True)
+        self.load_user_image(self.current_username)
+
     def open_admin_panel(self):
         """Abre el panel de configuración de administrador."""
+        from apps.adminPanel import AdminPanel
         self.admin_panel_window = AdminPanel(self)  # Crear una instancia de AdminPanel
         self.admin_panel_window.show()  # Mostrar el panel de administrador
 
@@ -220,6 +220,8 @@ class LoginWindow(QWidget):
 
     def open_user_change_window(self):
         """Abre la ventana para cambiar de usuario."""
+        # Preparar los avatares de todos los usuarios para que el cambio sea inmediato
+        self.avatars.prefetch({avatar_path(username) for username in self.users.usernames()} - {None}, 400)
         self.user_change_window = UserChangeWindow()
         self.user_change_window.user_changed.connect(self.update_current_user)
         self.user_change_window.show()
@@ -252,6 +254,10 @@ class PasswordRecoveryWindow(QWidget):
         self.reset_password_form = self.create_reset_password_form()
         layout.addLayout(self.reset_password_form)
 
+        # El hash (deliberadamente lento) se calcula en un hilo de trabajo
+        self.password_hasher = PasswordHasher(self)
+        self.password_hasher.hashed.connect(self.on_password_hashed)
+
         self.setLayout(layout)
 
     def create_reset_password_form(self):
@@ -314,78 +320,67 @@ class PasswordRecoveryWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please enter a new password.")
             return
 
-        # Cargar base de datos de usuarios
-        user_database = self.load_user_database()
+        users = get_user_repository()
 
-        if not user_database:
+        if users.load_error is not None or not users.count():
             QMessageBox.warning(self, "Error", "User database could not be loaded.")
             return
 
-        if selected_user in user_database:
-            stored_user_id = user_database[selected_user].get("id")  
-            stored_user_name = user_database[selected_user].get("name")  
+        user = users.get(selected_user)
+        if user is not None:
+            stored_user_id = user.get("id")
 
             if str(stored_user_id) != entered_user_id:
                 QMessageBox.warning(self, "Error", "The entered user ID is incorrect.")
                 return
 
             # Si el ID es correcto, procedemos con el cambio de contraseña
-            hashed_password = self.hash_password(new_password)
-            user_database[selected_user]["password"] = hashed_password
-
-            # Guardar cambios en la base de datos
-            if self.save_user_database(user_database):
-                QMessageBox.information(self, "Success", f"Password for '{selected_user}' has been reset.")
-                
-                # Aquí llamamos a un método en LoginWindow para actualizar su estado
-                if self.parent_widget and hasattr(self.parent_widget, 'update_user_data'):
-                    self.parent_widget.update_user_data(selected_user, hashed_password)
-                
-                # Actualizar el ComboBox y el estado
-                self.update_user_selection_combo()
-                self.new_password_input.clear()  # Limpiar el campo de nueva contraseña
-                self.user_id_input.clear()  # Limpiar el campo de ID de usuario
-            else:
-                QMessageBox.warning(self, "Error", "Failed to save the updated user database.")
+            self.reset_password_button.setEnabled(False)
+            self.password_hasher.hash(selected_user, new_password)
         else:
             QMessageBox.warning(self, "Error", "User not found.")
 
+    def on_password_hashed(self, selected_user, hashed_password):
+        """Recibe el hash de la nueva contraseña y la guarda."""
+        self.reset_password_button.setEnabled(True)
+
+        # Guardar cambios en la base de datos
+        if self.save_password(selected_user, hashed_password):
+            QMessageBox.information(self, "Success", f"Password for '{selected_user}' has been reset.")
+
+            # Aquí llamamos a un método en LoginWindow para actualizar su estado
+            if self.parent_widget and hasattr(self.parent_widget, 'update_user_data'):
+                self.parent_widget.update_user_data(selected_user, hashed_password)
+
+            # Actualizar el ComboBox y el estado
+            self.update_user_selection_combo()
+            self.new_password_input.clear()  # Limpiar el campo de nueva contraseña
+            self.user_id_input.clear()  # Limpiar el campo de ID de usuario
+        else:
+            QMessageBox.warning(self, "Error", "Failed to save the updated user database.")
+
     def update_user_selection_combo(self):
         """Actualiza el ComboBox con los usuarios existentes de la base de datos."""
         self.user_selection_combo.clear()  # Limpiamos el combo box
-        user_database = self.load_user_database()  # Cargar base de datos de usuarios
+        users = get_user_repository()
+        usernames = users.usernames()
 
-        if user_database:
-            for username in user_database.keys():
-                self.user_selection_combo.addItem(username)
+        if users.load_error is not None:
+            QMessageBox.warning(self, "Error", "User database is corrupted.")
+        if usernames:
+            self.user_selection_combo.addItems(usernames)
         else:
             QMessageBox.warning(self, "Error", "No users found in the database.")
 
-    def load_user_database(self):
-        """Carga la base de datos de usuarios desde el archivo JSON."""
-        try:
-            with open("data/dataBaseUser/users.json", "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Error", "User database file not found.")
-            return {}
-        except json.JSONDecodeError:
-            QMessageBox.warning(self, "Error", "User database is corrupted.")
-            return {}
-
-    def save_user_database(self, user_database):
-        """Guarda la base de datos de usuarios en el archivo JSON."""
+    def save_password(self, username, hashed_password):
+        """Guarda la nueva contraseña del usuario en la base de datos."""
         try:
-            with open("data/dataBaseUser/users.json", "w") as file:
-                json.dump(user_database, file, indent=4)
+            get_user_repository().update(username, password=hashed_password)
             return True  # Retornar verdadero si se guarda correctamente
         except Exception as e:
             print(f"Error saving user database: {e}")
             return False  # Retornar falso si hubo un error al guardar
 
-    def hash_password(self, password):
-        """Hash the password using SHA-256 (or another secure method)."""
-        return hashlib.sha256(password.encode()).hexdigest()
 
 class UserChangeWindow(QWidget):
     user_changed = pyqtSignal(str)
@@ -431,6 +426,11 @@ class UserChangeWindow(QWidget):
         layout.addWidget(self.select_user_container)
         self.select_user_container.setVisible(False)
 
+        # El hash de la contraseña nueva se calcula en un hilo de trabajo
+        self.pending_user_id = None
+        self.password_hasher = PasswordHasher(self)
+        self.password_hasher.hashed.connect(self.on_password_hashed)
+
         self.setLayout(layout)
 
     def get_button_style(self):
@@ -467,9 +467,8 @@ class UserChangeWindow(QWidget):
         return form_layout
 
     def update_user_selection_combo(self):
-        user_database = self.load_user_database()
         self.user_selection_combo.clear()
-        self.user_selection_combo.addItems(user_database.keys())
+        self.user_selection_combo.addItems(get_user_repository().usernames())
 
     def show_create_user_fields(self):
         self.create_user_form_container.setVisible(True)
@@ -488,63 +487,46 @@ class UserChangeWindow(QWidget):
             QMessageBox.warning(self, "Error", "Username, password, and user ID are required.")
             return
 
-        user_database = self.load_user_database()
+        users = get_user_repository()
 
-        if username in user_database:
+        if users.exists(username):
             QMessageBox.warning(self, "Error", "User already exists.")
-        elif any(user["id"] == user_id for user in user_database.values()):
+        elif users.id_exists(user_id):
             QMessageBox.warning(self, "Error", "User ID already exists. Please choose a different ID.")
         else:
             # Hash the password
-            hashed_password = self.hash_password(password)
-
-            # Create new user entry
-            user_database[username] = {
-                "id": user_id,
-                "password": hashed_password,
-                "role": "admin" if len(user_database) == 0 else "user"
-            }
-
-            self.save_user_database(user_database)
-            QMessageBox.information(self, "Success", f"User '{username}' created successfully.")
-            self.user_changed.emit(username)
-            self.close()
+            self.confirm_create_user_button.setEnabled(False)
+            self.pending_user_id = user_id
+            self.password_hasher.hash(username, password)
+
+    def on_password_hashed(self, username, hashed_password):
+        """Recibe el hash de la contraseña y crea el usuario."""
+        self.confirm_create_user_button.setEnabled(True)
+
+        # Create new user entry (el primer usuario es administrador); create() vuelve a
+        # comprobar que el nombre y el ID siguen libres
+        try:
+            get_user_repository().create(username, self.pending_user_id, hashed_password)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Could not create user: {e}")
+            return
+        QMessageBox.information(self, "Success", f"User '{username}' created successfully.")
+        self.user_changed.emit(username)
+        self.close()
 
     def handle_select_user(self):
         selected_user = self.user_selection_combo.currentText()
-        user_database = self.load_user_database()
 
-        if selected_user in user_database:
+        if get_user_repository().exists(selected_user):
             QMessageBox.information(self, "Success", f"User '{selected_user}' selected.")
             self.user_changed.emit(selected_user)
             self.close()
         else:
             QMessageBox.warning(self, "Error", "User not found.")
 
-    def load_user_database(self):
-        """Carga la base de datos de usuarios desde el archivo JSON."""
-        try:
-            with open("data/dataBaseUser/users.json", "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
-            return {}  # Retorna un diccionario vacío si el archivo no existe
-
-    def save_user_database(self, user_database):
-        """Guarda la base de datos de usuarios en el archivo JSON."""
-        try:
-            with open("data/dataBaseUser/users.json", "w") as file:
-                json.dump(user_database, file, indent=4)
-        except Exception as e:
-            print(f"Error saving user database: {e}")
-
-    def hash_password(self, password):
-        """Hash de la contraseña utilizando SHA-256."""
-        return hashlib.sha256(password.encode()).hexdigest()
-
-    def get_next_user_id(self, user_database):
+    def get_next_user_id(self):
         """Obtiene el próximo ID de usuario disponible (ya no se usa ya que se permite ID personalizado)."""
-        existing_ids = [user["id"] for user in user_database.values()]
-        return max(existing_ids, default=0) + 1
+        return get_user_repository().next_user_id()
     
     
     
\ No newline at end of file
@@ -0,0 +1,160 @@
+# Hash de contraseñas versionado con sal por usuario y costo configurable.
+#
+# Formatos almacenados:
+#     scrypt$<n>$<r>$<p>$<sal>$<hash>
+#     pbkdf2_sha256$<iteraciones>$<sal>$<hash>
+#     <64 caracteres hex>   (SHA-256 sin sal heredado; se actualiza al iniciar sesión)
+import base64
+import hashlib
+import hmac
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# Parámetros de costo; ajustarlos con benchmarks/passwordCost.py para ~100 ms por hash
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+
+# scrypt depende de que OpenSSL lo incluya; si no, se usa PBKDF2
+DEFAULT_SCHEME = "scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2_sha256"
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode("ascii"))
+
+
+def _scrypt(password, salt, n, r, p):
+    # Memoria necesaria: 128 * n * r bytes, con margen
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password, scheme=None, **cost):
+    """Devuelve el hash versionado de una contraseña con una sal nueva."""
+    scheme = scheme or DEFAULT_SCHEME
+    salt = os.urandom(SALT_BYTES)
+    if scheme == "scrypt":
+        n = cost.get("n", SCRYPT_N)
+        r = cost.get("r", SCRYPT_R)
+        p = cost.get("p", SCRYPT_P)
+        digest = _scrypt(password, salt, n, r, p)
+        return f"scrypt${n}${r}${p}${_b64encode(salt)}${_b64encode(digest)}"
+    if scheme == "pbkdf2_sha256":
+        iterations = cost.get("iterations", PBKDF2_ITERATIONS)
+        digest = _pbkdf2(password, salt, iterations)
+        return f"pbkdf2_sha256${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+    raise ValueError(f"Unknown password hashing scheme: {scheme}")
+
+
+def is_legacy_hash(stored):
+    """Indica si el hash almacenado es el SHA-256 sin sal heredado."""
+    return len(stored) == 64 and "$" not in stored
+
+
+def verify_password(password, stored):
+    """Comprueba la contraseña contra cualquier formato soportado en tiempo constante."""
+    if not stored:
+        return False
+    if is_legacy_hash(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            digest = _scrypt(password, _b64decode(parts[4]), n, r, p)
+            return hmac.compare_digest(digest, _b64decode(parts[5]))
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            digest = _pbkdf2(password, _b64decode(parts[2]), int(parts[1]))
+            return hmac.compare_digest(digest, _b64decode(parts[3]))
+    except (ValueError, MemoryError):
+        return False
+    return False
+
+
+def needs_rehash(stored):
+    """Indica si el hash debe regenerarse con el esquema y el costo actuales."""
+    if is_legacy_hash(stored):
+        return True
+    parts = stored.split("$")
+    if parts[0] != DEFAULT_SCHEME:
+        return True
+    try:
+        if parts[0] == "scrypt":
+            return (int(parts[1]), int(parts[2]), int(parts[3])) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        return int(parts[1]) != PBKDF2_ITERATIONS
+    except (IndexError, ValueError):
+        return True
+
+
+class VerifyTask(QRunnable):
+    """Tarea del pool de hilos que verifica una contraseña y, si hace falta, la actualiza."""
+
+    def __init__(self, verifier, username, password, stored):
+        super().__init__()
+        self.verifier = verifier
+        self.username = username
+        self.password = password
+        self.stored = stored
+
+    def run(self):
+        ok = verify_password(self.password, self.stored)
+        # El nuevo hash también es costoso, así que se calcula aquí y no en la interfaz
+        upgraded = hash_password(self.password) if ok and needs_rehash(self.stored) else ""
+        try:
+            # El verificador vive en el hilo de la interfaz, así que la entrega es encolada
+            self.verifier.verified.emit(self.username, ok, upgraded)
+        except RuntimeError:
+            # La ventana se cerró mientras se verificaba
+            pass
+
+
+class PasswordVerifier(QObject):
+    """Verifica contraseñas fuera del hilo de la interfaz.
+
+    Emite `verified(usuario, correcta, hash_actualizado)`; el hash actualizado es una
+    cadena vacía si el almacenado ya usa el esquema y el costo actuales.
+    """
+    verified = Signal(str, bool, str)
+
+    def verify(self, username, password, stored):
+        QThreadPool.globalInstance().start(VerifyTask(self, username, password, stored))
+
+
+class HashTask(QRunnable):
+    """Tarea del pool de hilos que calcula el hash de una contraseña nueva."""
+
+    def __init__(self, hasher, key, password):
+        super().__init__()
+        self.hasher = hasher
+        self.key = key
+        self.password = password
+
+    def run(self):
+        hashed = hash_password(self.password)
+        try:
+            self.hasher.hashed.emit(self.key, hashed)
+        except RuntimeError:
+            # La ventana se cerró mientras se calculaba el hash
+            pass
+
+
+class PasswordHasher(QObject):
+    """Calcula hashes de contraseñas nuevas fuera del hilo de la interfaz.
+
+    Emite `hashed(clave, hash)`; la clave (p. ej. el nombre de usuario) identifica la petición.
+    """
+    hashed = Signal(str, str)
+
+    def hash(self, key, password):
+        QThreadPool.globalInstance().start(HashTask(self, key, password))
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Búfer circular de tamaño fijo respaldado por un arreglo de NumPy."""
+
+    def __init__(self, capacity, width=1, dtype=np.float64):
+        self.capacity = capacity
+        self.width = width
+        self._data = np.zeros((capacity, width), dtype=dtype)
+        self._start = 0  # Posición de la muestra más antigua
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Añadir una muestra, sobrescribiendo la más antigua si el búfer está lleno."""
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def values(self, last=None):
+        """Devuelve las últimas `last` muestras (todas por defecto) en orden cronológico."""
+        count = self._size if last is None else min(last, self._size)
+        first = (self._start + self._size - count) % self.capacity
+        if first + count <= self.capacity:
+            return self._data[first:first + count]
+        return np.concatenate((self._data[first:], self._data[:first + count - self.capacity]))
+
+    def max(self, last=None):
+        """Devuelve el valor máximo de las últimas muestras, o 0 si está vacío."""
+        values = self.values(last)
+        return float(values.max()) if len(values) else 0.0
+
+
+class PerformanceHistory:
+    """Historial de rendimiento con memoria constante: un RingBuffer por métrica."""
+
+    def __init__(self, capacity=3600, cpu_count=1):
+        self.capacity = capacity
+        self.cpu_total = RingBuffer(capacity)
+        self.cpu_per_core = RingBuffer(capacity, width=cpu_count)
+        self.memory = RingBuffer(capacity)
+        self.swap = RingBuffer(capacity)
+        self.disk_io = RingBuffer(capacity, width=2)  # Lectura, escritura (bytes/s)
+        self.net_io = RingBuffer(capacity, width=2)  # Enviados, recibidos (bytes/s)
+
+    def append(self, snapshot):
+        """Registrar un SystemSnapshot en todas las series."""
+        self.cpu_total.append(snapshot.cpu_percent)
+        if len(snapshot.per_cpu) == self.cpu_per_core.width:
+            self.cpu_per_core.append(snapshot.per_cpu)
+        self.memory.append(snapshot.memory_percent)
+        self.swap.append(snapshot.swap_percent)
+        self.disk_io.append((snapshot.disk_read_rate, snapshot.disk_write_rate))
+        self.net_io.append((snapshot.net_sent_rate, snapshot.net_recv_rate))
@@ -0,0 +1,113 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+def format_bytes(value):
+    """Formatea una cantidad de bytes con la unidad más adecuada."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}" if unit != "B" else f"{int(value)} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def contiguous_ranges(indices):
+    """Agrupa índices ordenados ascendentemente en rangos (inicio, fin) contiguos."""
+    ranges = []
+    for idx in indices:
+        if ranges and idx - ranges[-1][1] == 1:
+            ranges[-1] = (ranges[-1][0], idx)
+        else:
+            ranges.append((idx, idx))
+    return ranges
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Modelo de procesos indexado por PID que aplica solo las diferencias entre snapshots."""
+
+    # Encabezados de las columnas; la primera columna de cada fila es siempre el PID
+    COLUMNS = ["PID", "Nombre del Proceso", "Usuario", "CPU %", "Memoria (RSS)", "Memoria (USS)",
+               "Hilos", "Lectura/s", "Escritura/s"]
+
+    # Columnas con cantidades de bytes y con tasas en bytes por segundo
+    BYTE_COLUMNS = {4, 5}
+    RATE_COLUMNS = {7, 8}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # Filas como tuplas inmutables, en el orden del modelo
+        self._row_by_pid = {}  # PID -> índice de fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return self.format_value(index.column(), value)
+        if role == Qt.UserRole:
+            # Valor crudo para que el proxy ordene numéricamente
+            return -1 if value is None else value
+        if role == Qt.TextAlignmentRole and index.column() != 1 and index.column() != 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def format_value(self, column, value):
+        """Devuelve el texto a mostrar para un valor de la columna dada."""
+        if value is None:
+            return "-"
+        if column == 3:
+            return f"{value:.1f}"
+        if column in self.BYTE_COLUMNS:
+            return format_bytes(value)
+        if column in self.RATE_COLUMNS:
+            return f"{format_bytes(value)}/s"
+        return str(value)
+
+    def pid_at(self, row):
+        """Devuelve el PID de la fila indicada."""
+        return self._rows[row][0]
+
+    def update_processes(self, processes):
+        """Aplicar un nuevo snapshot emitiendo solo inserciones, eliminaciones y cambios."""
+        new_rows = {row[0]: row for row in processes}
+
+        # 1. Eliminar los procesos que ya no existen, agrupando filas contiguas
+        removed = sorted(self._row_by_pid[pid] for pid in self._row_by_pid if pid not in new_rows)
+        # De abajo hacia arriba para que los índices pendientes sigan siendo válidos
+        for first, last in reversed(contiguous_ranges(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+        if removed:
+            self._row_by_pid = {row[0]: idx for idx, row in enumerate(self._rows)}
+
+        # 2. Actualizar en sitio las filas que cambiaron
+        changed = []
+        for idx, row in enumerate(self._rows):
+            new_row = new_rows[row[0]]
+            if new_row != row:
+                self._rows[idx] = new_row
+                changed.append(idx)
+        last_column = len(self.COLUMNS) - 1
+        for first, last in contiguous_ranges(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column))
+
+        # 3. Añadir al final los procesos nuevos en una sola inserción
+        added = [row for pid, row in new_rows.items() if pid not in self._row_by_pid]
+        if added:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for idx, row in enumerate(added, start=first):
+                self._rows.append(row)
+                self._row_by_pid[row[0]] = idx
+            self.endInsertRows()
@@ -0,0 +1,344 @@
+import itertools
+import json
+import os
+import time
+import weakref
+
+import psutil
+import shiboken6
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+# Diarios de recuperación de los editores con cambios sin guardar
+RECOVERY_DIR = "data/cache/recovery"
+
+# Espera (ms) sin escribir antes de guardar un parche, y espera máxima escribiendo sin pausa
+AUTOSAVE_DELAY = 2000
+AUTOSAVE_MAX_DELAY = 10000
+
+# El diario se compacta (una instantánea en lugar de muchos parches) cuando supera
+# este tamaño y el doble del documento, así el costo de compactar queda amortizado
+COMPACT_MIN_BYTES = 1024 * 1024
+
+_journal_numbers = itertools.count(1)
+
+# Diarios de los editores vivos en este proceso (ruta -> RecoveryJournal)
+_live_journals = weakref.WeakValueDictionary()
+
+
+def pid_alive(pid):
+    """Indica si el proceso sigue en ejecución (su diario no está huérfano).
+
+    No se usa os.kill(pid, 0): en Windows termina el proceso en lugar de consultarlo.
+    """
+    return psutil.pid_exists(pid)
+
+
+def journal_in_use(path):
+    """Indica si el diario pertenece a un editor que sigue abierto en este proceso."""
+    journal = _live_journals.get(path)
+    return journal is not None and shiboken6.isValid(journal)
+
+
+def orphaned_journals():
+    """Diarios con cambios sin guardar de editores que ya no existen, del más reciente al más antiguo."""
+    try:
+        names = os.listdir(RECOVERY_DIR)
+    except OSError:
+        return []
+    journals = []
+    for name in names:
+        pid, _, rest = name.partition("-")
+        if not rest.endswith(".journal") or not pid.isdigit():
+            continue
+        path = os.path.join(RECOVERY_DIR, name)
+        if (int(pid) == os.getpid() and not journal_in_use(path)) or not pid_alive(int(pid)):
+            try:
+                journals.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+    return [path for _, path in sorted(journals, reverse=True)]
+
+
+def read_journal(path):
+    """Devuelve los registros del diario; una última línea a medias (caída al escribir) se ignora."""
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+    except OSError:
+        pass
+    return records
+
+
+def journal_base_changed(header):
+    """Indica si el archivo del que partió el diario cambió en disco desde entonces."""
+    path = header.get("path")
+    if header.get("lines") is not None or not path:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return True
+    return (stat.st_mtime_ns, stat.st_size) != (header.get("mtime_ns"), header.get("size"))
+
+
+def rebuild_lines(records):
+    """Reconstruir las líneas del documento: el texto base más los parches en orden."""
+    header = records[0]
+    lines = header.get("lines")
+    if lines is None:
+        lines = [""]
+        if header.get("path"):
+            with open(header["path"], "r", encoding="utf-8", errors="replace", newline=None) as file:
+                lines = file.read().split("\n")
+    for record in records[1:]:
+        first = record["first"]
+        lines[first:first + record["removed"]] = record["lines"]
+    return lines
+
+
+def base_header(path, lines=None):
+    """Registro inicial del diario: el archivo del que se parte o una instantánea de las líneas."""
+    header = {"type": "base", "path": path, "lines": lines}
+    if path and lines is None:
+        try:
+            stat = os.stat(path)
+            header.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        except OSError:
+            pass
+    return header
+
+
+def compacted_records(path):
+    """Registros que reemplazan al diario: una instantánea con el resultado de aplicar sus parches.
+
+    Devuelve None si no conviene compactar: el diario es ilegible o el archivo base
+    cambió en disco (la instantánea no reproduciría lo que escribió el usuario).
+    """
+    records = read_journal(path)
+    if not records or records[0].get("type") != "base" or journal_base_changed(records[0]):
+        return None
+    try:
+        lines = rebuild_lines(records)
+    except (KeyError, TypeError):
+        return None
+    return [base_header(records[0].get("path"), lines)]
+
+
+class JournalSignals(QObject):
+    written = Signal(object, str)  # tamaño del diario tras escribir (o None), mensaje de error
+
+
+class JournalWriteTask(QRunnable):
+    """Tarea del pool de hilos que escribe en el diario.
+
+    `mode` es "a" (añadir parches), "w" (reescribir por completo, con reemplazo
+    atómico), "compact" (reescribirlo como una instantánea reconstruida desde el
+    propio diario) o "delete" (borrar el diario).
+    """
+
+    def __init__(self, signals, path, mode, records):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.mode = mode
+        self.records = records
+
+    def run(self):
+        size = None
+        error = ""
+        try:
+            mode, records = self.mode, self.records
+            if mode == "compact":
+                # Se reconstruye aquí y no desde el documento: copiarlo bloquearía la interfaz
+                mode, records = "w", compacted_records(self.path)
+            if mode == "delete":
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            elif records is not None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                target = self.path if mode == "a" else f"{self.path}.tmp"
+                with open(target, mode, encoding="utf-8") as file:
+                    for record in records:
+                        file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+                if target != self.path:
+                    os.replace(target, self.path)
+            if mode != "delete":
+                size = os.path.getsize(self.path)
+        except OSError as e:
+            error = str(e)
+        try:
+            self.signals.written.emit(size, error)
+        except RuntimeError:
+            # El editor se está cerrando
+            pass
+
+
+class RecoveryJournal(QObject):
+    """Diario de recuperación de un documento, escrito en segundo plano.
+
+    `contentsChange` solo amplía un rango de bloques sucios (primer bloque y bloques
+    intactos al final). Cuando se deja de escribir, las líneas de ese rango se
+    guardan como un parche que reemplaza las líneas correspondientes de la versión
+    anterior. El diario se crea con el primer cambio y se borra al guardar o al
+    reemplazar el documento; si el editor desaparece sin guardar, queda para recuperarlo.
+    """
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.path = os.path.join(RECOVERY_DIR, f"{os.getpid()}-{next(_journal_numbers)}.journal")
+        _live_journals[self.path] = self
+        self.active = False
+        self.header = None
+        self.header_written = False
+        self.block_count = 0  # Bloques de la versión sobre la que se aplica el próximo parche
+        self.last_count = 0  # Bloques tras el último cambio registrado
+        self.dirty_first = None
+        self.dirty_tail = None
+        self.size = 0
+        self.compact_size = 0  # Tamaño mínimo para volver a compactar
+        self.operations = []  # (ruta, modo, registros) pendientes, en orden
+        self.writing = False
+        self.error = ""
+
+        self._signals = JournalSignals(self)
+        self._signals.written.connect(self.on_written)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+        self.first_change = None
+        document.contentsChange.connect(self.on_contents_change)
+
+    def start(self, path, lines=None):
+        """Empezar un diario nuevo partiendo de `path` (o de `lines`) y descartar el anterior."""
+        self.discard()
+        self.active = True
+        self.header = base_header(path, lines)
+        self.block_count = self.last_count = self.document.blockCount()
+
+    def stop(self):
+        """Dejar de registrar cambios (p. ej. mientras se carga otro archivo)."""
+        self.active = False
+        self.timer.stop()
+        self.first_change = None
+        self.dirty_first = self.dirty_tail = None
+
+    def discard(self):
+        """Dejar de registrar cambios y borrar el diario."""
+        self.stop()
+        if self.header_written:
+            self.queue("delete", [])
+            self.header_written = False
+        self.size = 0
+        self.compact_size = 0
+
+    def write_snapshot(self, path, lines):
+        """Escribir ya un diario con `lines` como base (tras restaurar, para no perderlas si hay otra caída)."""
+        self.start(path, lines)
+        self.queue("w", [self.header])
+        self.header_written = True
+
+    def on_contents_change(self, position, removed, added):
+        if not self.active:
+            return
+        document = self.document
+        count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(min(position + added, document.characterCount() - 1)).blockNumber()
+        tail = count - 1 - last
+
+        if self.dirty_first is not None:
+            # Un cambio lejos del rango sucio (p. ej. tras saltar a otra línea) no lo amplía:
+            # el rango anterior, que este cambio no tocó, se guarda como un parche aparte
+            previous_end = self.last_count - self.dirty_tail
+            shifted_first = count - (self.last_count - self.dirty_first)
+            if first > previous_end:
+                self.flush_range(self.dirty_first, previous_end, self.last_count)
+            elif last < shifted_first - 1:
+                self.flush_range(shifted_first, count - self.dirty_tail, self.last_count)
+        self.last_count = count
+
+        # Solo se amplía el rango: leer las líneas se deja para cuando se guarde el parche
+        self.dirty_first = first if self.dirty_first is None else min(self.dirty_first, first)
+        self.dirty_tail = tail if self.dirty_tail is None else min(self.dirty_tail, tail)
+
+        now = time.monotonic()
+        if self.first_change is None:
+            self.first_change = now
+        # Escribiendo sin pausa tampoco se pospone más allá de AUTOSAVE_MAX_DELAY
+        if (now - self.first_change) * 1000 < AUTOSAVE_MAX_DELAY or not self.timer.isActive():
+            self.timer.start(AUTOSAVE_DELAY)
+
+    def on_timeout(self):
+        self.first_change = None
+        self.flush()
+
+    def flush(self):
+        """Pasar el rango sucio a un parche y encolarlo para escribirlo en segundo plano."""
+        if self.dirty_first is None:
+            return
+        count = self.document.blockCount()
+        self.flush_range(self.dirty_first, max(self.dirty_first, count - self.dirty_tail), count)
+
+    def flush_range(self, start, end, block_count):
+        """Guardar como parche las líneas [start, end) del documento actual.
+
+        El parche se expresa sobre la versión anterior (`self.block_count` bloques);
+        `block_count` es el número de bloques de la versión que resulta de aplicarlo.
+        """
+        lines = []
+        block = self.document.findBlockByNumber(start)
+        for _ in range(end - start):
+            lines.append(block.text())
+            block = block.next()
+        first = self.dirty_first
+        record = {"type": "patch", "first": first, "removed": max(0, self.block_count - self.dirty_tail - first),
+                  "lines": lines}
+        self.block_count = block_count
+        self.dirty_first = self.dirty_tail = None
+
+        if self.header_written:
+            self.queue("a", [record])
+        else:
+            self.queue("w", [self.header, record])
+            self.header_written = True
+
+    def queue(self, mode, records):
+        self.operations.append((self.path, mode, records))
+        self.run_next()
+
+    def run_next(self):
+        # Una sola escritura a la vez, para que los parches lleguen en orden
+        if self.writing or not self.operations:
+            return
+        self.writing = True
+        path, mode, records = self.operations.pop(0)
+        QThreadPool.globalInstance().start(JournalWriteTask(self._signals, path, mode, records))
+
+    def on_written(self, size, error):
+        self.writing = False
+        self.error = error
+        if size is not None:
+            self.size = size
+            self.compact_if_needed()
+        self.run_next()
+
+    def compact_if_needed(self):
+        """Reemplazar los parches por una instantánea si el diario creció demasiado.
+
+        La instantánea se reconstruye en el hilo de escritura a partir del diario;
+        los parches encolados después se añaden sobre ella.
+        """
+        threshold = max(COMPACT_MIN_BYTES, 2 * self.document.characterCount(), self.compact_size)
+        if not self.active or self.operations or self.size < threshold:
+            return
+        # Si no se pudo compactar (p. ej. el archivo base cambió) no se reintenta hasta que el diario se duplique
+        self.compact_size = 2 * self.size
+        self.queue("compact", [])
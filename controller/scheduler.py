@@ -0,0 +1,149 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, QEvent, Qt
+
+
+class Subscription:
+    """Suscripción de un widget a los ticks del planificador."""
+
+    def __init__(self, widget, callback, interval):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.next_due = 0.0
+        # Objetos a los que se instala el filtro de eventos: el widget y su ventana
+        self.targets = tuple(dict.fromkeys((widget, widget.window())))
+
+    def is_active(self):
+        """Un suscriptor solo trabaja si su ventana está visible y no minimizada."""
+        try:
+            return self.widget.isVisible() and not self.widget.window().isMinimized()
+        except RuntimeError:
+            # El objeto de Qt ya fue destruido
+            return False
+
+
+class TickScheduler(QObject):
+    """Planificador central: un único QTimer que reparte ticks a los widgets visibles.
+
+    Los suscriptores ocultos o minimizados no reciben ticks y, si no queda ninguno
+    activo, el temporizador se detiene por completo.
+    """
+
+    def __init__(self, resolution=1000, parent=None):
+        super().__init__(parent)
+        self.resolution = resolution
+        self.subscriptions = []
+        self.watched = {}  # Widget o ventana con el filtro de eventos instalado -> suscripciones que lo usan
+        self.destroyed_handlers = {}  # Widget suscrito -> manejador conectado a su `destroyed`
+
+        self.timer = QTimer(self)
+        # Un temporizador "grueso" permite al sistema agrupar despertares
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.timeout.connect(self.tick)
+
+    def subscribe(self, widget, callback, interval=1000):
+        """Ejecutar `callback` cada `interval` ms mientras `widget` esté visible."""
+        subscription = Subscription(widget, callback, max(interval, self.resolution) / 1000)
+        self.subscriptions.append(subscription)
+
+        for target in subscription.targets:
+            if target not in self.watched:
+                target.installEventFilter(self)
+            self.watched[target] = self.watched.get(target, 0) + 1
+        if widget not in self.destroyed_handlers:
+            handler = self.destroyed_handlers[widget] = lambda *_: self.on_widget_destroyed(widget)
+            widget.destroyed.connect(handler)
+
+        self.update_timer()
+        return subscription
+
+    def unsubscribe(self, widget, callback=None):
+        """Eliminar las suscripciones de un widget (o solo la de `callback`).
+
+        Cuando el widget se queda sin suscripciones se quitan sus filtros de eventos y el
+        manejador de `destroyed`, para que el planificador no lo retenga.
+        """
+        kept = []
+        for sub in self.subscriptions:
+            if sub.widget is widget and (callback is None or sub.callback == callback):
+                self.release_targets(sub)
+            else:
+                kept.append(sub)
+        self.subscriptions = kept
+
+        if not any(sub.widget is widget for sub in kept):
+            handler = self.destroyed_handlers.pop(widget, None)
+            if handler is not None:
+                try:
+                    widget.destroyed.disconnect(handler)
+                except (RuntimeError, TypeError):
+                    # El widget ya se está destruyendo
+                    pass
+        self.update_timer()
+
+    def release_targets(self, subscription):
+        """Quitar el filtro de eventos de los objetos que ya no usa ninguna suscripción."""
+        for target in subscription.targets:
+            count = self.watched.get(target, 0) - 1
+            if count > 0:
+                self.watched[target] = count
+                continue
+            self.watched.pop(target, None)
+            try:
+                target.removeEventFilter(self)
+            except RuntimeError:
+                # El objeto de Qt ya fue destruido
+                pass
+
+    def on_widget_destroyed(self, widget):
+        """Limpiar las suscripciones de un widget destruido."""
+        try:
+            self.unsubscribe(widget)
+        except RuntimeError:
+            # Al cerrar la aplicación el planificador puede destruirse antes que el widget
+            pass
+
+    def eventFilter(self, watched, event):
+        """Reactivar o suspender el temporizador según la visibilidad de las ventanas."""
+        if event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+            # Se difiere para que el cambio de estado ya esté aplicado al evaluarlo
+            QTimer.singleShot(0, self.update_timer)
+        return False
+
+    def update_timer(self):
+        """Arrancar el temporizador solo si hay algún suscriptor activo."""
+        active = [sub for sub in self.subscriptions if sub.is_active()]
+        if not active:
+            self.timer.stop()
+            return
+
+        if not self.timer.isActive():
+            # Al volver a estar visibles, los suscriptores se actualizan de inmediato
+            self.tick()
+            self.timer.start(self.resolution)
+
+    def tick(self):
+        """Ejecutar los callbacks vencidos de los suscriptores activos."""
+        now = time.monotonic()
+        any_active = False
+        for sub in list(self.subscriptions):
+            if not sub.is_active():
+                continue
+            any_active = True
+            if now >= sub.next_due:
+                sub.next_due = now + sub.interval - 0.05  # Margen ante la deriva del temporizador
+                sub.callback()
+        if not any_active:
+            self.timer.stop()
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """Devuelve el planificador compartido por toda la aplicación."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TickScheduler()
+    return _scheduler
@@ -0,0 +1,341 @@
+import os
+import sqlite3
+import time
+from typing import NamedTuple
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, Signal
+
+# Un índice SQLite por usuario (fuera de su carpeta para que Docs no lo muestre)
+INDEX_DIR = "data/cache/search"
+
+# Solo se indexa el contenido de archivos de texto de hasta este tamaño
+MAX_CONTENT_BYTES = 1024 * 1024
+TEXT_EXTENSIONS = {
+    ".txt", ".md", ".csv", ".json", ".log", ".py", ".html", ".htm", ".xml", ".ini", ".cfg",
+    ".yaml", ".yml", ".js", ".css", ".sql", ".rst", ".tex",
+}
+
+# Espera (ms) tras un cambio en disco antes de reindexar las carpetas afectadas
+INDEX_DEBOUNCE = 500
+
+# Límite de carpetas vigiladas (inotify tiene un máximo por usuario)
+MAX_WATCHED_DIRS = 2048
+
+# Archivos procesados entre confirmaciones, para que las búsquedas vean el progreso
+COMMIT_EVERY = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_parent ON files(parent);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, tokenize='trigram');
+CREATE VIRTUAL TABLE IF NOT EXISTS contents USING fts5(body);
+"""
+
+
+class SearchResult(NamedTuple):
+    """Resultado de una búsqueda; `snippet` es el fragmento del contenido o ""."""
+    path: str
+    name: str
+    is_dir: bool
+    snippet: str
+
+
+def index_path(user_id):
+    """Ruta del índice de búsqueda de un usuario."""
+    return os.path.join(INDEX_DIR, f"{user_id}.db")
+
+
+def open_index(db_path):
+    """Abrir (y crear si hace falta) la base de datos del índice."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    connection = sqlite3.connect(db_path, timeout=5)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def read_text(path, size):
+    """Devuelve el contenido de un archivo de texto a indexar, o None si no corresponde."""
+    if size > MAX_CONTENT_BYTES or os.path.splitext(path)[1].lower() not in TEXT_EXTENSIONS:
+        return None
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if b"\0" in data[:1024]:
+        return None  # Binario con extensión de texto
+    return data.decode("utf-8", errors="replace")
+
+
+def fts_phrase(text):
+    """Citar un texto para usarlo literalmente en una consulta FTS5."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class IndexWriter:
+    """Actualiza el índice comparando el disco con lo indexado (mtime y tamaño).
+
+    Se usa desde un hilo de trabajo con su propia conexión.
+    """
+
+    def __init__(self, root, db_path):
+        self.root = root
+        self.connection = open_index(db_path)
+        self.indexed = 0  # Entradas nuevas o modificadas
+        self.removed = 0
+        self.pending = 0
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def update(self, directories=None):
+        """Reindexar todo el árbol (None) o solo las carpetas indicadas (rutas relativas)."""
+        if directories is None:
+            self.index_directory("", recursive=True)
+        else:
+            for directory in sorted(directories):
+                self.index_directory(directory, recursive=False)
+        self.connection.commit()
+
+    def index_directory(self, directory, recursive):
+        """Sincronizar las entradas de una carpeta; las subcarpetas nuevas se indexan completas."""
+        absolute = os.path.join(self.root, directory)
+        existing = {
+            row[0]: row[1:] for row in self.connection.execute(
+                "SELECT path, id, is_dir, mtime_ns, size FROM files WHERE parent = ?", (directory,)
+            )
+        }
+        try:
+            entries = list(os.scandir(absolute))
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            path = os.path.join(directory, entry.name) if directory else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            known = existing.pop(path, None)
+            changed = known is None or known[1:] != (int(is_dir), stat.st_mtime_ns, stat.st_size)
+            if changed:
+                if known is not None:
+                    self.delete_ids([known[0]])
+                self.insert(path, directory, entry.name, is_dir, stat, entry.path)
+            if is_dir and (recursive or known is None):
+                self.index_directory(path, recursive)
+
+        # Lo que ya no está en disco (con todo su contenido, si era una carpeta)
+        for path, (file_id, is_dir, _, _) in existing.items():
+            ids = [file_id]
+            if is_dir:
+                # Descendientes: rutas entre "carpeta<sep>" y "carpeta<carácter siguiente a sep>"
+                # (las rutas se guardan con os.path.join, así que el separador es el del sistema)
+                ids += [row[0] for row in self.connection.execute(
+                    "SELECT id FROM files WHERE path >= ? AND path < ?", (path + os.sep, path + chr(ord(os.sep) + 1))
+                )]
+            self.delete_ids(ids)
+            self.removed += len(ids)
+
+    def insert(self, path, parent, name, is_dir, stat, absolute):
+        cursor = self.connection.execute(
+            "INSERT INTO files (path, parent, name, is_dir, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, parent, name, int(is_dir), stat.st_mtime_ns, stat.st_size),
+        )
+        file_id = cursor.lastrowid
+        self.connection.execute("INSERT INTO names (rowid, name) VALUES (?, ?)", (file_id, name))
+        if not is_dir:
+            body = read_text(absolute, stat.st_size)
+            if body:
+                self.connection.execute("INSERT INTO contents (rowid, body) VALUES (?, ?)", (file_id, body))
+        self.indexed += 1
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.connection.commit()
+            self.pending = 0
+
+    def delete_ids(self, ids):
+        for file_id in ids:
+            self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            self.connection.execute("DELETE FROM names WHERE rowid = ?", (file_id,))
+            self.connection.execute("DELETE FROM contents WHERE rowid = ?", (file_id,))
+
+
+class SearchIndex:
+    """Consultas sobre el índice de un usuario: nombres (trigramas) y contenido (FTS5)."""
+
+    def __init__(self, root, db_path):
+        self.root = root
+        self.connection = open_index(db_path)
+
+    def search(self, text, limit=100):
+        """Buscar `text` en nombres y en contenido; primero las coincidencias por nombre."""
+        text = text.strip()
+        if not text:
+            return []
+
+        if len(text) >= 3:
+            # El tokenizador de trigramas resuelve subcadenas con el índice
+            rows = self.connection.execute(
+                "SELECT f.path, f.name, f.is_dir FROM names JOIN files f ON f.id = names.rowid "
+                "WHERE names MATCH ? LIMIT ?", (fts_phrase(text), limit),
+            ).fetchall()
+        else:
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = self.connection.execute(
+                "SELECT path, name, is_dir FROM files WHERE name LIKE ? ESCAPE '\\' LIMIT ?", (pattern, limit),
+            ).fetchall()
+        results = [SearchResult(os.path.join(self.root, path), name, bool(is_dir), "") for path, name, is_dir in rows]
+
+        remaining = limit - len(results)
+        if remaining > 0:
+            seen = {result.path for result in results}
+            # Cada palabra como prefijo: "inform" encuentra "informe"
+            query = " ".join(fts_phrase(word) + "*" for word in text.split())
+            try:
+                rows = self.connection.execute(
+                    "SELECT f.path, f.name, snippet(contents, 0, '[', ']', '…', 8) "
+                    "FROM contents JOIN files f ON f.id = contents.rowid WHERE contents MATCH ? LIMIT ?",
+                    (query, remaining + len(seen)),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+            for path, name, snippet in rows:
+                absolute = os.path.join(self.root, path)
+                if absolute not in seen and len(results) < limit:
+                    results.append(SearchResult(absolute, name, False, snippet))
+        return results
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+class IndexSignals(QObject):
+    finished = Signal(int, int, float)  # entradas indexadas, eliminadas, segundos
+
+
+class IndexTask(QRunnable):
+    """Tarea del pool de hilos que actualiza el índice (todo el árbol o algunas carpetas)."""
+
+    def __init__(self, signals, root, db_path, directories=None):
+        super().__init__()
+        self.signals = signals
+        self.root = root
+        self.db_path = db_path
+        self.directories = directories
+
+    def run(self):
+        start = time.perf_counter()
+        writer = IndexWriter(self.root, self.db_path)
+        try:
+            writer.update(self.directories)
+        except sqlite3.Error as e:
+            print(f"Error al actualizar el índice de búsqueda: {e}")
+        finally:
+            writer.close()
+        try:
+            self.signals.finished.emit(writer.indexed, writer.removed, time.perf_counter() - start)
+        except RuntimeError:
+            # La aplicación se está cerrando
+            pass
+
+
+class SearchService(QObject):
+    """Índice de búsqueda de la carpeta de un usuario, mantenido al día en segundo plano.
+
+    Al crearse hace una pasada incremental completa (recupera lo cambiado con la
+    aplicación cerrada); después, los cambios que informa QFileSystemWatcher se
+    agrupan y se reindexan solo las carpetas afectadas.
+    """
+    index_updated = Signal()
+
+    def __init__(self, root, db_path, parent=None):
+        super().__init__(parent)
+        self.root = os.path.abspath(root)
+        self.db_path = db_path
+        self.index = SearchIndex(self.root, db_path)
+        self.running = False
+        self.full_scan_pending = True
+        self.dirty = set()  # Carpetas (relativas) a reindexar
+
+        self.signals = IndexSignals(self)
+        self.signals.finished.connect(self.on_index_finished)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(INDEX_DEBOUNCE)
+        self.debounce.timeout.connect(self.start_update)
+        self.start_update()
+
+    def search(self, text, limit=100):
+        return self.index.search(text, limit)
+
+    def start_update(self):
+        """Lanzar la actualización pendiente si no hay otra en curso."""
+        if self.running or not (self.full_scan_pending or self.dirty):
+            return
+        directories = None if self.full_scan_pending else set(self.dirty)
+        self.full_scan_pending = False
+        self.dirty.clear()
+        self.running = True
+        QThreadPool.globalInstance().start(IndexTask(self.signals, self.root, self.db_path, directories))
+
+    def on_index_finished(self, indexed, removed, seconds):
+        self.running = False
+        # Lo creado en una carpeta entre su indexado y el inicio de su vigilancia no generó
+        # aviso: las carpetas recién vigiladas se repasan una vez (sin recursión)
+        for path in self.watch_directories():
+            relative = os.path.relpath(path, self.root)
+            self.dirty.add("" if relative == "." else relative)
+        if indexed or removed:
+            self.index_updated.emit()
+        self.start_update()
+
+    def watch_directories(self):
+        """Vigilar las carpetas indexadas (hasta MAX_WATCHED_DIRS, las menos profundas primero).
+
+        Devuelve las carpetas que se empezaron a vigilar.
+        """
+        watched = set(self.watcher.directories())
+        directories = [self.root] + [
+            os.path.join(self.root, row[0]) for row in self.index.connection.execute(
+                "SELECT path FROM files WHERE is_dir = 1 ORDER BY length(path) LIMIT ?", (MAX_WATCHED_DIRS - 1,)
+            )
+        ]
+        missing = [directory for directory in directories if directory not in watched]
+        if not missing:
+            return []
+        failed = set(self.watcher.addPaths(missing))
+        return [directory for directory in missing if directory not in failed]
+
+    def on_directory_changed(self, path):
+        relative = os.path.relpath(path, self.root)
+        self.dirty.add("" if relative == "." else relative)
+        self.debounce.start()
+
+
+_search_services = {}
+
+
+def get_search_service(user_id):
+    """Devuelve el servicio de búsqueda de un usuario (uno por usuario en toda la aplicación)."""
+    user_id = str(user_id)
+    service = _search_services.get(user_id)
+    if service is None:
+        root = os.path.join(os.getcwd(), "data", "docs", user_id)
+        service = SearchService(root, index_path(user_id))
+        _search_services[user_id] = service
+    return service
@@ -0,0 +1,78 @@
+from typing import NamedTuple
+
+import psutil
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+
+class BatteryStatus(NamedTuple):
+    """Estado de la batería; se compara por valor para detectar cambios."""
+    percent: int
+    power_plugged: bool
+
+
+def format_battery(status):
+    """Devuelve el texto a mostrar para un estado de batería (o su ausencia)."""
+    if status is None:
+        # Si no se puede obtener el estado de la batería (por ejemplo, en un escritorio)
+        return "Battery: N/A"
+    if status.power_plugged:
+        return f"Battery: {status.percent}% (Charging)"
+    return f"Battery: {status.percent}%"
+
+
+class SensorService(QObject):
+    """Servicio compartido de sensores que notifica solo cuando cambia el valor.
+
+    La batería se sondea cada 30 s conectada a la corriente, cada 5 s con batería
+    y nunca si el equipo no tiene batería.
+    """
+    battery_changed = Signal(object)  # BatteryStatus o None
+
+    AC_INTERVAL = 30000
+    BATTERY_INTERVAL = 5000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.timeout.connect(self.poll_battery)
+
+        # Sondeo inicial: si no hay batería no se vuelve a consultar
+        self.battery = self.read_battery()
+        self.schedule_battery_poll()
+
+    def read_battery(self):
+        """Leer el estado actual de la batería."""
+        try:
+            battery = psutil.sensors_battery()
+        except (AttributeError, NotImplementedError, OSError):
+            battery = None
+        if battery is None:
+            return None
+        return BatteryStatus(int(battery.percent), bool(battery.power_plugged))
+
+    def poll_battery(self):
+        """Consultar la batería y emitir la señal solo si el estado cambió."""
+        status = self.read_battery()
+        if status != self.battery:
+            self.battery = status
+            self.battery_changed.emit(status)
+        self.schedule_battery_poll()
+
+    def schedule_battery_poll(self):
+        """Programar el siguiente sondeo según la fuente de energía."""
+        if self.battery is None:
+            return
+        self.timer.start(self.AC_INTERVAL if self.battery.power_plugged else self.BATTERY_INTERVAL)
+
+
+_sensor_service = None
+
+
+def get_sensor_service():
+    """Devuelve el servicio de sensores compartido por toda la aplicación."""
+    global _sensor_service
+    if _sensor_service is None:
+        _sensor_service = SensorService()
+    return _sensor_service
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+
+# Número máximo de sesiones suspendidas que se mantienen en memoria
+MAX_SUSPENDED_SESSIONS = 3
+
+
+class SessionManager:
+    """Mantiene en memoria el escritorio de cada usuario con la sesión iniciada.
+
+    Cambiar de usuario oculta el escritorio actual en lugar de destruirlo, así que
+    volver a él conserva las aplicaciones abiertas y su estado. Las sesiones
+    suspendidas se ordenan por uso y se cierran las menos recientes al superar
+    `max_suspended`.
+    """
+
+    def __init__(self, max_suspended=MAX_SUSPENDED_SESSIONS):
+        self.max_suspended = max_suspended
+        self.sessions = OrderedDict()  # Nombre de usuario -> Desktop (el último es el más reciente)
+        self.active_username = None
+        self.login_window = None
+
+    def activate(self, username, user_id):
+        """Mostrar el escritorio del usuario, reanudando su sesión si ya existía."""
+        desktop = self.sessions.get(username)
+        if desktop is None:
+            from controller.desktop import Desktop  # Importar aquí: la pantalla de login no lo necesita
+            desktop = Desktop(username, user_id)
+            desktop.setAttribute(Qt.WA_DeleteOnClose)
+            # Si se cierra la ventana del escritorio, la sesión termina
+            desktop.destroyed.connect(lambda *_: self.forget(username, desktop))
+            self.sessions[username] = desktop
+
+        previous = self.active_username
+        self.sessions.move_to_end(username)
+        self.active_username = username
+        desktop.resume()
+        if previous is not None and previous != username and previous in self.sessions:
+            self.sessions[previous].suspend()
+        self.evict()
+        return desktop
+
+    def switch_user(self):
+        """Suspender la sesión activa y volver a la pantalla de login."""
+        username = self.active_username
+        self.active_username = None
+        self.show_login()
+        if username in self.sessions:
+            self.sessions[username].suspend()
+        self.evict()
+
+    def logout(self, username):
+        """Cerrar la sesión del usuario y liberar su escritorio."""
+        if username == self.active_username:
+            self.active_username = None
+            self.show_login()
+        desktop = self.sessions.pop(username, None)
+        if desktop is not None:
+            desktop.end_session()
+
+    def forget(self, username, desktop):
+        """Olvidar una sesión cuyo escritorio fue destruido."""
+        if self.sessions.get(username) is desktop:
+            del self.sessions[username]
+        if self.active_username == username:
+            self.active_username = None
+
+    def suspended_usernames(self):
+        """Devuelve los usuarios con sesión suspendida, del menos al más reciente."""
+        return [username for username in self.sessions if username != self.active_username]
+
+    def evict(self):
+        """Cerrar las sesiones suspendidas menos recientes que superan el límite."""
+        suspended = self.suspended_usernames()
+        for username in suspended[:max(0, len(suspended) - self.max_suspended)]:
+            self.logout(username)
+
+    def show_login(self):
+        """Volver a mostrar la pantalla de login (creándola si ya no existe)."""
+        if self.login_window is None:
+            from controller.login import LoginWindow
+            self.login_window = LoginWindow()
+        self.login_window.reset()
+        self.login_window.show()
+        self.login_window.raise_()
+
+
+_session_manager = None
+
+
+def get_session_manager():
+    """Devuelve el gestor de sesiones compartido por toda la aplicación."""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager()
+    return _session_manager
@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+
+SQLITE_PATH = './data/dataBaseUser/users.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    raw_id,
+    id_num INTEGER,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'user',
+    extra TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_user_id ON users(user_id);
+CREATE INDEX IF NOT EXISTS users_id_num ON users(id_num);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Campos con columna propia; el resto se guarda como JSON en `extra`
+CORE_FIELDS = ("id", "password", "role")
+
+
+def _id_number(user_id):
+    """Devuelve el ID como entero si es numérico (para calcular el siguiente ID), o None."""
+    text = str(user_id)
+    return int(text) if text.isdigit() else None
+
+
+class SqliteUserRepository:
+    """Motor de almacenamiento SQLite con la misma interfaz que UserRepository.
+
+    Índices únicos por nombre de usuario e ID, modo WAL para lectores concurrentes
+    y cada modificación confirmada en su propia transacción.
+    """
+
+    def __init__(self, path=SQLITE_PATH, json_path=None):
+        self.path = path
+        self.load_error = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        if json_path:
+            self.migrate_from_json(json_path)
+
+    def migrate_from_json(self, json_path):
+        """Importar users.json una sola vez; las siguientes llamadas no hacen nada."""
+        migrated = self.connection.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+        if migrated or not os.path.exists(json_path):
+            return False
+        try:
+            with open(json_path, 'r') as file:
+                content = file.read().strip()
+            users = json.loads(content) if content else {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error loading user database: {e}")
+            self.load_error = e
+            return False
+
+        # Dos cuentas con el mismo ID no caben en la tabla: se aborta sin importar ninguna,
+        # así ninguna se pierde y la migración se reintenta cuando se corrija users.json
+        owners = {}
+        for username, user in users.items():
+            owners.setdefault(str(user.get("id")), []).append(username)
+        duplicates = [f"{user_id}: {', '.join(names)}" for user_id, names in owners.items() if len(names) > 1]
+        if duplicates:
+            self.load_error = ValueError(f"IDs de usuario repetidos en {json_path} ({'; '.join(duplicates)})")
+            print(f"Error migrating user database: {self.load_error}")
+            return False
+
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO users (username, user_id, raw_id, id_num, password, role, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self._row_values(username, user) for username, user in users.items()),
+                )
+                self.connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (os.path.abspath(json_path),)
+                )
+        except sqlite3.IntegrityError as e:
+            # Choca con usuarios que ya estaban en la base de datos; la transacción se deshace entera
+            print(f"Error migrating user database: {e}")
+            self.load_error = e
+            return False
+        return True
+
+    def _row_values(self, username, user):
+        """Convertir los datos de un usuario en los valores de una fila."""
+        extra = {key: value for key, value in user.items() if key not in CORE_FIELDS}
+        return (
+            username,
+            str(user.get("id")),
+            user.get("id"),
+            _id_number(user.get("id")),
+            user.get("password", ""),
+            user.get("role", "user"),
+            json.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _row_to_user(row):
+        """Convertir una fila (raw_id, password, role, extra) en el diccionario del usuario."""
+        raw_id, password, role, extra = row
+        user = {"id": raw_id, "password": password, "role": role}
+        if extra:
+            user.update(json.loads(extra))
+        return user
+
+    def refresh(self):
+        """SQLite siempre lee el estado actual; se mantiene por compatibilidad."""
+
+    def flush(self):
+        """Cada modificación ya se confirma en su transacción; se mantiene por compatibilidad."""
+
+    def usernames(self):
+        return [row[0] for row in self.connection.execute("SELECT username FROM users ORDER BY rowid")]
+
+    def first_username(self):
+        row = self.connection.execute("SELECT username FROM users ORDER BY rowid LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def get(self, username):
+        row = self.connection.execute(
+            "SELECT raw_id, password, role, extra FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def get_by_id(self, user_id):
+        row = self.connection.execute("SELECT username FROM users WHERE user_id = ?", (str(user_id),)).fetchone()
+        return row[0] if row else None
+
+    def exists(self, username):
+        return self.connection.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def id_exists(self, user_id):
+        return self.get_by_id(user_id) is not None
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def all(self):
+        rows = self.connection.execute("SELECT username, raw_id, password, role, extra FROM users ORDER BY rowid")
+        return {row[0]: self._row_to_user(row[1:]) for row in rows}
+
+    def create(self, username, user_id, password_hash, role=None):
+        """Crear un usuario; el primero en registrarse es administrador."""
+        with self.connection:
+            if role is None:
+                role = "admin" if self.first_username() is None else "user"
+            try:
+                self.connection.execute(
+                    "INSERT INTO users (username, user_id, raw_id, id_num, password, role, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._row_values(username, {"id": user_id, "password": password_hash, "role": role}),
+                )
+            except sqlite3.IntegrityError:
+                if self.exists(username):
+                    raise ValueError(f"User '{username}' already exists.")
+                raise ValueError(f"User ID '{user_id}' already exists.")
+
+    def update(self, username, **fields):
+        """Actualizar campos de un usuario existente."""
+        user = self.get(username)
+        if user is None:
+            raise KeyError(username)
+        user.update(fields)
+        values = self._row_values(username, user)
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE users SET user_id = ?, raw_id = ?, id_num = ?, password = ?, role = ?, extra = ? "
+                    "WHERE username = ?",
+                    values[1:] + (username,),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"User ID '{fields.get('id')}' already exists.")
+
+    def remove(self, username):
+        """Eliminar un usuario. Devuelve False si no existía."""
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM users WHERE username = ?", (username,))
+        return cursor.rowcount > 0
+
+    def replace_all(self, users):
+        """Reemplazar toda la base de datos en una sola transacción."""
+        with self.connection:
+            self.connection.execute("DELETE FROM users")
+            self.connection.executemany(
+                "INSERT INTO users (username, user_id, raw_id, id_num, password, role, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(username, user) for username, user in users.items()),
+            )
+
+    def next_user_id(self):
+        """Obtiene el próximo ID numérico disponible (usa el índice de id_num)."""
+        row = self.connection.execute("SELECT MAX(id_num) FROM users").fetchone()
+        return (row[0] or 0) + 1
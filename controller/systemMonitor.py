@@ -0,0 +1,213 @@
+import time
+from typing import NamedTuple
+
+import psutil
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class ProcessInfo(NamedTuple):
+    """Métricas de un proceso; el orden coincide con las columnas de la tabla de procesos."""
+    pid: int
+    name: str
+    username: str
+    cpu_percent: float
+    rss: int
+    uss: object  # None si no se recolecta USS
+    num_threads: int
+    io_read_rate: object  # Bytes/s, None si no está disponible
+    io_write_rate: object
+
+
+class SystemSnapshot(NamedTuple):
+    """Muestra inmutable del estado del sistema en un instante."""
+    timestamp: float
+    cpu_percent: float
+    per_cpu: tuple  # Porcentaje de uso por núcleo
+    memory_used: int
+    memory_total: int
+    memory_percent: float
+    swap_percent: float
+    disk_read_rate: float  # Bytes/s
+    disk_write_rate: float
+    net_sent_rate: float
+    net_recv_rate: float
+    processes: tuple  # Tupla de ProcessInfo
+
+
+class ProcessCollector:
+    """Recolecta las métricas de todos los procesos en una sola pasada por tick."""
+
+    ATTRS = ['pid', 'name', 'username', 'cpu_percent', 'memory_info', 'num_threads', 'io_counters']
+
+    def __init__(self, include_uss=False, process_iter=None):
+        # USS requiere leer /proc/<pid>/smaps, mucho más costoso; solo se pide si se activa
+        self.include_uss = include_uss
+        self.attrs = self.ATTRS + (['memory_full_info'] if include_uss else [])
+        self.process_iter = process_iter or psutil.process_iter
+        self._last_io = {}  # PID -> (instante, bytes leídos, bytes escritos)
+
+    def collect(self):
+        """Devuelve una tupla de ProcessInfo con una pasada de process_iter."""
+        now = time.monotonic()
+        last_io = {}
+        rows = []
+
+        # process_iter reutiliza los objetos Process en caché y aplica oneshot() por proceso,
+        # de modo que cpu_percent se calcula como delta respecto al tick anterior
+        for proc in self.process_iter(attrs=self.attrs, ad_value=None):
+            info = proc.info
+            pid = info['pid']
+
+            read_rate = write_rate = None
+            io = info['io_counters']
+            if io is not None:
+                last_io[pid] = (now, io.read_bytes, io.write_bytes)
+                previous = self._last_io.get(pid)
+                if previous is not None and now > previous[0]:
+                    elapsed = now - previous[0]
+                    read_rate = max(io.read_bytes - previous[1], 0) / elapsed
+                    write_rate = max(io.write_bytes - previous[2], 0) / elapsed
+
+            memory_info = info['memory_info']
+            full_info = info.get('memory_full_info')
+            rows.append(ProcessInfo(
+                pid=pid,
+                name=info['name'] or "",
+                username=info['username'] or "",
+                cpu_percent=info['cpu_percent'] or 0.0,
+                rss=memory_info.rss if memory_info is not None else 0,
+                uss=full_info.uss if full_info is not None else None,
+                num_threads=info['num_threads'] or 0,
+                io_read_rate=read_rate,
+                io_write_rate=write_rate,
+            ))
+
+        # Los procesos que terminaron salen del registro de E/S
+        self._last_io = last_io
+        return tuple(rows)
+
+
+class SystemSampler:
+    """Recolector con estado (deltas de CPU y E/S) que se ejecuta en hilos de trabajo.
+
+    Nunca se ejecuta en paralelo consigo mismo: SystemMonitor pide una muestra a la vez.
+    """
+
+    def __init__(self):
+        self.collector = ProcessCollector()
+        self._last_counters = None  # (instante, E/S de disco, E/S de red)
+        # La primera llamada sin intervalo solo fija la referencia para los deltas
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    def sample(self):
+        """Tomar una muestra sin bloquear y devolverla como snapshot inmutable."""
+        # Sin intervalo: psutil calcula el delta respecto a la llamada anterior
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        memory_info = psutil.virtual_memory()
+        swap_info = psutil.swap_memory()
+        disk_read_rate, disk_write_rate, net_sent_rate, net_recv_rate = self.io_rates()
+
+        return SystemSnapshot(
+            timestamp=time.monotonic(),
+            cpu_percent=sum(per_cpu) / len(per_cpu) if per_cpu else 0.0,
+            per_cpu=tuple(per_cpu),
+            memory_used=memory_info.used,
+            memory_total=memory_info.total,
+            memory_percent=memory_info.percent,
+            swap_percent=swap_info.percent,
+            disk_read_rate=disk_read_rate,
+            disk_write_rate=disk_write_rate,
+            net_sent_rate=net_sent_rate,
+            net_recv_rate=net_recv_rate,
+            processes=self.collector.collect(),
+        )
+
+    def io_rates(self):
+        """Calcular las tasas de E/S de disco y red respecto a la muestra anterior."""
+        now = time.monotonic()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        previous = self._last_counters
+        self._last_counters = (now, disk, net)
+        if previous is None or now <= previous[0]:
+            return 0.0, 0.0, 0.0, 0.0
+
+        elapsed = now - previous[0]
+        last_disk, last_net = previous[1], previous[2]
+
+        def rate(current, last, field):
+            if current is None or last is None:
+                return 0.0
+            return max(getattr(current, field) - getattr(last, field), 0) / elapsed
+
+        return (rate(disk, last_disk, 'read_bytes'), rate(disk, last_disk, 'write_bytes'),
+                rate(net, last_net, 'bytes_sent'), rate(net, last_net, 'bytes_recv'))
+
+
+class SampleTask(QRunnable):
+    """Tarea del pool de hilos que toma una muestra y la entrega por señal."""
+
+    def __init__(self, sampler, signals):
+        super().__init__()
+        self.sampler = sampler
+        self.signals = signals
+
+    def run(self):
+        try:
+            snapshot = self.sampler.sample()
+        except Exception as e:
+            # psutil.Error, OSError de /proc...: se avisa igualmente para que el monitor no quede esperando
+            snapshot = None
+            error = str(e) or type(e).__name__
+        try:
+            # La señal vive en el hilo de la interfaz, así que la entrega es encolada
+            if snapshot is None:
+                self.signals.sample_failed.emit(error)
+            else:
+                self.signals.snapshot_ready.emit(snapshot)
+        except RuntimeError:
+            # El monitor se destruyó mientras se tomaba la muestra
+            pass
+
+
+class SamplerSignals(QObject):
+    """Señales de las tareas de muestreo (un QRunnable no puede emitir señales)."""
+    snapshot_ready = Signal(object)
+    sample_failed = Signal(str)
+
+
+class SystemMonitor(QObject):
+    """Pide muestras al pool de hilos y reenvía los snapshots al hilo de la interfaz.
+
+    El monitor no tiene temporizador propio: cada muestra se pide con request_sample(),
+    normalmente desde el planificador central.
+    """
+    snapshot_ready = Signal(object)
+    sample_failed = Signal(str)  # Mensaje de error; la siguiente petición vuelve a intentarlo
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = False  # Evita encolar muestras si el pool va retrasado
+        self.sampler = None  # Se crea en la primera muestra
+        self.signals = SamplerSignals(self)
+        self.signals.snapshot_ready.connect(self.on_snapshot_ready)
+        self.signals.sample_failed.connect(self.on_sample_failed)
+
+    def request_sample(self):
+        """Pedir una muestra al pool de hilos sin esperar el resultado."""
+        if self.pending:
+            return
+        if self.sampler is None:
+            self.sampler = SystemSampler()
+        self.pending = True
+        QThreadPool.globalInstance().start(SampleTask(self.sampler, self.signals))
+
+    def on_snapshot_ready(self, snapshot):
+        """Reenviar el snapshot al hilo de la interfaz."""
+        self.pending = False
+        self.snapshot_ready.emit(snapshot)
+
+    def on_sample_failed(self, error):
+        """La muestra falló: se libera `pending` para que la siguiente petición se atienda."""
+        self.pending = False
+        self.sample_failed.emit(error)
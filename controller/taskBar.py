@@ -1,7 +1,8 @@
-import psutil
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import QTimer, QTime, QSize
+from PySide6.QtCore import QTime, QSize
+from controller.iconProvider import get_icon
+from controller.scheduler import get_scheduler
+from controller.sensors import get_sensor_service, format_battery
 
 class TaskBar(QWidget):
     def __init__(self, parent=None):
@@ -16,7 +17,7 @@ class TaskBar(QWidget):
 
         # Botón de inicio (Start Menu)
         start_button = QPushButton()
-        start_button.setIcon(QIcon("data/icons/start.png"))  # Asegúrate de que la ruta del icono es correcta
+        start_button.setIcon(get_icon("data/icons/start.png"))  # Asegúrate de que la ruta del icono es correcta
         start_button.setIconSize(QSize(32, 32))
         start_button.setStyleSheet("border: none;")
         start_button.clicked.connect(parent.toggle_app_menu)  # Vincula la acción para mostrar el menú de aplicaciones
@@ -28,33 +29,22 @@ class TaskBar(QWidget):
         self.clock_label.setStyleSheet("color: white; font-size: 14pt; font-weight: bold;")
         taskbar_layout.addWidget(self.clock_label)
 
-        # Icono de batería
+        # Icono de batería: el servicio de sensores avisa solo cuando el estado cambia
         self.battery_label = QLabel()
-        self.update_battery_status()  # Inicializa el estado de la batería
+        sensors = get_sensor_service()
+        self.update_battery_status(sensors.battery)  # Inicializa el estado de la batería
+        sensors.battery_changed.connect(self.update_battery_status)
         self.battery_label.setStyleSheet("color: white; font-size: 14pt;")
         taskbar_layout.addWidget(self.battery_label)
 
-        # Timer para actualizar el reloj y el estado de la batería cada segundo
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_clock)  # Actualiza el reloj
-        self.timer.timeout.connect(self.update_battery_status)  # Actualiza el estado de la batería
-        self.timer.start(1000)  # Ejecutar cada segundo
+        # Suscribirse al planificador central para actualizar el reloj
+        get_scheduler().subscribe(self, self.update_clock, 1000)
 
     def update_clock(self):
         """Actualizar la hora actual en el formato hh:mm:ss AM/PM."""
         current_time = QTime.currentTime().toString("hh:mm:ss AP")
         self.clock_label.setText(current_time)
 
-    def update_battery_status(self):
-        """Actualizar el estado de la batería si está disponible."""
-        battery = psutil.sensors_battery()
-        if battery is not None:
-            percent = int(battery.percent)  # Convertir a entero para quitar decimales
-            plugged = battery.power_plugged
-            if plugged:
-                self.battery_label.setText(f"Battery: {percent}% (Charging)")
-            else:
-                self.battery_label.setText(f"Battery: {percent}%")
-        else:
-            # Si no se puede obtener el estado de la batería (por ejemplo, en un escritorio)
-            self.battery_label.setText("Battery: N/A")
+    def update_battery_status(self, status):
+        """Mostrar el estado de la batería recibido del servicio de sensores."""
+        self.battery_label.setText(format_battery(status))
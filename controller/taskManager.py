@@ -1,16 +1,29 @@
 import psutil
-from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QTabWidget, QTableWidget, QTableWidgetItem)
-from PySide6.QtCharts import QChart, QChartView, QLineSeries
-from PySide6.QtCore import QTimer, Qt
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QTabWidget, QTableWidget, QTableWidgetItem,
+                               QTableView, QLineEdit, QAbstractItemView)
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+from PySide6.QtCore import Qt, QSortFilterProxyModel, QPointF
 from PySide6.QtGui import QPainter
+from controller.systemMonitor import SystemMonitor
+from controller.scheduler import get_scheduler
+from controller.sensors import get_sensor_service, format_battery
+from controller.performanceHistory import PerformanceHistory
+from controller.processModel import ProcessTableModel
 
 class TaskManager(QMainWindow):
-    def __init__(self, parent=None):
+    # Número de muestras más recientes que se dibujan en cada gráfico
+    CHART_POINTS = 300
+
+    def __init__(self, parent=None, history_size=3600):
         super().__init__(parent)
 
         # Almacenar referencia a las apps abiertas
         self.parent = parent
 
+        # Historial de tamaño fijo: la memoria no crece con la duración de la sesión
+        self.history = PerformanceHistory(history_size, psutil.cpu_count() or 1)
+        self.chart_points = min(self.CHART_POINTS, history_size)
+
         # Configurar la ventana principal
         self.setWindowTitle("Administrador de Tareas")
         self.setGeometry(100, 100, 800, 600)
@@ -38,10 +51,15 @@ class TaskManager(QMainWindow):
         # Configurar la pestaña de Apps en uso
         self.setup_apps_in_use_tab()
 
-        # Crear un temporizador para actualizar los datos de rendimiento y procesos
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_data)
-        self.timer.start(1000)  # Actualizar cada segundo
+        # Último snapshot recibido del hilo de muestreo
+        self.last_snapshot = None
+
+        # El muestreo con psutil se hace en un hilo de trabajo; aquí solo se reciben snapshots
+        self.monitor = SystemMonitor(self)
+        self.monitor.snapshot_ready.connect(self.update_data)
+
+        # El planificador central solo pide muestras mientras la ventana está visible
+        get_scheduler().subscribe(self, self.monitor.request_sample, 1000)
 
     def setup_performance_tab(self):
         layout = QVBoxLayout()
@@ -49,31 +67,88 @@ class TaskManager(QMainWindow):
         # Etiquetas para mostrar el uso de CPU y memoria
         self.cpu_label = QLabel("CPU: ")
         self.memory_label = QLabel("Memoria: ")
+        self.battery_label = QLabel()
 
         layout.addWidget(self.cpu_label)
         layout.addWidget(self.memory_label)
+        layout.addWidget(self.battery_label)
+
+        # La batería se recibe del servicio de sensores compartido, sin sondeo propio
+        sensors = get_sensor_service()
+        self.update_battery_status(sensors.battery)
+        sensors.battery_changed.connect(self.update_battery_status)
+
+        # Gráfico de CPU: uso total y una serie por núcleo
+        core_names = [f"Núcleo {idx}" for idx in range(self.history.cpu_per_core.width)]
+        self.chart, cpu_series, _ = self.create_chart("Uso de CPU (%)", ["Total"] + core_names, 100)
+        self.cpu_series, self.core_series = cpu_series[0], cpu_series[1:]
 
-        # Crear un gráfico de líneas para mostrar el uso de la CPU
-        self.cpu_series = QLineSeries()
-        self.chart = QChart()
-        self.chart.addSeries(self.cpu_series)
-        self.chart.createDefaultAxes()
-        self.chart.setTitle("Uso de CPU")
+        # Gráfico de memoria y swap
+        self.memory_chart, memory_series, _ = self.create_chart("Memoria (%)", ["Memoria", "Swap"], 100)
+        self.memory_series, self.swap_series = memory_series
 
-        self.chart_view = QChartView(self.chart)
-        self.chart_view.setRenderHint(QPainter.Antialiasing)
+        # Gráfico de E/S de disco y red; el eje Y se ajusta al máximo visible
+        io_names = ["Disco lectura", "Disco escritura", "Red enviados", "Red recibidos"]
+        self.io_chart, self.io_series, self.io_axis_y = self.create_chart("E/S (KB/s)", io_names, 1)
 
-        layout.addWidget(self.chart_view)
+        for chart in (self.chart, self.memory_chart, self.io_chart):
+            chart_view = QChartView(chart)
+            chart_view.setRenderHint(QPainter.Antialiasing)
+            layout.addWidget(chart_view)
 
         self.performance_tab.setLayout(layout)
 
+    def update_battery_status(self, status):
+        """Mostrar el estado de la batería recibido del servicio de sensores."""
+        self.battery_label.setText(format_battery(status))
+
+    def create_chart(self, title, series_names, y_max):
+        """Crea un gráfico con ejes fijos y una serie de líneas por nombre."""
+        chart = QChart()
+        chart.setTitle(title)
+
+        axis_x = QValueAxis()
+        axis_x.setRange(0, self.chart_points - 1)
+        axis_x.setLabelsVisible(False)
+        axis_y = QValueAxis()
+        axis_y.setRange(0, y_max)
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        chart.addAxis(axis_y, Qt.AlignLeft)
+
+        series_list = []
+        for name in series_names:
+            series = QLineSeries()
+            series.setName(name)
+            chart.addSeries(series)
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+            series_list.append(series)
+
+        return chart, series_list, axis_y
+
     def setup_processes_tab(self):
         layout = QVBoxLayout()
 
-        # Crear una tabla para mostrar los procesos en ejecución
-        self.processes_table = QTableWidget()
-        self.processes_table.setColumnCount(2)
-        self.processes_table.setHorizontalHeaderLabels(["PID", "Nombre del Proceso"])
+        # Campo para filtrar procesos por nombre
+        self.process_filter_input = QLineEdit()
+        self.process_filter_input.setPlaceholderText("Filtrar procesos...")
+        layout.addWidget(self.process_filter_input)
+
+        # Modelo indexado por PID; el proxy se encarga de ordenar y filtrar
+        self.process_model = ProcessTableModel(self)
+        self.process_proxy = QSortFilterProxyModel(self)
+        self.process_proxy.setSourceModel(self.process_model)
+        self.process_proxy.setSortRole(Qt.UserRole)
+        self.process_proxy.setFilterKeyColumn(1)
+        self.process_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.process_filter_input.textChanged.connect(self.process_proxy.setFilterFixedString)
+
+        # Vista de la tabla de procesos en ejecución
+        self.processes_table = QTableView()
+        self.processes_table.setModel(self.process_proxy)
+        self.processes_table.setSortingEnabled(True)
+        self.processes_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.processes_table.verticalHeader().setVisible(False)
 
         layout.addWidget(self.processes_table)
         self.processes_tab.setLayout(layout)
@@ -89,53 +164,64 @@ class TaskManager(QMainWindow):
         layout.addWidget(self.apps_table)
         self.apps_in_use_tab.setLayout(layout)
 
-    def update_data(self):
+    def update_data(self, snapshot):
         """Actualizar los datos de rendimiento y la lista de procesos y apps en uso."""
+        self.last_snapshot = snapshot
         self.update_performance_data()
         self.update_process_list()
         self.update_apps_in_use()
 
     def update_process_list(self):
-        """Actualizar la lista de procesos."""
-        self.processes_table.setRowCount(0)  # Limpiar la tabla de procesos
-
-        # Obtener la lista de procesos usando psutil
-        for idx, proc in enumerate(psutil.process_iter(['pid', 'name'])):
-            try:
-                pid = proc.info['pid']
-                name = proc.info['name']
-                self.processes_table.insertRow(idx)
-                self.processes_table.setItem(idx, 0, QTableWidgetItem(str(pid)))
-                self.processes_table.setItem(idx, 1, QTableWidgetItem(name))
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        """Actualizar la lista de procesos con el último snapshot."""
+        if self.last_snapshot is None:
+            return
 
-    def update_performance_data(self):
-        """Actualizar datos de rendimiento del sistema."""
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory_info = psutil.virtual_memory()
+        # Solo se aplican las diferencias: se conservan selección y desplazamiento
+        self.process_model.update_processes(self.last_snapshot.processes)
 
-        # Actualizar las etiquetas de CPU y memoria
-        self.cpu_label.setText(f"CPU: {cpu_percent}%")
-        self.memory_label.setText(f"Memoria: {memory_info.used / (1024 ** 3):.2f} GB / {memory_info.total / (1024 ** 3):.2f} GB")
+    def update_performance_data(self):
+        """Actualizar datos de rendimiento del sistema con el último snapshot."""
+        if self.last_snapshot is None:
+            return
 
-        # Añadir el uso de la CPU al gráfico
-        if len(self.cpu_series.pointsVector()) > 100:  # Limitar el gráfico a 100 puntos
-            self.cpu_series.removePoints(0, 1)
+        cpu_percent = self.last_snapshot.cpu_percent
 
-        self.cpu_series.append(len(self.cpu_series.pointsVector()), cpu_percent)
+        # Actualizar las etiquetas de CPU y memoria
+        self.cpu_label.setText(f"CPU: {cpu_percent:.1f}%")
+        self.memory_label.setText(f"Memoria: {self.last_snapshot.memory_used / (1024 ** 3):.2f} GB / {self.last_snapshot.memory_total / (1024 ** 3):.2f} GB")
+
+        self.history.append(self.last_snapshot)
+        self.update_charts()
+
+    def update_charts(self):
+        """Redibujar los gráficos desde el historial con un replace() por serie."""
+        count = self.chart_points
+        self.replace_series(self.cpu_series, self.history.cpu_total.values(count)[:, 0])
+        per_core = self.history.cpu_per_core.values(count)
+        for idx, series in enumerate(self.core_series):
+            self.replace_series(series, per_core[:, idx])
+
+        self.replace_series(self.memory_series, self.history.memory.values(count)[:, 0])
+        self.replace_series(self.swap_series, self.history.swap.values(count)[:, 0])
+
+        io_values = [self.history.disk_io.values(count), self.history.net_io.values(count)]
+        io_columns = [values[:, idx] / 1024 for values in io_values for idx in range(2)]
+        for series, values in zip(self.io_series, io_columns):
+            self.replace_series(series, values)
+        io_max = max((float(values.max()) for values in io_columns if len(values)), default=0.0)
+        self.io_axis_y.setRange(0, max(io_max * 1.1, 1))
+
+    def replace_series(self, series, values):
+        """Reemplaza todos los puntos de la serie alineando la muestra más reciente a la derecha."""
+        offset = self.chart_points - len(values)
+        series.replace([QPointF(offset + idx, value) for idx, value in enumerate(values.tolist())])
 
     def update_apps_in_use(self):
         """Actualizar la lista de aplicaciones en uso."""
         self.apps_table.setRowCount(0)  # Limpiar la tabla de apps en uso
 
-        open_apps = []
-        if self.parent.calculator.isVisible():
-            open_apps.append("Calculator")
-        if self.parent.docs_window and self.parent.docs_window.isVisible():
-            open_apps.append("Docs")
+        open_apps = self.parent.apps.visible_apps()
 
-    
         for idx, app_name in enumerate(open_apps):
             self.apps_table.insertRow(idx)
             self.apps_table.setItem(idx, 0, QTableWidgetItem(app_name))
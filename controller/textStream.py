@@ -0,0 +1,226 @@
+import io
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QTextCursor
+
+# Caracteres por fragmento leído en el hilo de trabajo
+READ_CHUNK = 64 * 1024
+
+# Fragmentos leídos que pueden esperar a ser insertados (limita la memoria si la
+# interfaz va más lenta que el disco)
+MAX_PENDING_CHUNKS = 4
+
+# Tiempo máximo (ms) del hilo de la interfaz por tanda al guardar
+SAVE_SLICE_MS = 15
+
+# Líneas que se unen en cada escritura al guardar
+WRITE_LINES = 1024
+
+
+def file_newline(newlines):
+    """Fin de línea a usar al guardar según lo detectado al leer (TextIOWrapper.newlines)."""
+    return newlines if isinstance(newlines, str) else "\n"
+
+
+class LoadSignals(QObject):
+    chunk = Signal(int, str)  # generación, texto
+    progress = Signal(int, int, int)  # generación, bytes leídos, tamaño total
+    finished = Signal(int, str, str)  # generación, fin de línea detectado, mensaje de error ("" si no hubo)
+
+
+class LoadTask(QRunnable):
+    """Tarea del pool de hilos que lee un archivo de texto por fragmentos.
+
+    Antes de entregar cada fragmento espera un turno del semáforo, que la
+    interfaz devuelve al insertarlo: nunca hay más de MAX_PENDING_CHUNKS en cola.
+    """
+
+    def __init__(self, signals, path, generation, slots, is_cancelled, chunk_size=READ_CHUNK):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.generation = generation
+        self.slots = slots
+        self.is_cancelled = is_cancelled
+        self.chunk_size = chunk_size
+
+    def run(self):
+        newline = "\n"
+        error = ""
+        try:
+            total = os.path.getsize(self.path)
+            with open(self.path, "rb") as raw:
+                # Decodificación incremental con traducción universal de fines de línea
+                text = io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline=None)
+                while True:
+                    chunk = text.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    if not self.wait_slot():
+                        return
+                    self.emit(self.signals.chunk, chunk)
+                    self.emit(self.signals.progress, raw.tell(), total)
+                newline = file_newline(text.newlines)
+        except (OSError, UnicodeError) as e:
+            error = str(e)
+        self.emit(self.signals.finished, newline, error)
+
+    def wait_slot(self):
+        """Esperar a que la interfaz consuma fragmentos; False si se canceló la carga."""
+        while not self.slots.acquire(timeout=0.1):
+            if self.is_cancelled(self.generation):
+                return False
+        return not self.is_cancelled(self.generation)
+
+    def emit(self, signal, *values):
+        try:
+            signal.emit(self.generation, *values)
+        except RuntimeError:
+            # El cargador fue destruido mientras se leía
+            pass
+
+
+class DocumentLoader(QObject):
+    """Carga un archivo en un QTextDocument a medida que se lee en segundo plano.
+
+    Cada fragmento se inserta al final del documento (sin historial de deshacer),
+    así que el texto aparece enseguida y la interfaz sigue respondiendo.
+    """
+    progress = Signal(int)  # porcentaje
+    finished = Signal(str)  # mensaje de error ("" si no hubo)
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.generation = 0
+        self.loading = False
+        self.newline = "\n"
+        self.slots = threading.Semaphore(MAX_PENDING_CHUNKS)
+        self._signals = LoadSignals(self)
+        self._signals.chunk.connect(self.on_chunk)
+        self._signals.progress.connect(self.on_progress)
+        self._signals.finished.connect(self.on_finished)
+
+    def load(self, path, chunk_size=READ_CHUNK):
+        """Vaciar el documento y empezar a leer `path`."""
+        self.cancel()
+        self.slots = threading.Semaphore(MAX_PENDING_CHUNKS)
+        self.loading = True
+        self.newline = "\n"
+        self.document.setUndoRedoEnabled(False)
+        self.document.clear()
+        self.cursor = QTextCursor(self.document)
+        QThreadPool.globalInstance().start(
+            LoadTask(self._signals, path, self.generation, self.slots, self.is_cancelled, chunk_size)
+        )
+
+    def cancel(self):
+        """Descartar la carga en curso (la tarea termina en su próximo fragmento)."""
+        self.generation += 1
+        if self.loading:
+            self.loading = False
+            self.document.setUndoRedoEnabled(True)
+
+    def is_cancelled(self, generation):
+        # Se llama desde el hilo de trabajo: solo lee un entero
+        return generation != self.generation
+
+    def on_chunk(self, generation, chunk):
+        if generation != self.generation:
+            return
+        self.cursor.movePosition(QTextCursor.End)
+        self.cursor.insertText(chunk)
+        self.slots.release()
+
+    def on_progress(self, generation, done, total):
+        if generation == self.generation:
+            self.progress.emit(int(done * 100 / total) if total else 100)
+
+    def on_finished(self, generation, newline, error):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.newline = newline
+        self.document.setUndoRedoEnabled(True)
+        self.document.setModified(False)
+        self.finished.emit(error)
+
+
+class DocumentWriter(QObject):
+    """Guarda un QTextDocument recorriéndolo bloque a bloque, en tandas cortas.
+
+    Nunca se arma el texto completo en memoria. Se escribe en un archivo temporal
+    que reemplaza al destino al terminar, así un fallo no deja el archivo a medias.
+    """
+    progress = Signal(int)  # porcentaje
+    finished = Signal(str)  # mensaje de error ("" si no hubo)
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.saving = False
+        self.file = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.write_slice)
+
+    def save(self, path, newline="\n"):
+        """Empezar a guardar el documento en `path`."""
+        if self.saving:
+            return
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.newline = newline
+        try:
+            self.file = open(self.temp_path, "w", encoding="utf-8", newline="")
+        except OSError as e:
+            self.finished.emit(str(e))
+            return
+        self.saving = True
+        self.block = self.document.begin()
+        self.written = 0
+        self.timer.start(0)
+
+    def write_slice(self):
+        """Escribir bloques hasta agotar SAVE_SLICE_MS y ceder el turno a la interfaz."""
+        deadline = time.perf_counter() + SAVE_SLICE_MS / 1000
+        block = self.block
+        try:
+            while block.isValid():
+                lines = []
+                while block.isValid() and len(lines) < WRITE_LINES:
+                    lines.append(block.text())
+                    block = block.next()
+                self.written += len(lines)
+                text = self.newline.join(lines)
+                # Separador entre esta tanda y la siguiente (no al final del documento)
+                self.file.write(text + self.newline if block.isValid() else text)
+                if time.perf_counter() >= deadline:
+                    break
+        except OSError as e:
+            self.finish(str(e))
+            return
+
+        self.block = block
+        if block.isValid():
+            self.progress.emit(int(self.written * 100 / max(self.document.blockCount(), 1)))
+            self.timer.start(0)
+        else:
+            self.finish("")
+
+    def finish(self, error):
+        self.saving = False
+        try:
+            self.file.close()
+            if error:
+                os.remove(self.temp_path)
+            else:
+                os.replace(self.temp_path, self.path)
+                self.document.setModified(False)
+        except OSError as e:
+            error = error or str(e)
+        self.file = None
+        self.finished.emit(error)
@@ -1,4 +1,5 @@
 import sys 
+from PySide6.QtCore import QThreadPool
 from PySide6.QtWidgets import QApplication
 from controller.login import LoginWindow
 
@@ -6,4 +7,7 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = LoginWindow()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    # Esperar a las tareas en segundo plano para que no emitan señales durante el cierre
+    QThreadPool.globalInstance().waitForDone()
+    sys.exit(exit_code)